@@ -10,6 +10,7 @@ from app.database import get_db
 from app.models.user import User
 from app.schemas.user import UserOut
 from app.services.auth import get_current_user, hash_password
+from app.services.feed import rename_feed_sender
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
@@ -196,8 +197,9 @@ async def admin_update_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if data.display_name is not None:
+    if data.display_name is not None and data.display_name != user.display_name:
         user.display_name = data.display_name
+        await rename_feed_sender(db, user.id, data.display_name)
     if data.email is not None:
         # Check email uniqueness
         dup = await db.execute(
@@ -16,6 +16,7 @@ from app.services.auth import (
     hash_password,
     verify_password,
 )
+from app.services.feed import rename_feed_sender
 from app.services.ldap_auth import ldap_authenticate
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
@@ -60,7 +61,7 @@ async def register(data: UserCreate, db: AsyncSession = Depends(get_db)):
 async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
     # Try LDAP authentication first if enabled
     if settings.ldap_enabled:
-        ldap_user = ldap_authenticate(data.username, data.password)
+        ldap_user = await ldap_authenticate(data.username, data.password)
         if ldap_user:
             # Find or create local user from LDAP
             result = await db.execute(
@@ -84,7 +85,9 @@ async def login(data: UserLogin, db: AsyncSession = Depends(get_db)):
             else:
                 # Update attributes from LDAP on each login
                 user.email = ldap_user["email"]
-                user.display_name = ldap_user["display_name"]
+                if user.display_name != ldap_user["display_name"]:
+                    user.display_name = ldap_user["display_name"]
+                    await rename_feed_sender(db, user.id, user.display_name)
                 user.is_admin = ldap_user.get("is_admin", False)
                 user.auth_source = "ldap"
 
@@ -127,8 +130,9 @@ async def update_me(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    if data.display_name is not None:
+    if data.display_name is not None and data.display_name != current_user.display_name:
         current_user.display_name = data.display_name
+        await rename_feed_sender(db, current_user.id, data.display_name)
     if data.status_message is not None:
         current_user.status_message = data.status_message
     if data.status is not None:
@@ -13,7 +13,7 @@ from app.schemas.channel import ChannelCreate, ChannelOut, ChannelUpdate
 from app.schemas.user import UserOut as _UserOut
 from app.services.auth import get_current_user
 from app.services.chat_db import init_chat_db
-from app.services.feed import mark_feed_read
+from app.services.feed import mark_feed_read, rename_feed_channel
 from app.websocket.manager import manager
 
 router = APIRouter(prefix="/api/channels", tags=["channels"])
@@ -39,7 +39,10 @@ async def _update_channel_name(channel: Channel, db: AsyncSession) -> None:
     """Recompute and persist the channel name unless it has a custom_name."""
     if channel.custom_name:
         return
-    channel.name = await _build_channel_name(channel.id, db)
+    new_name = await _build_channel_name(channel.id, db)
+    if new_name != channel.name:
+        channel.name = new_name
+        await rename_feed_channel(db, channel.id, new_name)
     await db.flush()
 
 
@@ -323,6 +326,8 @@ async def update_channel(
         new_name = data.name.strip()
         if not new_name:
             raise HTTPException(status_code=400, detail="Name darf nicht leer sein")
+        if new_name != channel.name:
+            await rename_feed_channel(db, channel.id, new_name)
         channel.name = new_name
         channel.custom_name = True
 
@@ -1,13 +1,13 @@
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
 from app.schemas.feed import FeedMarkRead
 from app.services.auth import get_current_user
-from app.services.feed import get_feed, get_unread_count, mark_feed_read
+from app.services.feed import encode_feed_cursor, get_feed, get_unread_count, mark_feed_read
 
 router = APIRouter(prefix="/api/feed", tags=["feed"])
 
@@ -17,12 +17,17 @@ async def list_feed(
     limit: int = 50,
     offset: int = 0,
     unread_only: bool = False,
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    events = await get_feed(db, current_user.id, limit, offset, unread_only)
+    try:
+        events = await get_feed(db, current_user.id, limit, offset, unread_only, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     unread = await get_unread_count(db, current_user.id)
-    return {"events": events, "unread_count": unread}
+    next_cursor = encode_feed_cursor(events[-1]) if events and len(events) == limit else None
+    return {"events": events, "unread_count": unread, "next_cursor": next_cursor}
 
 
 @router.post("/read")
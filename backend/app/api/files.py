@@ -12,11 +12,17 @@ from app.models.file import File as FileModel
 from app.models.user import User
 from app.schemas.file import FileReferenceOut
 from app.services.auth import get_current_user, get_current_user_from_token_or_query
-from app.services.file_store import get_file_path, store_file
+from app.services.file_store import CHUNK_SIZE, get_file_path, store_file
 
 router = APIRouter(prefix="/api/files", tags=["files"])
 
 
+class _StoredFileResponse(FileResponse):
+    """FileResponse that streams stored files in 1 MiB instead of 64 KiB chunks."""
+
+    chunk_size = CHUNK_SIZE
+
+
 @router.post("/upload", response_model=FileReferenceOut, status_code=201)
 async def upload_file(
     file: UploadFile = File(...),
@@ -59,7 +65,7 @@ async def download_file(
         raise HTTPException(status_code=404, detail="File not found")
 
     file_path, original_name, _mime_type = result
-    return FileResponse(
+    return _StoredFileResponse(
         path=file_path,
         filename=original_name,
         media_type="application/octet-stream",
@@ -85,13 +91,13 @@ async def inline_file(
 
     # Only serve known safe media types inline; fall back to download for others
     if not any(mime_type.startswith(p) for p in _INLINE_PREFIXES):
-        return FileResponse(
+        return _StoredFileResponse(
             path=file_path,
             filename=original_name,
             media_type="application/octet-stream",
         )
 
-    return FileResponse(
+    return _StoredFileResponse(
         path=file_path,
         filename=original_name,
         media_type=mime_type,
@@ -156,17 +156,15 @@ async def create_message(
     )
 
     # Zusaetzliche Mention-Feed-Events fuer erwaehnte User
-    for uid in mentioned_user_ids:
-        if uid != current_user.id:
-            await create_feed_events(
-                db,
-                channel_id,
-                current_user.id,
-                event_type="mention",
-                preview_text=f"@Erwaehnung: {data.content[:150]}",
-                message_id=msg["id"],
-                target_user_id=uid,
-            )
+    await create_feed_events(
+        db,
+        channel_id,
+        current_user.id,
+        event_type="mention",
+        preview_text=f"@Erwaehnung: {data.content[:150]}",
+        message_id=msg["id"],
+        target_user_ids=[uid for uid in mentioned_user_ids if uid != current_user.id],
+    )
 
     # Broadcast via WebSocket so all channel members see the message in real-time
     msg["sender_name"] = current_user.display_name
@@ -276,7 +274,7 @@ async def create_reaction(
                 event_type="reaction",
                 preview_text=f"{data.emoji} Reaktion",
                 message_id=message_id,
-                target_user_id=target_user_id,
+                target_user_ids=[target_user_id],
             )
         await db.commit()
 
@@ -5,9 +5,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import inspect as sa_inspect, text
 
 from app.api import admin, auth, calendar, channels, feed, files, invitations, linkpreview, messages, teams, users, video
+from app.config import settings
 from app.database import engine
 from app.models.base import Base
+from app.services import broadcast, chat_db
+from app.services.email import close_smtp
+from app.services.janus import janus_client
 from app.websocket.handlers import notification_ws_endpoint, websocket_endpoint
+from app.websocket.manager import manager
 
 
 def _add_missing_columns(connection):
@@ -97,6 +102,39 @@ def _add_missing_columns(connection):
                 "ALTER TABLE users ADD COLUMN notification_sound_path VARCHAR(512)"
             ))
 
+    if "feed_events" in table_names:
+        feed_cols = {c["name"] for c in inspector.get_columns("feed_events")}
+        if "sender_display_name" not in feed_cols:
+            connection.execute(text(
+                "ALTER TABLE feed_events ADD COLUMN sender_display_name VARCHAR(100)"
+            ))
+            if "users" in table_names:
+                connection.execute(text(
+                    "UPDATE feed_events SET sender_display_name = "
+                    "(SELECT display_name FROM users WHERE users.id = feed_events.sender_id)"
+                ))
+        if "channel_name" not in feed_cols:
+            connection.execute(text(
+                "ALTER TABLE feed_events ADD COLUMN channel_name VARCHAR(100)"
+            ))
+            if "channels" in table_names:
+                connection.execute(text(
+                    "UPDATE feed_events SET channel_name = "
+                    "(SELECT name FROM channels WHERE channels.id = feed_events.channel_id)"
+                ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_feed_events_user_id_is_read "
+            "ON feed_events (user_id, is_read)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_feed_events_user_id_created_at "
+            "ON feed_events (user_id, created_at DESC)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_feed_events_user_id_created_at_unread "
+            "ON feed_events (user_id, created_at DESC) WHERE is_read = false"
+        ))
+
     if "channel_members" in table_names:
         cm_cols = {c["name"] for c in inspector.get_columns("channel_members")}
         if "last_read_message_id" not in cm_cols:
@@ -115,7 +153,16 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
         await conn.run_sync(_add_missing_columns)
+    if settings.ws_redis_fanout:
+        broadcast.start(manager.dispatch)
+        manager.publisher = broadcast.publish
     yield
+    manager.publisher = None
+    await broadcast.stop()
+    await manager.close()
+    await chat_db.close_all()
+    await janus_client.close()
+    await close_smtp()
 
 
 app = FastAPI(
@@ -1,6 +1,6 @@
 import uuid
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin, UUIDPrimaryKey, UUIDType
@@ -8,6 +8,10 @@ from app.models.base import Base, TimestampMixin, UUIDPrimaryKey, UUIDType
 
 class FeedEvent(Base, UUIDPrimaryKey, TimestampMixin):
     __tablename__ = "feed_events"
+    __table_args__ = (
+        # Covers the unread-count query (user_id = ? AND is_read = false)
+        Index("ix_feed_events_user_id_is_read", "user_id", "is_read"),
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUIDType(), ForeignKey("users.id"), nullable=False, index=True
@@ -24,6 +28,25 @@ class FeedEvent(Base, UUIDPrimaryKey, TimestampMixin):
     preview_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     message_id: Mapped[str | None] = mapped_column(String(36), nullable=True)
     is_read: Mapped[bool] = mapped_column(default=False, nullable=False)
+    # Beim Einfuegen denormalisiert, damit get_feed ohne Joins auskommt;
+    # wird bei Umbenennungen ueber app.services.feed nachgezogen
+    sender_display_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    channel_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
 
     user = relationship("User", back_populates="feed_events", foreign_keys=[user_id])
     channel = relationship("Channel")
+
+
+# Feed-Seiten: WHERE user_id = ? ORDER BY created_at DESC (optional nur ungelesene)
+Index(
+    "ix_feed_events_user_id_created_at",
+    FeedEvent.user_id,
+    FeedEvent.created_at.desc(),
+)
+Index(
+    "ix_feed_events_user_id_created_at_unread",
+    FeedEvent.user_id,
+    FeedEvent.created_at.desc(),
+    postgresql_where=FeedEvent.is_read == false(),
+    sqlite_where=FeedEvent.is_read == false(),
+)
@@ -0,0 +1,74 @@
+"""Verteilung von WebSocket-Nachrichten ueber Redis Pub/Sub.
+
+Jeder Uvicorn-Worker kennt nur seine eigenen WebSocket-Verbindungen. Ist
+``ws_redis_fanout`` aktiv, veroeffentlicht der ConnectionManager ausgehende
+Nachrichten auf einem gemeinsamen Redis-Kanal; jeder Worker (auch der
+sendende) abonniert diesen Kanal und stellt an seine lokalen Verbindungen zu.
+"""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+import redis.asyncio as redis
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "agora:ws"
+# Wartezeit vor einem neuen Abo-Versuch, wenn Redis nicht erreichbar ist
+RECONNECT_DELAY = 1.0
+
+_client: redis.Redis | None = None
+_listener: asyncio.Task | None = None
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.redis_url)
+    return _client
+
+
+async def publish(data: str) -> None:
+    """Veroeffentlicht eine fertig serialisierte Nachricht an alle Worker."""
+    await _get_client().publish(CHANNEL, data)
+
+
+async def _listen(handler: Callable[[bytes], Awaitable[None]]) -> None:
+    while True:
+        pubsub = _get_client().pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(CHANNEL)
+            async for msg in pubsub.listen():
+                try:
+                    await handler(msg["data"])
+                except Exception:
+                    logger.exception("Zustellung einer Redis-Nachricht fehlgeschlagen")
+        except (redis.ConnectionError, OSError) as e:
+            logger.warning(f"Redis-Abo unterbrochen, neuer Versuch: {e}")
+            await asyncio.sleep(RECONNECT_DELAY)
+        finally:
+            await pubsub.aclose()
+
+
+def start(handler: Callable[[bytes], Awaitable[None]]) -> None:
+    """Startet das Abo; ``handler`` erhaelt jede veroeffentlichte Nachricht."""
+    global _listener
+    if _listener is None:
+        _listener = asyncio.create_task(_listen(handler))
+
+
+async def stop() -> None:
+    """Beendet Abo und Redis-Verbindung (App-Shutdown)."""
+    global _client, _listener
+    if _listener is not None:
+        _listener.cancel()
+        try:
+            await _listener
+        except asyncio.CancelledError:
+            pass
+        _listener = None
+    if _client is not None:
+        await _client.aclose()
+        _client = None
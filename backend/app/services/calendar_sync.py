@@ -11,18 +11,34 @@ Supported providers:
 
 from __future__ import annotations
 
+import asyncio
+import base64
+import functools
+import io
 import logging
-import re
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Awaitable, Callable, Sequence
+from xml.sax.saxutils import escape as _xesc
 
 import httpx
+import orjson
 from icalendar import Calendar, Event, vText
+from lxml import etree
 
 from app.models.calendar import CalendarIntegration
 
 logger = logging.getLogger(__name__)
 
+# Fully-qualified tag names for the streaming XML parsers below.
+_CALDAV_DATA_TAG = "{urn:ietf:params:xml:ns:caldav}calendar-data"
+_EWS_TYPES_NS = "{http://schemas.microsoft.com/exchange/services/2006/types}"
+_EWS_CALENDAR_ITEM_TAG = _EWS_TYPES_NS + "CalendarItem"
+_EWS_CREATED_ITEM_ID_PATH = (
+    ".//{http://schemas.microsoft.com/exchange/services/2006/messages}Items/"
+    + _EWS_CALENDAR_ITEM_TAG + "/" + _EWS_TYPES_NS + "ItemId"
+)
+_XML_PARSER = etree.XMLParser(resolve_entities=False)
+
 
 class ProviderError(Exception):
     """Raised when an external calendar provider returns an error."""
@@ -39,6 +55,37 @@ class ProviderError(Exception):
 # ---------------------------------------------------------------------------
 
 
+def _http_client() -> httpx.AsyncClient:
+    """Client for one provider round-trip (tests swap in a MockTransport)."""
+    return httpx.AsyncClient(timeout=15)
+
+
+def _ical_utc(dt: datetime) -> str:
+    """Format a UTC datetime as an iCalendar basic-format timestamp."""
+    return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}T{dt.hour:02d}{dt.minute:02d}{dt.second:02d}Z"
+
+
+def _iso_utc(dt: datetime) -> str:
+    """Format a UTC datetime as an ISO 8601 timestamp with a 'Z' suffix."""
+    return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d}T{dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}Z"
+
+
+def _as_utc(dt: datetime) -> datetime:
+    """Return *dt* in UTC; naive datetimes are taken to be UTC already."""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _norm_range(range_start: datetime, range_end: datetime) -> tuple[str, str]:
+    """Format an already UTC-normalized sync window as ISO 8601 strings."""
+    return _iso_utc(range_start), _iso_utc(range_end)
+
+
+_ICAL_PROLOGUE = b"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Agora//Calendar//DE\r\n"
+_ICAL_EPILOGUE = b"END:VCALENDAR\r\n"
+
+
 def _ical_event(
     uid: str,
     title: str,
@@ -46,30 +93,94 @@ def _ical_event(
     end: datetime,
     description: str | None = None,
     location: str | None = None,
+    dtstamp: datetime | None = None,
 ) -> bytes:
-    """Build a minimal iCalendar VEVENT."""
-    cal = Calendar()
-    cal.add("prodid", "-//Agora//Calendar//DE")
-    cal.add("version", "2.0")
+    """Build a minimal iCalendar VEVENT.
 
+    Only the VEVENT is serialized per call; the constant VCALENDAR framing
+    is prepended/appended as pre-encoded bytes.
+    """
     ev = Event()
     ev.add("uid", uid)
     ev.add("summary", title)
     ev.add("dtstart", start)
     ev.add("dtend", end)
-    ev.add("dtstamp", datetime.now(timezone.utc))
+    ev.add("dtstamp", dtstamp or datetime.now(timezone.utc))
     if description:
         ev.add("description", description)
     if location:
         ev["location"] = vText(location)
-    cal.add_component(ev)
-    return cal.to_ical()
+    return _ICAL_PROLOGUE + ev.to_ical() + _ICAL_EPILOGUE
+
+
+def _basic_header(username: str, password: str) -> str:
+    """Return the HTTP Basic ``Authorization`` header value for a credential pair."""
+    token = base64.b64encode(f"{username}:{password}".encode("utf-8")).decode("ascii")
+    return f"Basic {token}"
+
+
+# Upper bound on concurrent provider requests issued by the batch helpers.
+BATCH_CONCURRENCY = 16
+
+
+async def _gather_bounded(
+    func: Callable[..., Awaitable[Any]],
+    integration: CalendarIntegration,
+    items: Sequence[tuple],
+    concurrency: int,
+    failed: Any,
+) -> list[Any]:
+    """Run ``func(integration, *item)`` for every item, at most *concurrency* at once.
+
+    An item whose call raises is logged and reported as *failed*, so one
+    provider error does not discard the results of the rest of the batch.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(item: tuple) -> Any:
+        async with sem:
+            try:
+                return await func(integration, *item)
+            except Exception as exc:
+                logger.warning("Calendar batch item %r failed: %s", item[:1], exc)
+                return failed
+
+    return list(await asyncio.gather(*(_one(item) for item in items)))
 
 
 # ---------------------------------------------------------------------------
 # WebDAV / CalDAV
 # ---------------------------------------------------------------------------
 
+_CALDAV_QUERY_BODY = (
+    b'<?xml version="1.0" encoding="utf-8" ?>'
+    b'<C:calendar-query xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">'
+    b"  <D:prop><D:getetag/><C:calendar-data/></D:prop>"
+    b"  <C:filter>"
+    b'    <C:comp-filter name="VCALENDAR">'
+    b'      <C:comp-filter name="VEVENT">'
+    b'        <C:time-range start="%b" end="%b"/>'
+    b"      </C:comp-filter>"
+    b"    </C:comp-filter>"
+    b"  </C:filter>"
+    b"</C:calendar-query>"
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _webdav_base(url: str) -> str:
+    """Return the collection URL with exactly one trailing slash."""
+    return url.rstrip("/") + "/"
+
+
+def _webdav_auth_headers(integration: CalendarIntegration) -> dict[str, str]:
+    """Authorization header for the integration's WebDAV credentials, if any."""
+    if not integration.webdav_username:
+        return {}
+    return {
+        "Authorization": _basic_header(integration.webdav_username, integration.webdav_password or "")
+    }
+
 
 async def webdav_list_events(
     integration: CalendarIntegration,
@@ -79,62 +190,74 @@ async def webdav_list_events(
     """Fetch events from a CalDAV server via REPORT."""
     if not integration.webdav_url:
         return []
-    body = (
-        '<?xml version="1.0" encoding="utf-8" ?>'
-        '<C:calendar-query xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">'
-        "  <D:prop><D:getetag/><C:calendar-data/></D:prop>"
-        "  <C:filter>"
-        '    <C:comp-filter name="VCALENDAR">'
-        '      <C:comp-filter name="VEVENT">'
-        f'        <C:time-range start="{range_start.strftime("%Y%m%dT%H%M%SZ")}"'
-        f'                      end="{range_end.strftime("%Y%m%dT%H%M%SZ")}"/>'
-        "      </C:comp-filter>"
-        "    </C:comp-filter>"
-        "  </C:filter>"
-        "</C:calendar-query>"
+    range_start, range_end = _as_utc(range_start), _as_utc(range_end)
+    if range_end <= range_start:
+        return []
+    body = _CALDAV_QUERY_BODY % (
+        _ical_utc(range_start).encode("ascii"),
+        _ical_utc(range_end).encode("ascii"),
     )
-    auth = None
-    if integration.webdav_username:
-        auth = (integration.webdav_username, integration.webdav_password or "")
-    async with httpx.AsyncClient(timeout=15) as client:
+    async with _http_client() as client:
         resp = await client.request(
             "REPORT",
             integration.webdav_url,
             content=body,
-            headers={"Content-Type": "application/xml; charset=utf-8", "Depth": "1"},
-            auth=auth,
+            headers={
+                "Content-Type": "application/xml; charset=utf-8",
+                "Depth": "1",
+                **_webdav_auth_headers(integration),
+            },
         )
     if resp.status_code >= 400:
         logger.warning("WebDAV REPORT failed: HTTP %d – %s", resp.status_code, resp.text[:200])
         raise ProviderError("webdav", resp.status_code, resp.text[:200])
-    return _parse_caldav_response(resp.text)
+    return _parse_caldav_response(resp.content)
+
 
+def _parse_caldav_response(xml_bytes: bytes) -> list[dict[str, Any]]:
+    """Best-effort parse of a CalDAV multi-status response.
 
-def _parse_caldav_response(xml_text: str) -> list[dict[str, Any]]:
-    """Best-effort parse of a CalDAV multi-status response."""
+    A malformed calendar-data block or VEVENT is skipped; a truncated or broken XML
+    document keeps the events parsed up to that point.
+    """
     events: list[dict[str, Any]] = []
     try:
-        from icalendar import Calendar as iCal
-
-        for match in re.finditer(r"<[^>]*calendar-data[^>]*>(.*?)</", xml_text, re.S):
-            cal = iCal.from_ical(match.group(1))
-            for comp in cal.walk():
-                if comp.name == "VEVENT":
-                    events.append(
-                        {
-                            "external_id": str(comp.get("uid", "")),
-                            "title": str(comp.get("summary", "")),
-                            "description": str(comp.get("description", "")),
-                            "start_time": comp.decoded("dtstart") if comp.get("dtstart") else None,
-                            "end_time": comp.decoded("dtend") if comp.get("dtend") else None,
-                            "location": str(comp.get("location", "")) or None,
-                        }
-                    )
-    except Exception:
-        pass
+        for _, elem in etree.iterparse(
+            io.BytesIO(xml_bytes), tag=_CALDAV_DATA_TAG, resolve_entities=False
+        ):
+            ical_text = elem.text
+            elem.clear()
+            if not ical_text:
+                continue
+            try:
+                cal = Calendar.from_ical(ical_text)
+            except ValueError as exc:
+                logger.warning("Skipping malformed CalDAV calendar-data: %s", exc)
+                continue
+            for comp in cal.walk("VEVENT"):
+                try:
+                    events.append(_caldav_vevent(comp))
+                except (AttributeError, TypeError, ValueError) as exc:
+                    logger.warning("Skipping malformed CalDAV VEVENT: %s", exc)
+    except etree.XMLSyntaxError as exc:
+        logger.warning("Malformed CalDAV multi-status response: %s", exc)
     return events
 
 
+def _caldav_vevent(comp: Any) -> dict[str, Any]:
+    """Map a parsed VEVENT component to the provider-neutral event dict."""
+    dtstart = comp.get("dtstart")
+    dtend = comp.get("dtend")
+    return {
+        "external_id": str(comp.get("uid", "")),
+        "title": str(comp.get("summary", "")),
+        "description": str(comp.get("description", "")),
+        "start_time": dtstart.dt if dtstart is not None else None,
+        "end_time": dtend.dt if dtend is not None else None,
+        "location": str(comp.get("location", "")) or None,
+    }
+
+
 async def webdav_put_event(
     integration: CalendarIntegration,
     uid: str,
@@ -143,38 +266,61 @@ async def webdav_put_event(
     end: datetime,
     description: str | None = None,
     location: str | None = None,
+    dtstamp: datetime | None = None,
 ) -> bool:
     """PUT a single VEVENT to a CalDAV server."""
     if not integration.webdav_url:
         return False
-    ical_bytes = _ical_event(uid, title, start, end, description, location)
-    url = integration.webdav_url.rstrip("/") + f"/{uid}.ics"
-    auth = None
-    if integration.webdav_username:
-        auth = (integration.webdav_username, integration.webdav_password or "")
-    async with httpx.AsyncClient(timeout=15) as client:
+    ical_bytes = _ical_event(uid, title, start, end, description, location, dtstamp)
+    url = f"{_webdav_base(integration.webdav_url)}{uid}.ics"
+    async with _http_client() as client:
         resp = await client.put(
             url,
             content=ical_bytes,
-            headers={"Content-Type": "text/calendar; charset=utf-8"},
-            auth=auth,
+            headers={
+                "Content-Type": "text/calendar; charset=utf-8",
+                **_webdav_auth_headers(integration),
+            },
         )
     return resp.status_code < 400
 
 
+async def webdav_put_events(
+    integration: CalendarIntegration,
+    items: Sequence[tuple],
+    concurrency: int = BATCH_CONCURRENCY,
+) -> list[bool]:
+    """PUT several VEVENTs concurrently.
+
+    Each item holds the positional arguments of :func:`webdav_put_event`
+    after *integration*: ``(uid, title, start, end, description, location)``.
+    All events in the batch share one DTSTAMP.
+    """
+    put = functools.partial(webdav_put_event, dtstamp=datetime.now(timezone.utc))
+    return await _gather_bounded(put, integration, items, concurrency, False)
+
+
 async def webdav_delete_event(integration: CalendarIntegration, uid: str) -> bool:
     """DELETE a VEVENT from a CalDAV server."""
     if not integration.webdav_url:
         return False
-    url = integration.webdav_url.rstrip("/") + f"/{uid}.ics"
-    auth = None
-    if integration.webdav_username:
-        auth = (integration.webdav_username, integration.webdav_password or "")
-    async with httpx.AsyncClient(timeout=15) as client:
-        resp = await client.delete(url, auth=auth)
+    url = f"{_webdav_base(integration.webdav_url)}{uid}.ics"
+    async with _http_client() as client:
+        resp = await client.delete(url, headers=_webdav_auth_headers(integration))
     return resp.status_code < 400
 
 
+async def webdav_delete_events(
+    integration: CalendarIntegration,
+    uids: Sequence[str],
+    concurrency: int = BATCH_CONCURRENCY,
+) -> list[bool]:
+    """DELETE several VEVENTs concurrently."""
+    return await _gather_bounded(
+        webdav_delete_event, integration, [(uid,) for uid in uids], concurrency, False
+    )
+
+
 # ---------------------------------------------------------------------------
 # Google Calendar  (REST API v3 with OAuth 2.0)
 # ---------------------------------------------------------------------------
@@ -183,6 +329,9 @@ GOOGLE_CALENDAR_API = "https://www.googleapis.com/calendar/v3"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_SCOPES = "https://www.googleapis.com/auth/calendar"
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
+GOOGLE_EVENTS_URL = f"{GOOGLE_CALENDAR_API}/calendars/primary/events"
+# Partial-response mask: only the event fields google_list_events reads.
+GOOGLE_EVENT_FIELDS = "items(id,status,summary,description,start,end,location),nextPageToken"
 
 
 async def _google_ensure_token(integration: CalendarIntegration) -> str:
@@ -210,7 +359,7 @@ async def _google_ensure_token(integration: CalendarIntegration) -> str:
 
     # Refresh
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
+        async with _http_client() as client:
             resp = await client.post(GOOGLE_TOKEN_URL, data={
                 "client_id": app_settings.google_client_id,
                 "client_secret": app_settings.google_client_secret,
@@ -225,7 +374,7 @@ async def _google_ensure_token(integration: CalendarIntegration) -> str:
         logger.warning("Google token refresh failed: %d – %s", resp.status_code, resp.text[:300])
         raise ProviderError("google", 401, "Google token refresh failed – please reconnect your account")
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     integration.google_access_token = data.get("access_token")
     if not integration.google_access_token:
         raise ProviderError("google", 401, "Google token refresh returned no access token")
@@ -240,21 +389,36 @@ async def google_list_events(
     range_end: datetime,
 ) -> list[dict[str, Any]]:
     """List events from Google Calendar via REST API v3."""
+    range_start, range_end = _as_utc(range_start), _as_utc(range_end)
+    if range_end <= range_start:
+        return []
     token = await _google_ensure_token(integration)
+    time_min, time_max = _norm_range(range_start, range_end)
     params = {
-        "timeMin": range_start.strftime("%Y-%m-%dT%H:%M:%SZ"),
-        "timeMax": range_end.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timeMin": time_min,
+        "timeMax": time_max,
         "singleEvents": "true",
         "orderBy": "startTime",
         "maxResults": "250",
+        "fields": GOOGLE_EVENT_FIELDS,
     }
+    items: list[dict[str, Any]] = []
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            resp = await client.get(
-                f"{GOOGLE_CALENDAR_API}/calendars/primary/events",
-                params=params,
-                headers={"Authorization": f"Bearer {token}"},
-            )
+        async with _http_client() as client:
+            while True:
+                resp = await client.get(
+                    GOOGLE_EVENTS_URL,
+                    params=params,
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+                if resp.status_code >= 400:
+                    break
+                data = orjson.loads(resp.content)
+                items.extend(data.get("items", []))
+                page_token = data.get("nextPageToken")
+                if not page_token:
+                    break
+                params["pageToken"] = page_token
     except httpx.HTTPError as exc:
         logger.warning("Google Calendar API network error: %s", exc)
         raise ProviderError("google", 503, f"Could not reach Google Calendar API: {exc}")
@@ -265,7 +429,7 @@ async def google_list_events(
         # Try to extract meaningful message from Google JSON error response
         google_message = ""
         try:
-            err_json = resp.json()
+            err_json = orjson.loads(resp.content)
             google_message = err_json.get("error", {}).get("message", "")
         except Exception:
             pass
@@ -280,7 +444,7 @@ async def google_list_events(
         raise ProviderError("google", resp.status_code, detail)
 
     events: list[dict[str, Any]] = []
-    for item in resp.json().get("items", []):
+    for item in items:
         if item.get("status") == "cancelled":
             continue
         start = item.get("start", {})
@@ -308,32 +472,47 @@ async def google_create_event(
     token = await _google_ensure_token(integration)
     body: dict[str, Any] = {
         "summary": title,
-        "start": {"dateTime": start.strftime("%Y-%m-%dT%H:%M:%SZ"), "timeZone": "UTC"},
-        "end": {"dateTime": end.strftime("%Y-%m-%dT%H:%M:%SZ"), "timeZone": "UTC"},
+        "start": {"dateTime": _iso_utc(start), "timeZone": "UTC"},
+        "end": {"dateTime": _iso_utc(end), "timeZone": "UTC"},
     }
     if description:
         body["description"] = description
     if location:
         body["location"] = location
 
-    async with httpx.AsyncClient(timeout=15) as client:
+    async with _http_client() as client:
         resp = await client.post(
-            f"{GOOGLE_CALENDAR_API}/calendars/primary/events",
-            json=body,
-            headers={"Authorization": f"Bearer {token}"},
+            GOOGLE_EVENTS_URL,
+            content=orjson.dumps(body),
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/json"},
         )
     if resp.status_code < 400:
-        return resp.json().get("id")
+        return orjson.loads(resp.content).get("id")
     logger.warning("Google Calendar create event failed: HTTP %d – %s", resp.status_code, resp.text[:500])
     return None
 
 
+async def google_create_events(
+    integration: CalendarIntegration,
+    items: Sequence[tuple],
+    concurrency: int = BATCH_CONCURRENCY,
+) -> list[str | None]:
+    """Create several Google Calendar events concurrently.
+
+    Each item holds ``(title, start, end, description, location)``. The
+    access token is refreshed once up front so the concurrent requests do
+    not race to refresh it.
+    """
+    await _google_ensure_token(integration)
+    return await _gather_bounded(google_create_event, integration, items, concurrency, None)
+
+
 async def google_delete_event(integration: CalendarIntegration, event_id: str) -> bool:
     """Delete a Google Calendar event via REST API."""
     token = await _google_ensure_token(integration)
-    async with httpx.AsyncClient(timeout=15) as client:
+    async with _http_client() as client:
         resp = await client.delete(
-            f"{GOOGLE_CALENDAR_API}/calendars/primary/events/{event_id}",
+            f"{GOOGLE_EVENTS_URL}/{event_id}",
             headers={"Authorization": f"Bearer {token}"},
         )
     if resp.status_code >= 400:
@@ -341,26 +520,42 @@ async def google_delete_event(integration: CalendarIntegration, event_id: str) -
     return resp.status_code < 400
 
 
+async def google_delete_events(
+    integration: CalendarIntegration,
+    event_ids: Sequence[str],
+    concurrency: int = BATCH_CONCURRENCY,
+) -> list[bool]:
+    """Delete several Google Calendar events concurrently."""
+    await _google_ensure_token(integration)
+    return await _gather_bounded(
+        google_delete_event, integration, [(eid,) for eid in event_ids], concurrency, False
+    )
+
+
 # ---------------------------------------------------------------------------
 # Outlook / Exchange Web Services (EWS) with username + password
 # ---------------------------------------------------------------------------
 
 
-def _ews_soap(action_body: str) -> str:
+_SOAP_PREFIX = (
+    b'<?xml version="1.0" encoding="utf-8"?>'
+    b'<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"'
+    b' xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types"'
+    b' xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages">'
+    b"<soap:Body>"
+)
+_SOAP_SUFFIX = b"</soap:Body></soap:Envelope>"
+
+
+def _ews_soap(action_body: str) -> bytes:
     """Wrap an EWS action in a SOAP envelope."""
-    return (
-        '<?xml version="1.0" encoding="utf-8"?>'
-        '<soap:Envelope xmlns:soap="http://schemas.xmlsoap.org/soap/envelope/"'
-        ' xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types"'
-        ' xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages">'
-        "<soap:Body>" + action_body + "</soap:Body>"
-        "</soap:Envelope>"
-    )
+    return _SOAP_PREFIX + action_body.encode("utf-8") + _SOAP_SUFFIX
 
 
-def _ews_date(dt: datetime) -> str:
-    """Format datetime for EWS."""
-    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+@functools.lru_cache(maxsize=1024)
+def _ews_endpoint(server_url: str) -> str:
+    """Return the EWS endpoint for an Exchange server base URL."""
+    return server_url.rstrip("/") + "/EWS/Exchange.asmx"
 
 
 async def _ews_request(
@@ -369,14 +564,15 @@ async def _ews_request(
     """Send an EWS SOAP request with basic auth."""
     if not (integration.outlook_server_url and integration.outlook_username and integration.outlook_password):
         return None
-    url = integration.outlook_server_url.rstrip("/") + "/EWS/Exchange.asmx"
-    auth = (integration.outlook_username, integration.outlook_password)
-    async with httpx.AsyncClient(timeout=15) as client:
+    url = _ews_endpoint(integration.outlook_server_url)
+    async with _http_client() as client:
         resp = await client.post(
             url,
             content=_ews_soap(soap_body),
-            headers={"Content-Type": "text/xml; charset=utf-8"},
-            auth=auth,
+            headers={
+                "Content-Type": "text/xml; charset=utf-8",
+                "Authorization": _basic_header(integration.outlook_username, integration.outlook_password),
+            },
         )
     return resp
 
@@ -387,21 +583,24 @@ async def outlook_list_events(
     range_end: datetime,
 ) -> list[dict[str, Any]]:
     """List events from Exchange via EWS FindItem."""
+    range_start, range_end = _as_utc(range_start), _as_utc(range_end)
+    if range_end <= range_start:
+        return []
+    start_iso, end_iso = _norm_range(range_start, range_end)
     body = (
         '<m:FindItem Traversal="Shallow">'
         "  <m:ItemShape>"
-        "    <t:BaseShape>Default</t:BaseShape>"
+        "    <t:BaseShape>IdOnly</t:BaseShape>"
         "    <t:AdditionalProperties>"
         '      <t:FieldURI FieldURI="item:Subject"/>'
-        '      <t:FieldURI FieldURI="item:Body"/>'
         '      <t:FieldURI FieldURI="calendar:Start"/>'
         '      <t:FieldURI FieldURI="calendar:End"/>'
         '      <t:FieldURI FieldURI="calendar:Location"/>'
         "    </t:AdditionalProperties>"
         "  </m:ItemShape>"
         "  <m:CalendarView"
-        f'    StartDate="{_ews_date(range_start)}"'
-        f'    EndDate="{_ews_date(range_end)}"/>'
+        f'    StartDate="{start_iso}"'
+        f'    EndDate="{end_iso}"/>'
         "  <m:ParentFolderIds>"
         '    <t:DistinguishedFolderId Id="calendar"/>'
         "  </m:ParentFolderIds>"
@@ -413,26 +612,28 @@ async def outlook_list_events(
     if resp.status_code >= 400:
         logger.warning("Outlook EWS FindItem failed: HTTP %d – %s", resp.status_code, resp.text[:200])
         raise ProviderError("outlook", resp.status_code, resp.text[:200])
-    return _parse_ews_find_response(resp.text)
+    return _parse_ews_find_response(resp.content)
+
 
+def _parse_ews_find_response(xml_bytes: bytes) -> list[dict[str, Any]]:
+    """Best-effort parse of EWS FindItem CalendarView response.
 
-def _parse_ews_find_response(xml_text: str) -> list[dict[str, Any]]:
-    """Best-effort parse of EWS FindItem CalendarView response."""
+    A truncated or broken XML document keeps the items parsed up to that point.
+    """
     events: list[dict[str, Any]] = []
     try:
-        # Extract CalendarItem blocks
-        for match in re.finditer(
-            r"<t:CalendarItem>(.*?)</t:CalendarItem>", xml_text, re.S
+        for _, elem in etree.iterparse(
+            io.BytesIO(xml_bytes), tag=_EWS_CALENDAR_ITEM_TAG, resolve_entities=False
         ):
-            block = match.group(1)
             item_id = ""
-            id_match = re.search(r'<t:ItemId Id="([^"]*)"', block)
-            if id_match:
-                item_id = id_match.group(1)
-            subject = _ews_extract(block, "t:Subject")
-            start = _ews_extract(block, "t:Start")
-            end = _ews_extract(block, "t:End")
-            location = _ews_extract(block, "t:Location")
+            id_elem = elem.find(_EWS_TYPES_NS + "ItemId")
+            if id_elem is not None:
+                item_id = id_elem.get("Id", "")
+            subject = _ews_extract(elem, "Subject")
+            start = _ews_extract(elem, "Start")
+            end = _ews_extract(elem, "End")
+            location = _ews_extract(elem, "Location")
+            elem.clear()
             events.append(
                 {
                     "external_id": item_id,
@@ -443,15 +644,14 @@ def _parse_ews_find_response(xml_text: str) -> list[dict[str, Any]]:
                     "location": location or None,
                 }
             )
-    except Exception:
-        pass
+    except etree.XMLSyntaxError as exc:
+        logger.warning("Malformed EWS FindItem response: %s", exc)
     return events
 
 
-def _ews_extract(xml: str, tag: str) -> str:
-    """Extract text content of an XML tag."""
-    m = re.search(rf"<{tag}[^>]*>(.*?)</{tag}>", xml, re.S)
-    return m.group(1).strip() if m else ""
+def _ews_extract(elem: etree._Element, tag: str) -> str:
+    """Extract text content of a child element in the EWS types namespace."""
+    return (elem.findtext(_EWS_TYPES_NS + tag) or "").strip()
 
 
 async def outlook_create_event(
@@ -466,19 +666,19 @@ async def outlook_create_event(
     body_elem = ""
     if description:
         body_elem = (
-            f"<t:Body BodyType='Text'>{description}</t:Body>"
+            f"<t:Body BodyType='Text'>{_xesc(description)}</t:Body>"
         )
     location_elem = ""
     if location:
-        location_elem = f"<t:Location>{location}</t:Location>"
+        location_elem = f"<t:Location>{_xesc(location)}</t:Location>"
     body = (
         '<m:CreateItem SendMeetingInvitations="SendToNone">'
         "  <m:Items>"
         "    <t:CalendarItem>"
-        f"      <t:Subject>{title}</t:Subject>"
+        f"      <t:Subject>{_xesc(title)}</t:Subject>"
         f"      {body_elem}"
-        f"      <t:Start>{_ews_date(start)}</t:Start>"
-        f"      <t:End>{_ews_date(end)}</t:End>"
+        f"      <t:Start>{_iso_utc(start)}</t:Start>"
+        f"      <t:End>{_iso_utc(end)}</t:End>"
         f"      {location_elem}"
         "    </t:CalendarItem>"
         "  </m:Items>"
@@ -487,19 +687,48 @@ async def outlook_create_event(
     resp = await _ews_request(integration, body)
     if resp is None or resp.status_code >= 400:
         return None
-    # Extract ItemId from response
-    m = re.search(r'<t:ItemId Id="([^"]*)"', resp.text)
-    return m.group(1) if m else None
+    # The created item's id lives under Items/CalendarItem; other ItemId
+    # elements in the response (e.g. folders) must not be picked up.
+    try:
+        root = etree.fromstring(resp.content, parser=_XML_PARSER)
+    except etree.XMLSyntaxError:
+        return None
+    id_elem = root.find(_EWS_CREATED_ITEM_ID_PATH)
+    return id_elem.get("Id") if id_elem is not None else None
+
+
+async def outlook_create_events(
+    integration: CalendarIntegration,
+    items: Sequence[tuple],
+    concurrency: int = BATCH_CONCURRENCY,
+) -> list[str | None]:
+    """Create several calendar items via EWS concurrently.
+
+    Each item holds ``(title, start, end, description, location)``.
+    """
+    return await _gather_bounded(outlook_create_event, integration, items, concurrency, None)
 
 
 async def outlook_delete_event(integration: CalendarIntegration, item_id: str) -> bool:
     """Delete a calendar item via EWS DeleteItem."""
+    item_id_attr = _xesc(item_id, {'"': "&quot;"})
     body = (
         '<m:DeleteItem DeleteType="MoveToDeletedItems">'
         "  <m:ItemIds>"
-        f'    <t:ItemId Id="{item_id}"/>'
+        f'    <t:ItemId Id="{item_id_attr}"/>'
         "  </m:ItemIds>"
         "</m:DeleteItem>"
     )
     resp = await _ews_request(integration, body)
     return resp is not None and resp.status_code < 400
+
+
+async def outlook_delete_events(
+    integration: CalendarIntegration,
+    item_ids: Sequence[str],
+    concurrency: int = BATCH_CONCURRENCY,
+) -> list[bool]:
+    """Delete several calendar items via EWS concurrently."""
+    return await _gather_bounded(
+        outlook_delete_event, integration, [(iid,) for iid in item_ids], concurrency, False
+    )
@@ -1,6 +1,16 @@
+"""Chat-Speicher: eine SQLite-Datei pro Channel (chat_db_dir/<channel_id>.db).
+
+Die Dateien werden ueber einen begrenzten Pool langlebiger Verbindungen
+angesprochen, nicht pro Nachricht geoeffnet.
+"""
+import asyncio
+import json
 import os
 import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from typing import AsyncIterator
 
 import aiosqlite
 
@@ -20,29 +30,218 @@ CREATE TABLE IF NOT EXISTS messages (
     reply_to_sender TEXT
 );
 
+-- A reaction is just the (message, user, emoji) tuple: the primary key is
+-- the only B-tree and its leading message_id column serves the lookups.
 CREATE TABLE IF NOT EXISTS reactions (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
     message_id TEXT NOT NULL,
     user_id TEXT NOT NULL,
     emoji TEXT NOT NULL,
-    UNIQUE(message_id, user_id, emoji),
+    PRIMARY KEY (message_id, user_id, emoji),
     FOREIGN KEY (message_id) REFERENCES messages(id) ON DELETE CASCADE
-);
+) WITHOUT ROWID;
 
 CREATE INDEX IF NOT EXISTS idx_messages_created ON messages(created_at);
 CREATE INDEX IF NOT EXISTS idx_messages_sender ON messages(sender_id);
-CREATE INDEX IF NOT EXISTS idx_reactions_message ON reactions(message_id);
+"""
+
+# Rebuilds a reactions table from the old layout (id AUTOINCREMENT plus
+# UNIQUE(message_id, user_id, emoji) and idx_reactions_message).
+_MIGRATE_REACTIONS = """
+BEGIN;
+CREATE TABLE reactions_new (
+    message_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    emoji TEXT NOT NULL,
+    PRIMARY KEY (message_id, user_id, emoji),
+    FOREIGN KEY (message_id) REFERENCES messages(id) ON DELETE CASCADE
+) WITHOUT ROWID;
+INSERT OR IGNORE INTO reactions_new (message_id, user_id, emoji)
+    SELECT message_id, user_id, emoji FROM reactions;
+DROP TABLE reactions;
+ALTER TABLE reactions_new RENAME TO reactions;
+COMMIT;
 """
 
 
+# Per-connection tuning. journal_mode=WAL is persistent on the database
+# file and is therefore only set once, in init_chat_db.
+CONNECTION_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=268435456;
+"""
+
+# Statement texts used on the hot paths.  sqlite3 caches compiled
+# statements per connection keyed by SQL text, so with the long-lived
+# connections below each of these is prepared once per channel and then
+# only re-bound.  Every query must therefore use a fixed text.
+_SQL_INSERT_MESSAGE = (
+    "INSERT INTO messages (id, sender_id, content, message_type, file_reference_id, created_at,"
+    " reply_to_id, reply_to_content, reply_to_sender) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_SELECT_RECENT = "SELECT * FROM messages ORDER BY created_at DESC LIMIT ?"
+_SQL_SELECT_BEFORE = "SELECT * FROM messages WHERE created_at < ? ORDER BY created_at DESC LIMIT ?"
+_SQL_SELECT_MESSAGE = "SELECT * FROM messages WHERE id = ?"
+_SQL_UPDATE_MESSAGE = "UPDATE messages SET content = ?, edited_at = ? WHERE id = ?"
+_SQL_DELETE_MESSAGE = "DELETE FROM messages WHERE id = ?"
+_SQL_INSERT_REACTION = "INSERT INTO reactions (message_id, user_id, emoji) VALUES (?, ?, ?)"
+_SQL_DELETE_REACTION = "DELETE FROM reactions WHERE message_id = ? AND user_id = ? AND emoji = ?"
+_SQL_SELECT_REACTIONS = "SELECT message_id, user_id, emoji FROM reactions WHERE message_id = ?"
+# The id list is bound as one JSON array so the text does not vary with
+# the number of messages.
+_SQL_SELECT_REACTIONS_FOR = (
+    "SELECT message_id, user_id, emoji FROM reactions"
+    " WHERE message_id IN (SELECT value FROM json_each(?))"
+)
+
+# Long-lived connections, one per chat database file, in LRU order.  At
+# most settings.chat_db_max_connections stay open; idle ones beyond that
+# are closed.  Each connection has a lock so that one coroutine's
+# statements and its commit/rollback are never interleaved with another's
+# transaction.
+_conns: OrderedDict[str, aiosqlite.Connection] = OrderedDict()
+_conn_locks: dict[str, asyncio.Lock] = {}
+
+# Group commit for new messages.  Messages that arrive while a channel's
+# connection is busy are queued here; a flush task started by the first of
+# them inserts the whole batch in one transaction once it gets the
+# connection, and every sender just waits for that commit.  The task
+# belongs to no request, so a cancelled sender cannot abort the others.
+MAX_MESSAGE_BATCH = 64
+_pending_messages: dict[str, list[tuple[tuple, asyncio.Future]]] = {}
+_flush_tasks: set[asyncio.Task] = set()
+
+
 def _db_path(channel_id: str) -> str:
     return os.path.join(settings.chat_db_dir, f"{channel_id}.db")
 
 
+async def _get_conn(path: str) -> aiosqlite.Connection:
+    """Return the shared connection for *path*, opening it on first use."""
+    db = _conns.get(path)
+    if db is not None:
+        _conns.move_to_end(path)
+        return db
+    lock = _conn_locks.setdefault(path, asyncio.Lock())
+    async with lock:
+        db = _conns.get(path)
+        if db is None:
+            db = await aiosqlite.connect(path)
+            db.row_factory = aiosqlite.Row
+            await db.executescript(CONNECTION_PRAGMAS)
+            _conns[path] = db
+    await _evict_idle(keep=path)
+    return db
+
+
+async def _evict_idle(keep: str | None = None) -> None:
+    """Close least recently used connections beyond the configured cap.
+
+    Connections in use and *keep* (the one being handed out) are skipped,
+    so the pool may briefly exceed the cap while every other connection
+    is busy.
+    """
+    excess = len(_conns) - settings.chat_db_max_connections
+    for path in list(_conns):
+        if excess <= 0:
+            break
+        if path == keep:
+            continue
+        lock = _conn_locks.get(path)
+        if lock is not None and lock.locked():
+            continue
+        db = _conns.pop(path)
+        _conn_locks.pop(path, None)
+        excess -= 1
+        await db.close()
+
+
+@asynccontextmanager
+async def _open(path: str) -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow the shared chat database connection for *path* exclusively.
+
+    Any transaction left open by a failing or cancelled borrower is rolled
+    back so it cannot be committed by the next one.
+    """
+    while True:
+        db = await _get_conn(path)
+        lock = _conn_locks.get(path)
+        if lock is None:
+            continue
+        await lock.acquire()
+        if _conns.get(path) is db:
+            break
+        # Evicted while waiting for the lock; open a fresh connection.
+        lock.release()
+    try:
+        yield db
+    except BaseException:
+        await db.rollback()
+        raise
+    finally:
+        lock.release()
+
+
+async def _insert_message_row(path: str, row: tuple) -> None:
+    """Insert one message row, committing together with concurrent inserts.
+
+    Cancelling the caller does not withdraw the row once it is queued.
+    """
+    fut = asyncio.get_running_loop().create_future()
+    batch = _pending_messages.get(path)
+    if batch is not None and len(batch) < MAX_MESSAGE_BATCH:
+        batch.append((row, fut))
+    else:
+        batch = [(row, fut)]
+        _pending_messages[path] = batch
+        task = asyncio.create_task(_flush_messages(path, batch))
+        _flush_tasks.add(task)
+        task.add_done_callback(_flush_tasks.discard)
+    await asyncio.shield(fut)
+
+
+async def _flush_messages(path: str, batch: list[tuple[tuple, asyncio.Future]]) -> None:
+    """Insert a queued batch in one transaction and resolve its futures."""
+    try:
+        async with _open(path) as db:
+            # Close the batch; later arrivals start the next one.
+            if _pending_messages.get(path) is batch:
+                del _pending_messages[path]
+            await db.executemany(_SQL_INSERT_MESSAGE, [r for r, _ in batch])
+            await db.commit()
+    except BaseException as exc:
+        if _pending_messages.get(path) is batch:
+            del _pending_messages[path]
+        for _, fut in batch:
+            if not fut.done():
+                fut.set_exception(
+                    exc if isinstance(exc, Exception) else RuntimeError("message batch aborted")
+                )
+        if not isinstance(exc, Exception):
+            raise
+        return
+    for _, fut in batch:
+        if not fut.done():
+            fut.set_result(None)
+
+
+async def close_all() -> None:
+    """Close every cached chat database connection."""
+    if _flush_tasks:
+        await asyncio.gather(*_flush_tasks, return_exceptions=True)
+    conns = list(_conns.values())
+    _conns.clear()
+    _conn_locks.clear()
+    for db in conns:
+        await db.close()
+
+
 async def init_chat_db(channel_id: str) -> None:
     os.makedirs(settings.chat_db_dir, exist_ok=True)
     path = _db_path(channel_id)
-    async with aiosqlite.connect(path) as db:
+    async with _open(path) as db:
+        await db.execute("PRAGMA journal_mode=WAL")
         await db.executescript(CHAT_SCHEMA)
         # Migrate existing databases: add reply columns if missing
         try:
@@ -58,6 +257,9 @@ async def init_chat_db(channel_id: str) -> None:
         except Exception:
             pass
         await db.commit()
+        cursor = await db.execute("PRAGMA table_info(reactions)")
+        if any(col["name"] == "id" for col in await cursor.fetchall()):
+            await db.executescript(_MIGRATE_REACTIONS)
 
 
 async def add_message(
@@ -74,13 +276,10 @@ async def add_message(
     now = datetime.now(timezone.utc).isoformat()
     path = _db_path(channel_id)
 
-    async with aiosqlite.connect(path) as db:
-        await db.execute(
-            """INSERT INTO messages (id, sender_id, content, message_type, file_reference_id, created_at, reply_to_id, reply_to_content, reply_to_sender)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (msg_id, sender_id, content, message_type, file_reference_id, now, reply_to_id, reply_to_content, reply_to_sender),
-        )
-        await db.commit()
+    await _insert_message_row(
+        path,
+        (msg_id, sender_id, content, message_type, file_reference_id, now, reply_to_id, reply_to_content, reply_to_sender),
+    )
 
     return {
         "id": msg_id,
@@ -105,19 +304,11 @@ async def get_messages(
     if not os.path.exists(path):
         return []
 
-    async with aiosqlite.connect(path) as db:
-        db.row_factory = aiosqlite.Row
+    async with _open(path) as db:
         if before:
-            cursor = await db.execute(
-                """SELECT * FROM messages WHERE created_at < ?
-                   ORDER BY created_at DESC LIMIT ?""",
-                (before, limit),
-            )
+            cursor = await db.execute(_SQL_SELECT_BEFORE, (before, limit))
         else:
-            cursor = await db.execute(
-                "SELECT * FROM messages ORDER BY created_at DESC LIMIT ?",
-                (limit,),
-            )
+            cursor = await db.execute(_SQL_SELECT_RECENT, (limit,))
         rows = await cursor.fetchall()
         return [dict(row) for row in reversed(rows)]
 
@@ -126,14 +317,10 @@ async def update_message(channel_id: str, message_id: str, content: str) -> dict
     path = _db_path(channel_id)
     now = datetime.now(timezone.utc).isoformat()
 
-    async with aiosqlite.connect(path) as db:
-        db.row_factory = aiosqlite.Row
-        await db.execute(
-            "UPDATE messages SET content = ?, edited_at = ? WHERE id = ?",
-            (content, now, message_id),
-        )
+    async with _open(path) as db:
+        await db.execute(_SQL_UPDATE_MESSAGE, (content, now, message_id))
         await db.commit()
-        cursor = await db.execute("SELECT * FROM messages WHERE id = ?", (message_id,))
+        cursor = await db.execute(_SQL_SELECT_MESSAGE, (message_id,))
         row = await cursor.fetchone()
         return dict(row) if row else None
 
@@ -143,17 +330,16 @@ async def get_message_by_id(channel_id: str, message_id: str) -> dict | None:
     if not os.path.exists(path):
         return None
 
-    async with aiosqlite.connect(path) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute("SELECT * FROM messages WHERE id = ?", (message_id,))
+    async with _open(path) as db:
+        cursor = await db.execute(_SQL_SELECT_MESSAGE, (message_id,))
         row = await cursor.fetchone()
         return dict(row) if row else None
 
 
 async def delete_message(channel_id: str, message_id: str) -> bool:
     path = _db_path(channel_id)
-    async with aiosqlite.connect(path) as db:
-        cursor = await db.execute("DELETE FROM messages WHERE id = ?", (message_id,))
+    async with _open(path) as db:
+        cursor = await db.execute(_SQL_DELETE_MESSAGE, (message_id,))
         await db.commit()
         return cursor.rowcount > 0
 
@@ -162,39 +348,29 @@ async def add_reaction(
     channel_id: str, message_id: str, user_id: str, emoji: str
 ) -> bool:
     path = _db_path(channel_id)
-    async with aiosqlite.connect(path) as db:
-        try:
-            await db.execute(
-                """INSERT INTO reactions (message_id, user_id, emoji)
-                   VALUES (?, ?, ?)""",
-                (message_id, user_id, emoji),
-            )
+    try:
+        async with _open(path) as db:
+            await db.execute(_SQL_INSERT_REACTION, (message_id, user_id, emoji))
             await db.commit()
-            return True
-        except aiosqlite.IntegrityError:
-            return False
+    except aiosqlite.IntegrityError:
+        return False
+    return True
 
 
 async def remove_reaction(
     channel_id: str, message_id: str, user_id: str, emoji: str
 ) -> bool:
     path = _db_path(channel_id)
-    async with aiosqlite.connect(path) as db:
-        cursor = await db.execute(
-            "DELETE FROM reactions WHERE message_id = ? AND user_id = ? AND emoji = ?",
-            (message_id, user_id, emoji),
-        )
+    async with _open(path) as db:
+        cursor = await db.execute(_SQL_DELETE_REACTION, (message_id, user_id, emoji))
         await db.commit()
         return cursor.rowcount > 0
 
 
 async def get_reactions(channel_id: str, message_id: str) -> list[dict]:
     path = _db_path(channel_id)
-    async with aiosqlite.connect(path) as db:
-        db.row_factory = aiosqlite.Row
-        cursor = await db.execute(
-            "SELECT * FROM reactions WHERE message_id = ?", (message_id,)
-        )
+    async with _open(path) as db:
+        cursor = await db.execute(_SQL_SELECT_REACTIONS, (message_id,))
         rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
@@ -206,13 +382,8 @@ async def get_reactions_for_messages(
     path = _db_path(channel_id)
     if not os.path.exists(path) or not message_ids:
         return {}
-    async with aiosqlite.connect(path) as db:
-        db.row_factory = aiosqlite.Row
-        placeholders = ",".join("?" * len(message_ids))
-        cursor = await db.execute(
-            f"SELECT message_id, user_id, emoji FROM reactions WHERE message_id IN ({placeholders})",
-            message_ids,
-        )
+    async with _open(path) as db:
+        cursor = await db.execute(_SQL_SELECT_REACTIONS_FOR, (json.dumps(message_ids),))
         rows = await cursor.fetchall()
     result: dict[str, list[dict]] = {}
     for row in rows:
@@ -1,4 +1,5 @@
 """E-Mail-Service fuer Einladungen per SMTP."""
+import asyncio
 import logging
 from email.message import EmailMessage
 from email.mime.base import MIMEBase
@@ -12,6 +13,51 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Eine SMTP-Verbindung fuer alle Einladungen statt Verbindungsaufbau,
+# STARTTLS und Login pro E-Mail
+_smtp: aiosmtplib.SMTP | None = None
+_smtp_lock = asyncio.Lock()
+
+
+async def _get_smtp() -> aiosmtplib.SMTP:
+    """Liefert die gemeinsame SMTP-Verbindung und verbindet bei Bedarf neu."""
+    global _smtp
+    if _smtp is None:
+        _smtp = aiosmtplib.SMTP(
+            hostname=settings.smtp_host,
+            port=settings.smtp_port,
+            username=settings.smtp_user or None,
+            password=settings.smtp_password or None,
+            use_tls=settings.smtp_use_tls,
+        )
+    if not _smtp.is_connected:
+        await _smtp.connect()
+    return _smtp
+
+
+async def _send(msg: MIMEMultipart) -> None:
+    async with _smtp_lock:
+        smtp = await _get_smtp()
+        try:
+            await smtp.send_message(msg)
+        except aiosmtplib.SMTPServerDisconnected:
+            # Server hat die Leerlauf-Verbindung geschlossen: einmal neu verbinden
+            smtp.close()
+            smtp = await _get_smtp()
+            await smtp.send_message(msg)
+
+
+async def close_smtp() -> None:
+    """Schliesst die gemeinsame SMTP-Verbindung (App-Shutdown)."""
+    global _smtp
+    async with _smtp_lock:
+        if _smtp is not None and _smtp.is_connected:
+            try:
+                await _smtp.quit()
+            except aiosmtplib.SMTPException:
+                _smtp.close()
+        _smtp = None
+
 
 async def send_invitation_email(
     to_email: str,
@@ -72,14 +118,7 @@ async def send_invitation_email(
     msg.attach(ics_part)
 
     try:
-        await aiosmtplib.send(
-            msg,
-            hostname=settings.smtp_host,
-            port=settings.smtp_port,
-            username=settings.smtp_user or None,
-            password=settings.smtp_password or None,
-            use_tls=settings.smtp_use_tls,
-        )
+        await _send(msg)
         logger.info(f"Einladungs-E-Mail an {to_email} gesendet")
         return True
     except Exception as e:
@@ -1,6 +1,7 @@
 import uuid
+from collections.abc import Sequence
 
-from sqlalchemy import and_, select, update
+from sqlalchemy import and_, func, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.channel import Channel, ChannelMember
@@ -15,12 +16,13 @@ async def create_feed_events(
     event_type: str,
     preview_text: str | None,
     message_id: str | None = None,
-    target_user_id: uuid.UUID | None = None,
+    target_user_ids: Sequence[uuid.UUID] | None = None,
 ) -> list[FeedEvent]:
-    """Erstellt Feed-Events. Bei target_user_id wird nur fuer diesen User ein Event erstellt."""
-    if target_user_id:
-        # Gezieltes Event (z.B. @mention)
-        member_ids = [target_user_id]
+    """Erstellt Feed-Events. Bei target_user_ids nur fuer diese User, sonst
+    fuer alle abonnierten Mitglieder ausser dem Absender."""
+    if target_user_ids is not None:
+        # Gezielte Events in einer INSERT-Anweisung (z.B. Reaktion, @mentions)
+        member_ids = target_user_ids
     else:
         result = await db.execute(
             select(ChannelMember.user_id).where(
@@ -33,21 +35,40 @@ async def create_feed_events(
         )
         member_ids = [row[0] for row in result.all()]
 
-    events = []
-    for uid in member_ids:
-        event = FeedEvent(
-            user_id=uid,
-            channel_id=channel_id,
-            sender_id=sender_id,
-            event_type=event_type,
-            preview_text=(preview_text[:200] if preview_text else None),
-            message_id=message_id,
+    if not member_ids:
+        return []
+
+    # Namen einmal lesen und in jede Zeile schreiben (get_feed braucht keine Joins)
+    names = await db.execute(
+        select(
+            select(User.display_name).where(User.id == sender_id).scalar_subquery(),
+            select(Channel.name).where(Channel.id == channel_id).scalar_subquery(),
         )
-        db.add(event)
-        events.append(event)
+    )
+    sender_display_name, channel_name = names.one()
 
-    await db.flush()
-    return events
+    # Eine Multi-Row-INSERT statt einer INSERT-Anweisung pro Mitglied
+    preview = preview_text[:200] if preview_text else None
+    rows = [
+        {
+            "user_id": uid,
+            "channel_id": channel_id,
+            "sender_id": sender_id,
+            "event_type": event_type,
+            "preview_text": preview,
+            "message_id": message_id,
+            "sender_display_name": sender_display_name,
+            "channel_name": channel_name,
+        }
+        for uid in member_ids
+    ]
+    result = await db.scalars(insert(FeedEvent).returning(FeedEvent), rows)
+    return list(result.all())
+
+
+def encode_feed_cursor(event: dict) -> str:
+    """Cursor fuer die Seite nach *event* (ein Eintrag aus get_feed)."""
+    return event["id"]
 
 
 async def get_feed(
@@ -56,37 +77,80 @@ async def get_feed(
     limit: int = 50,
     offset: int = 0,
     unread_only: bool = False,
+    cursor: str | None = None,
 ) -> list[dict]:
-    query = (
-        select(FeedEvent, User.display_name, Channel.name)
-        .join(User, FeedEvent.sender_id == User.id)
-        .join(Channel, FeedEvent.channel_id == Channel.id)
-        .where(FeedEvent.user_id == user_id)
-    )
+    """Neueste Feed-Events zuerst.
+
+    Mit *cursor* (aus encode_feed_cursor) wird per Keyset ab dem letzten
+    Event der vorigen Seite weitergelesen; offset wird dann ignoriert.
+    Ein ungueltiger Cursor loest ValueError aus.
+    """
+    query = select(FeedEvent).where(FeedEvent.user_id == user_id)
     if unread_only:
         query = query.where(FeedEvent.is_read == False)
 
-    query = query.order_by(FeedEvent.created_at.desc()).offset(offset).limit(limit)
-    result = await db.execute(query)
-    rows = result.all()
+    if cursor:
+        # Spalte gegen Spalte vergleichen: der Zeitstempel des Cursor-Events
+        # wird per Primaerschluessel nachgeschlagen statt aus dem Cursor
+        # geparst, so passen Genauigkeit und Speicherformat immer
+        cursor_id = uuid.UUID(cursor)
+        cursor_ts = (
+            select(FeedEvent.created_at)
+            .where(FeedEvent.id == cursor_id)
+            .scalar_subquery()
+        )
+        query = query.where(
+            or_(
+                FeedEvent.created_at < cursor_ts,
+                and_(FeedEvent.created_at == cursor_ts, FeedEvent.id < cursor_id),
+            )
+        )
+    elif offset:
+        query = query.offset(offset)
+
+    query = query.order_by(FeedEvent.created_at.desc(), FeedEvent.id.desc()).limit(limit)
+    result = await db.scalars(query)
+    events = result.all()
 
     return [
         {
             "id": str(event.id),
             "channel_id": str(event.channel_id),
             "sender_id": str(event.sender_id),
-            "sender_name": sender_name,
-            "channel_name": channel_name,
+            "sender_name": event.sender_display_name,
+            "channel_name": event.channel_name,
             "event_type": event.event_type,
             "preview_text": event.preview_text,
             "message_id": event.message_id,
             "is_read": event.is_read,
             "created_at": event.created_at.isoformat(),
         }
-        for event, sender_name, channel_name in rows
+        for event in events
     ]
 
 
+async def rename_feed_channel(
+    db: AsyncSession, channel_id: uuid.UUID, name: str
+) -> None:
+    """Zieht den denormalisierten Channel-Namen in bestehenden Feed-Events nach."""
+    await db.execute(
+        update(FeedEvent)
+        .where(FeedEvent.channel_id == channel_id)
+        .values(channel_name=name)
+    )
+
+
+async def rename_feed_sender(
+    db: AsyncSession, sender_id: uuid.UUID, display_name: str
+) -> None:
+    """Zieht den denormalisierten Absendernamen in bestehenden Feed-Events nach."""
+    await db.execute(
+        update(FeedEvent)
+        .where(FeedEvent.sender_id == sender_id)
+        .values(sender_display_name=display_name)
+    )
+
+
 async def mark_feed_read(
     db: AsyncSession,
     user_id: uuid.UUID,
@@ -108,7 +172,7 @@ async def mark_feed_read(
 
 async def get_unread_count(db: AsyncSession, user_id: uuid.UUID) -> int:
     result = await db.execute(
-        select(FeedEvent)
+        select(func.count(FeedEvent.id))
         .where(and_(FeedEvent.user_id == user_id, FeedEvent.is_read == False))
     )
-    return len(result.all())
+    return result.scalar_one()
@@ -11,13 +11,7 @@ from app.config import settings
 from app.models.file import File, FileReference
 
 
-async def compute_md5(file: UploadFile) -> str:
-    md5 = hashlib.md5()
-    await file.seek(0)
-    while chunk := await file.read(8192):
-        md5.update(chunk)
-    await file.seek(0)
-    return md5.hexdigest()
+CHUNK_SIZE = 1 << 20
 
 
 def _storage_path(md5_hash: str) -> str:
@@ -32,21 +26,34 @@ async def store_file(
     channel_id: uuid.UUID | None = None,
     message_id: str | None = None,
 ) -> tuple[File, FileReference]:
-    md5_hash = await compute_md5(file)
-
-    result = await db.execute(select(File).where(File.md5_hash == md5_hash))
-    existing_file = result.scalar_one_or_none()
-
-    if existing_file is None:
-        storage_path = _storage_path(md5_hash)
-        os.makedirs(os.path.dirname(storage_path), exist_ok=True)
-
-        async with aiofiles.open(storage_path, "wb") as f:
+    # Single pass: hash while copying to a temp file, then move into place
+    os.makedirs(settings.upload_dir, exist_ok=True)
+    tmp_path = os.path.join(settings.upload_dir, f".tmp.{uuid.uuid4().hex}")
+    # MD5 stays the content key: stored files, File.md5_hash and the API's
+    # md5_hash field all depend on it, and a new hash would break dedup
+    md5 = hashlib.md5()
+    file_size = 0
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
             await file.seek(0)
-            while chunk := await file.read(8192):
+            while chunk := await file.read(CHUNK_SIZE):
+                md5.update(chunk)
+                file_size += len(chunk)
                 await f.write(chunk)
+        md5_hash = md5.hexdigest()
 
-        file_size = os.path.getsize(storage_path)
+        result = await db.execute(select(File).where(File.md5_hash == md5_hash))
+        existing_file = result.scalar_one_or_none()
+
+        if existing_file is None:
+            storage_path = _storage_path(md5_hash)
+            os.makedirs(os.path.dirname(storage_path), exist_ok=True)
+            os.replace(tmp_path, storage_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    if existing_file is None:
         db_file = File(
             md5_hash=md5_hash,
             file_path=storage_path,
@@ -74,17 +81,9 @@ async def store_file(
 async def get_file_path(db: AsyncSession, file_ref_id: uuid.UUID) -> tuple[str, str, str] | None:
     """Return (file_path, original_filename, mime_type) or None."""
     result = await db.execute(
-        select(FileReference)
+        select(File.file_path, FileReference.original_filename, File.mime_type)
+        .join(FileReference, FileReference.file_id == File.id)
         .where(FileReference.id == file_ref_id)
-        .options()
     )
-    ref = result.scalar_one_or_none()
-    if ref is None:
-        return None
-
-    file_result = await db.execute(select(File).where(File.id == ref.file_id))
-    db_file = file_result.scalar_one_or_none()
-    if db_file is None:
-        return None
-
-    return db_file.file_path, ref.original_filename, db_file.mime_type
+    row = result.first()
+    return tuple(row) if row else None
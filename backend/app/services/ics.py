@@ -1,11 +1,66 @@
 """ICS-Kalendereinladungen generieren."""
 import uuid
 from datetime import datetime, timedelta, timezone
-
-from icalendar import Calendar, Event, vText
+from string import Template
 
 from app.config import settings
 
+# Feste RFC-5545-Struktur; pro Einladung werden nur die Werte eingesetzt
+ICS_TEMPLATE = Template(
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:-//Agora Teams Clone//DE\r\n"
+    "METHOD:REQUEST\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:$uid\r\n"
+    "DTSTAMP:$dtstamp\r\n"
+    "DTSTART:$dtstart\r\n"
+    "DTEND:$dtend\r\n"
+    "SUMMARY:$summary\r\n"
+    "DESCRIPTION:$description\r\n"
+    "ORGANIZER:mailto:$organizer\r\n"
+    "ATTENDEE:mailto:$attendee\r\n"
+    "URL:$url\r\n"
+    "STATUS:CONFIRMED\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+)
+
+_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", ";": "\\;", ",": "\\,", "\n": "\\n"})
+
+
+def _esc(value: str) -> str:
+    """Maskiert einen TEXT-Wert nach RFC 5545, Abschnitt 3.3.11."""
+    return value.replace("\r\n", "\n").translate(_TEXT_ESCAPES)
+
+
+def _ics_datetime(dt: datetime) -> str:
+    """Zeitzonenbehaftete Werte als UTC (...Z), naive als lokale Zeit."""
+    if dt.tzinfo is None:
+        return f"{dt:%Y%m%dT%H%M%S}"
+    return f"{dt.astimezone(timezone.utc):%Y%m%dT%H%M%SZ}"
+
+
+def _fold(line: str) -> str:
+    """Faltet eine Inhaltszeile auf hoechstens 75 Oktette (RFC 5545, 3.1)."""
+    if len(line.encode("utf-8")) <= 75:
+        return line
+    parts = []
+    current = ""
+    size = 0
+    limit = 75
+    for ch in line:
+        ch_size = len(ch.encode("utf-8"))
+        if size + ch_size > limit:
+            parts.append(current)
+            current = ""
+            size = 0
+            limit = 74  # Folgezeilen beginnen mit einem Leerzeichen
+        current += ch
+        size += ch_size
+    parts.append(current)
+    return "\r\n ".join(parts)
+
 
 def generate_invitation_ics(
     channel_name: str,
@@ -21,36 +76,26 @@ def generate_invitation_ics(
 
     Wenn keine start_time angegeben ist, wird jetzt + 15 Minuten verwendet.
     """
-    cal = Calendar()
-    cal.add("prodid", "-//Agora Teams Clone//DE")
-    cal.add("version", "2.0")
-    cal.add("method", "REQUEST")
-
-    event = Event()
-    event.add("uid", str(uuid.uuid4()))
-    event.add("summary", channel_name)
-
     description = f"{inviter_name} hat Sie zum Termin \"{channel_name}\" eingeladen.\n"
     if message:
         description += f"\n{message}\n"
     description += f"\nBeitreten: {invite_link}"
-    event.add("description", description)
 
+    now = datetime.now(timezone.utc)
     if start_time is None:
-        start_time = datetime.now(timezone.utc) + timedelta(minutes=15)
-    event.add("dtstart", start_time)
-    if end_time is not None:
-        event.add("dtend", end_time)
-    else:
-        event.add("dtend", start_time + timedelta(hours=1))
-    event.add("dtstamp", datetime.now(timezone.utc))
-
-    event.add("organizer", f"mailto:{inviter_email}")
-    event.add("attendee", f"mailto:{invited_email}")
-
-    event.add("url", invite_link)
-    event.add("status", "CONFIRMED")
-
-    cal.add_component(event)
+        start_time = now + timedelta(minutes=15)
+    if end_time is None:
+        end_time = start_time + timedelta(hours=1)
 
-    return cal.to_ical()
+    body = ICS_TEMPLATE.substitute(
+        uid=uuid.uuid4(),
+        dtstamp=_ics_datetime(now),
+        dtstart=_ics_datetime(start_time),
+        dtend=_ics_datetime(end_time),
+        summary=_esc(channel_name),
+        description=_esc(description),
+        organizer=inviter_email,
+        attendee=invited_email,
+        url=invite_link,
+    )
+    return "\r\n".join(_fold(line) for line in body.split("\r\n")).encode("utf-8")
@@ -12,20 +12,35 @@ class JanusClient:
         self.api_secret = settings.janus_api_secret
         self._session_id: int | None = None
         self._handle_id: int | None = None
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # One keep-alive client for all Janus calls instead of a new
+        # TCP/TLS handshake per request
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=32),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def _request(self, data: dict) -> dict:
         data["transaction"] = str(uuid.uuid4())[:12]
         if self.api_secret:
             data["apisecret"] = self.api_secret
 
-        async with httpx.AsyncClient() as client:
-            url = self.base_url
-            if self._session_id:
-                url += f"/{self._session_id}"
-                if self._handle_id:
-                    url += f"/{self._handle_id}"
-            resp = await client.post(url, json=data, timeout=10.0)
-            return resp.json()
+        url = self.base_url
+        if self._session_id:
+            url += f"/{self._session_id}"
+            if self._handle_id:
+                url += f"/{self._handle_id}"
+        resp = await self._get_client().post(url, json=data)
+        return resp.json()
 
     async def create_session(self) -> int:
         result = await self._request({"janus": "create"})
@@ -1,6 +1,8 @@
 """LDAP/Active Directory authentication service."""
 
+import asyncio
 import logging
+from functools import lru_cache
 from typing import Any
 
 from app.config import settings
@@ -8,43 +10,85 @@ from app.config import settings
 logger = logging.getLogger(__name__)
 
 
-def ldap_authenticate(username: str, password: str) -> dict[str, Any] | None:
+async def ldap_authenticate(username: str, password: str) -> dict[str, Any] | None:
     """Authenticate user against LDAP/AD and return user attributes.
 
+    ldap3 does blocking network I/O, so the binds and the search run in a
+    worker thread instead of on the event loop.
+
     Returns dict with username, email, display_name, is_admin or None if auth fails.
     """
     if not settings.ldap_enabled or not settings.ldap_server:
         return None
+    return await asyncio.to_thread(_ldap_authenticate_sync, username, password)
+
+
+@lru_cache(maxsize=4)
+def _ldap_server(host: str, port: int, use_ssl: bool):
+    """Server descriptor, created once per configuration.
+
+    get_info=NONE skips reading the root DSE and schema on every connect.
+    """
+    from ldap3 import NONE, Server
 
+    return Server(host, port=port, use_ssl=use_ssl, get_info=NONE)
+
+
+@lru_cache(maxsize=4)
+def _service_connection(host: str, port: int, use_ssl: bool, bind_dn: str, bind_password: str):
+    """Long-lived, thread-safe connection used for user searches.
+
+    SAFE_RESTARTABLE reconnects and rebinds on its own if the server drops
+    the connection, so the service-account bind happens once, not per login.
+    """
+    from ldap3 import SAFE_RESTARTABLE, Connection
+
+    server = _ldap_server(host, port, use_ssl)
+    if bind_dn:
+        return Connection(
+            server,
+            user=bind_dn,
+            password=bind_password,
+            client_strategy=SAFE_RESTARTABLE,
+            auto_bind=True,
+        )
+    return Connection(server, client_strategy=SAFE_RESTARTABLE, auto_bind=True)
+
+
+def _attr_values(attributes: dict[str, Any], name: str) -> list[str]:
+    value = attributes.get(name)
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+def _first_attr(attributes: dict[str, Any], name: str, default: str) -> str:
+    values = _attr_values(attributes, name)
+    return values[0] if values else default
+
+
+def _ldap_authenticate_sync(username: str, password: str) -> dict[str, Any] | None:
     try:
-        import ldap3
-        from ldap3 import Server, Connection, ALL, SUBTREE
+        from ldap3 import SUBTREE, Connection
     except ImportError:
         logger.error("ldap3 package not installed. Run: pip install ldap3")
         return None
 
     try:
-        server = Server(
+        server = _ldap_server(settings.ldap_server, settings.ldap_port, settings.ldap_use_ssl)
+        conn = _service_connection(
             settings.ldap_server,
-            port=settings.ldap_port,
-            use_ssl=settings.ldap_use_ssl,
-            get_info=ALL,
+            settings.ldap_port,
+            settings.ldap_use_ssl,
+            settings.ldap_bind_dn,
+            settings.ldap_bind_password,
         )
 
-        # First bind with service account to search for the user
-        if settings.ldap_bind_dn:
-            conn = Connection(
-                server,
-                user=settings.ldap_bind_dn,
-                password=settings.ldap_bind_password,
-                auto_bind=True,
-            )
-        else:
-            conn = Connection(server, auto_bind=True)
-
         # Search for user
         user_filter = settings.ldap_user_filter.replace("{username}", username)
-        conn.search(
+        _status, _result, response, _request = conn.search(
             search_base=settings.ldap_base_dn,
             search_filter=user_filter,
             search_scope=SUBTREE,
@@ -56,34 +100,32 @@ def ldap_authenticate(username: str, password: str) -> dict[str, Any] | None:
             ],
         )
 
-        if not conn.entries:
+        entries = [r for r in response or [] if r.get("type") == "searchResEntry"]
+        if not entries:
             logger.info(f"LDAP: User '{username}' not found")
-            conn.unbind()
             return None
 
-        user_entry = conn.entries[0]
-        user_dn = user_entry.entry_dn
-        conn.unbind()
+        user_dn = entries[0]["dn"]
+        attributes = entries[0].get("attributes", {})
+        member_of = _attr_values(attributes, "memberOf")
 
         # Check group membership if required
         if settings.ldap_group_dn:
-            member_of = [str(g) for g in getattr(user_entry, "memberOf", [])]
             if settings.ldap_group_dn not in member_of:
                 logger.info(f"LDAP: User '{username}' not in required group")
                 return None
 
-        # Verify password by binding as the user
+        # Verify password by binding as the user (fresh connection per login)
         user_conn = Connection(server, user=user_dn, password=password, auto_bind=True)
         user_conn.unbind()
 
         # Extract attributes
-        email = str(getattr(user_entry, settings.ldap_email_attr, f"{username}@ldap.local"))
-        display_name = str(getattr(user_entry, settings.ldap_display_name_attr, username))
+        email = _first_attr(attributes, settings.ldap_email_attr, f"{username}@ldap.local")
+        display_name = _first_attr(attributes, settings.ldap_display_name_attr, username)
 
         # Check admin group membership
         is_admin = False
         if settings.ldap_admin_group_dn:
-            member_of = [str(g) for g in getattr(user_entry, "memberOf", [])]
             is_admin = settings.ldap_admin_group_dn in member_of
 
         return {
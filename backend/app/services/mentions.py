@@ -2,7 +2,7 @@
 import re
 import uuid
 
-from sqlalchemy import or_, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.channel import ChannelMember
@@ -20,6 +20,9 @@ def extract_mentions(content: str) -> list[str]:
       - @username
       - @"Vorname Nachname"
     """
+    # Die meisten Nachrichten enthalten kein "@": Regex-Durchlauf sparen
+    if "@" not in content:
+        return []
     mentions = []
     for match in MENTION_PATTERN.finditer(content):
         quoted = match.group(1)
@@ -37,28 +40,19 @@ async def resolve_mentions(
     if not mentions:
         return []
 
-    # Alle Channel-Mitglieder laden
-    member_result = await db.execute(
-        select(ChannelMember.user_id).where(
-            ChannelMember.channel_id == channel_id
+    # Eine Abfrage: Channel-Mitglieder, deren Username oder Display-Name
+    # (ohne Beachtung der Gross-/Kleinschreibung) einer Mention entspricht
+    lowered = list({m.lower() for m in mentions})
+    result = await db.execute(
+        select(User.id)
+        .join(ChannelMember, ChannelMember.user_id == User.id)
+        .where(
+            ChannelMember.channel_id == channel_id,
+            or_(
+                func.lower(User.username).in_(lowered),
+                func.lower(User.display_name).in_(lowered),
+            ),
         )
+        .distinct()
     )
-    member_ids = {row[0] for row in member_result.all()}
-
-    resolved_ids = set()
-    for mention_text in mentions:
-        # Nach Username oder Display-Name suchen
-        result = await db.execute(
-            select(User).where(
-                or_(
-                    User.username.ilike(mention_text),
-                    User.display_name.ilike(mention_text),
-                )
-            )
-        )
-        users = result.scalars().all()
-        for user in users:
-            if user.id in member_ids:
-                resolved_ids.add(user.id)
-
-    return list(resolved_ids)
+    return list(result.scalars().all())
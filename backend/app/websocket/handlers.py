@@ -1,9 +1,15 @@
-import json
+import asyncio
+import hashlib
+import logging
+import time
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
 
 from fastapi import WebSocket, WebSocketDisconnect
 from jose import JWTError, jwt
-from sqlalchemy import and_, select
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.database import async_session
@@ -20,13 +26,38 @@ from app.services.chat_db import (
 )
 from app.services.feed import create_feed_events
 from app.services.mentions import extract_mentions, resolve_mentions
-from app.websocket.manager import manager
+from app.websocket.manager import decode_json, encode_json, manager
+
+logger = logging.getLogger(__name__)
+
+
+# Reconnecting clients present the same token again and again.  Verified
+# tokens are remembered briefly (never past their exp) together with the
+# loaded user, so a reconnect skips both the signature check and the
+# user lookup.
+_WS_AUTH_TTL = 60.0
+_WS_AUTH_CACHE_SIZE = 10_000
+_ws_auth_cache: OrderedDict[bytes, tuple[User, float]] = OrderedDict()
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2s(token.encode(), digest_size=16).digest()
 
 
 async def authenticate_ws(websocket: WebSocket) -> User | None:
     token = websocket.query_params.get("token")
     if not token:
         return None
+
+    key = _token_key(token)
+    cached = _ws_auth_cache.get(key)
+    if cached is not None:
+        user, valid_until = cached
+        if time.monotonic() < valid_until:
+            _ws_auth_cache.move_to_end(key)
+            return user
+        del _ws_auth_cache[key]
+
     try:
         payload = jwt.decode(
             token, settings.jwt_secret, algorithms=[settings.jwt_algorithm]
@@ -39,10 +70,86 @@ async def authenticate_ws(websocket: WebSocket) -> User | None:
             result = await db.execute(
                 select(User).where(User.id == uuid.UUID(user_id))
             )
-            return result.scalar_one_or_none()
+            user = result.scalar_one_or_none()
     except (JWTError, ValueError):
         return None
 
+    if user is not None:
+        ttl = _WS_AUTH_TTL
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(ttl, exp - time.time())
+        if ttl > 0:
+            _ws_auth_cache[key] = (user, time.monotonic() + ttl)
+            if len(_ws_auth_cache) > _WS_AUTH_CACHE_SIZE:
+                _ws_auth_cache.popitem(last=False)
+    return user
+
+
+# Strong references to running side-effect tasks (the event loop only
+# keeps weak ones).
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> None:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def _persist_message_side_effects(
+    channel_id: str,
+    channel_uuid: uuid.UUID,
+    sender_id: uuid.UUID,
+    content: str,
+    message_id: str,
+    notification_payload: dict,
+) -> None:
+    """Feed events and mention events for a new chat message, then notify
+    members that are not connected to the channel WebSocket."""
+    try:
+        async with async_session() as db:
+            await create_feed_events(
+                db,
+                channel_uuid,
+                sender_id,
+                event_type="message",
+                preview_text=content[:200],
+                message_id=message_id,
+            )
+
+            # Mentions verarbeiten
+            mention_texts = extract_mentions(content)
+            if mention_texts:
+                mentioned_ids = await resolve_mentions(
+                    db, mention_texts, channel_uuid
+                )
+                await create_feed_events(
+                    db,
+                    channel_uuid,
+                    sender_id,
+                    event_type="mention",
+                    preview_text=f"@Erwaehnung: {content[:150]}",
+                    message_id=message_id,
+                    target_user_ids=[uid for uid in mentioned_ids if uid != sender_id],
+                )
+
+            # Notify channel members who are NOT in the channel WS
+            result = await db.execute(
+                select(ChannelMember.user_id).where(
+                    ChannelMember.channel_id == channel_uuid
+                )
+            )
+            member_ids = [str(row[0]) for row in result.all()]
+
+            await db.commit()
+
+        await manager.notify_channel_members(
+            channel_id, member_ids, notification_payload, exclude_user=str(sender_id)
+        )
+    except Exception:
+        logger.exception("Feed/mention processing failed for message %s", message_id)
+
 
 async def notification_ws_endpoint(websocket: WebSocket):
     """Persistent notification WebSocket – stays open for the user's entire session.
@@ -66,11 +173,11 @@ async def notification_ws_endpoint(websocket: WebSocket):
 
     try:
         while True:
-            data = await websocket.receive_json()
+            data = decode_json(await websocket.receive_text())
             msg_type = data.get("type")
 
             if msg_type == "ping":
-                await websocket.send_json({"type": "pong"})
+                manager.queue_text(websocket, encode_json({"type": "pong"}))
 
             elif msg_type == "status_change":
                 new_status = data.get("status", "online")
@@ -122,442 +229,460 @@ async def notification_ws_endpoint(websocket: WebSocket):
                 pass
 
 
-async def websocket_endpoint(websocket: WebSocket, channel_id: str):
-    user = await authenticate_ws(websocket)
-    if not user:
-        await websocket.close(code=4001, reason="Unauthorized")
-        return
+def _signaling_frame(raw: str, data: dict, user_id: str, display_name: str) -> str:
+    """Leitet WebRTC-Signalisierung weiter, ohne SDP/ICE neu zu serialisieren.
+
+    Die Absenderfelder werden dem Originalframe vorangestellt.  Bringt der
+    Client selbst ``from_user_id``/``display_name`` mit, werden diese in
+    ``data`` ueberschrieben und neu serialisiert, damit der Absender nicht
+    gefaelscht werden kann.
+    """
+    body = raw.lstrip()
+    if "from_user_id" in data or "display_name" in data or not body.startswith("{"):
+        # data gehoert nur diesem Frame und darf veraendert werden
+        data.pop("target_user_id", None)
+        data["from_user_id"] = user_id
+        data["display_name"] = display_name
+        return encode_json(data)
+    return (
+        '{"from_user_id":' + encode_json(user_id)
+        + ',"display_name":' + encode_json(display_name)
+        + "," + body[1:]
+    )
 
-    user_id = str(user.id)
 
-    # Check channel membership
-    async with async_session() as db:
-        result = await db.execute(
-            select(ChannelMember).where(
-                and_(
-                    ChannelMember.channel_id == uuid.UUID(channel_id),
-                    ChannelMember.user_id == user.id,
-                )
-            )
-        )
-        if not result.scalar_one_or_none():
-            await websocket.close(code=4003, reason="Not a channel member")
-            return
+@dataclass
+class _ChannelContext:
+    """Zustand einer Kanal-Verbindung fuer die Nachrichten-Handler."""
+
+    websocket: WebSocket
+    db: AsyncSession
+    user: User
+    user_id: str
+    channel_id: str
+    channel_uuid: uuid.UUID
+    # Zuletzt empfangener Frame, unveraendert (WebRTC-Weiterleitung)
+    raw: str = ""
+
+
+async def _post_call_ended(channel_id: str, user_id: str, duration_secs: int) -> None:
+    mins = duration_secs // 60
+    secs = duration_secs % 60
+    if mins > 0:
+        duration_str = f"{mins} Min. {secs} Sek."
+    else:
+        duration_str = f"{secs} Sek."
+    sys_msg = await add_message(
+        channel_id,
+        user_id,
+        f"Anruf beendet – Dauer: {duration_str}",
+        "system",
+    )
+    sys_msg["sender_name"] = ""
+    await manager.send_to_channel(
+        channel_id,
+        {"type": "new_message", "message": sys_msg},
+    )
 
-    await manager.connect(websocket, user_id, channel_id)
 
-    # Notify others including user statuses
+async def _handle_message(ctx: _ChannelContext, data: dict) -> None:
+    await init_chat_db(ctx.channel_id)
+    msg = await add_message(
+        ctx.channel_id,
+        ctx.user_id,
+        data.get("content", ""),
+        data.get("message_type", "text"),
+        data.get("file_reference_id"),
+        reply_to_id=data.get("reply_to_id"),
+        reply_to_content=data.get("reply_to_content"),
+        reply_to_sender=data.get("reply_to_sender"),
+    )
+    msg["sender_name"] = ctx.user.display_name
+    msg["sender_avatar_path"] = ctx.user.avatar_path
+    msg["sender_status"] = manager.get_user_status(ctx.user_id)
+
+    notification_payload = {"type": "new_message", "message": msg, "channel_id": ctx.channel_id}
+
     await manager.send_to_channel(
-        channel_id,
+        ctx.channel_id,
+        notification_payload,
+    )
+
+    # Feed events, mentions and notifications do not hold up
+    # the next frame of this connection
+    _spawn(_persist_message_side_effects(
+        ctx.channel_id,
+        ctx.channel_uuid,
+        ctx.user.id,
+        data.get("content", ""),
+        msg["id"],
+        notification_payload,
+    ))
+
+
+async def _handle_typing(ctx: _ChannelContext, data: dict) -> None:
+    await manager.send_to_channel(
+        ctx.channel_id,
         {
-            "type": "user_joined",
-            "user_id": user_id,
-            "display_name": user.display_name,
-            "status": manager.get_user_status(user_id),
-            "online_users": manager.get_online_users(channel_id),
-            "user_statuses": manager.get_channel_user_statuses(channel_id),
+            "type": "typing",
+            "user_id": ctx.user_id,
+            "display_name": ctx.user.display_name,
         },
-        exclude_user=user_id,
+        exclude_user=ctx.user_id,
     )
 
-    # Send current statuses to the joining user
-    await websocket.send_json({
-        "type": "user_statuses",
-        "user_statuses": manager.get_channel_user_statuses(channel_id),
-    })
 
-    try:
-        while True:
-            data = await websocket.receive_json()
-            msg_type = data.get("type")
+async def _handle_reaction(ctx: _ChannelContext, data: dict) -> None:
+    emoji = data.get("emoji", "")
+    message_id = data.get("message_id", "")
+    action = data.get("action", "add")
+
+    if emoji and message_id:
+        message_sender_id = None
+        if action == "add":
+            added = await add_reaction(ctx.channel_id, message_id, ctx.user_id, emoji)
+            if added:
+                message = await get_message_by_id(ctx.channel_id, message_id)
+                target_user_id = None
+                if message and message.get("sender_id"):
+                    message_sender_id = str(message["sender_id"])
+                    if message_sender_id != ctx.user_id:
+                        target_user_id = uuid.UUID(message_sender_id)
+
+                if target_user_id:
+                    async with ctx.db.begin():
+                        await create_feed_events(
+                            ctx.db,
+                            ctx.channel_uuid,
+                            ctx.user.id,
+                            event_type="reaction",
+                            preview_text=f"{emoji} Reaktion",
+                            message_id=message_id,
+                            target_user_ids=[target_user_id],
+                        )
+        else:
+            await remove_reaction(ctx.channel_id, message_id, ctx.user_id, emoji)
 
-            if msg_type == "message":
-                await init_chat_db(channel_id)
-                msg = await add_message(
-                    channel_id,
-                    user_id,
-                    data.get("content", ""),
-                    data.get("message_type", "text"),
-                    data.get("file_reference_id"),
-                    reply_to_id=data.get("reply_to_id"),
-                    reply_to_content=data.get("reply_to_content"),
-                    reply_to_sender=data.get("reply_to_sender"),
-                )
-                msg["sender_name"] = user.display_name
-                msg["sender_avatar_path"] = user.avatar_path
-                msg["sender_status"] = manager.get_user_status(user_id)
+        await manager.send_to_channel(
+            ctx.channel_id,
+            {
+                "type": "reaction_update",
+                "message_id": message_id,
+                "user_id": ctx.user_id,
+                "display_name": ctx.user.display_name,
+                "emoji": emoji,
+                "action": action,
+                "message_sender_id": message_sender_id,
+            },
+        )
 
-                notification_payload = {"type": "new_message", "message": msg, "channel_id": channel_id}
 
-                await manager.send_to_channel(
-                    channel_id,
-                    notification_payload,
-                )
+async def _handle_edit_message(ctx: _ChannelContext, data: dict) -> None:
+    message_id = data.get("message_id", "")
+    new_content = data.get("content", "").strip()
+    if message_id and new_content:
+        updated = await update_message(ctx.channel_id, message_id, new_content)
+        if updated:
+            await manager.send_to_channel(
+                ctx.channel_id,
+                {
+                    "type": "message_edited",
+                    "message_id": message_id,
+                    "content": new_content,
+                    "edited_at": updated["edited_at"],
+                    "user_id": ctx.user_id,
+                },
+            )
 
-                # Create feed events and handle mentions
-                content = data.get("content", "")
-                async with async_session() as db:
-                    await create_feed_events(
-                        db,
-                        uuid.UUID(channel_id),
-                        user.id,
-                        event_type="message",
-                        preview_text=content[:200],
-                        message_id=msg["id"],
-                    )
 
-                    # Mentions verarbeiten
-                    mention_texts = extract_mentions(content)
-                    if mention_texts:
-                        mentioned_ids = await resolve_mentions(
-                            db, mention_texts, uuid.UUID(channel_id)
-                        )
-                        for uid in mentioned_ids:
-                            if uid != user.id:
-                                await create_feed_events(
-                                    db,
-                                    uuid.UUID(channel_id),
-                                    user.id,
-                                    event_type="mention",
-                                    preview_text=f"@Erwaehnung: {content[:150]}",
-                                    message_id=msg["id"],
-                                    target_user_id=uid,
-                                )
-
-                    # Notify channel members who are NOT in the channel WS
-                    result = await db.execute(
-                        select(ChannelMember.user_id).where(
-                            ChannelMember.channel_id == uuid.UUID(channel_id)
-                        )
-                    )
-                    member_ids = [str(row[0]) for row in result.all()]
+async def _handle_delete_message(ctx: _ChannelContext, data: dict) -> None:
+    message_id = data.get("message_id", "")
+    if message_id:
+        deleted = await delete_message(ctx.channel_id, message_id)
+        if deleted:
+            await manager.send_to_channel(
+                ctx.channel_id,
+                {
+                    "type": "message_deleted",
+                    "message_id": message_id,
+                    "user_id": ctx.user_id,
+                },
+            )
 
-                    await db.commit()
 
-                await manager.notify_channel_members(
-                    channel_id, member_ids, notification_payload, exclude_user=user_id
-                )
+async def _handle_read(ctx: _ChannelContext, data: dict) -> None:
+    await manager.send_to_channel(
+        ctx.channel_id,
+        {"type": "read", "user_id": ctx.user_id},
+        exclude_user=ctx.user_id,
+    )
 
-            elif msg_type == "typing":
-                await manager.send_to_channel(
-                    channel_id,
-                    {
-                        "type": "typing",
-                        "user_id": user_id,
-                        "display_name": user.display_name,
-                    },
-                    exclude_user=user_id,
-                )
 
-            elif msg_type == "reaction":
-                emoji = data.get("emoji", "")
-                message_id = data.get("message_id", "")
-                action = data.get("action", "add")
-
-                if emoji and message_id:
-                    message_sender_id = None
-                    if action == "add":
-                        added = await add_reaction(channel_id, message_id, user_id, emoji)
-                        if added:
-                            message = await get_message_by_id(channel_id, message_id)
-                            target_user_id = None
-                            if message and message.get("sender_id"):
-                                message_sender_id = str(message["sender_id"])
-                                if message_sender_id != user_id:
-                                    target_user_id = uuid.UUID(message_sender_id)
-
-                            if target_user_id:
-                                async with async_session() as db:
-                                    await create_feed_events(
-                                        db,
-                                        uuid.UUID(channel_id),
-                                        user.id,
-                                        event_type="reaction",
-                                        preview_text=f"{emoji} Reaktion",
-                                        message_id=message_id,
-                                        target_user_id=target_user_id,
-                                    )
-                                    await db.commit()
-                    else:
-                        await remove_reaction(channel_id, message_id, user_id, emoji)
-
-                    await manager.send_to_channel(
-                        channel_id,
-                        {
-                            "type": "reaction_update",
-                            "message_id": message_id,
-                            "user_id": user_id,
-                            "display_name": user.display_name,
-                            "emoji": emoji,
-                            "action": action,
-                            "message_sender_id": message_sender_id,
-                        },
-                    )
+async def _handle_status_change(ctx: _ChannelContext, data: dict) -> None:
+    new_status = data.get("status", "online")
+    await manager.set_user_status(ctx.user_id, new_status)
+    # Persist to DB
+    async with ctx.db.begin():
+        await ctx.db.execute(
+            update(User).where(User.id == ctx.user.id).values(status=new_status)
+        )
 
-            elif msg_type == "edit_message":
-                message_id = data.get("message_id", "")
-                new_content = data.get("content", "").strip()
-                if message_id and new_content:
-                    updated = await update_message(channel_id, message_id, new_content)
-                    if updated:
-                        await manager.send_to_channel(
-                            channel_id,
-                            {
-                                "type": "message_edited",
-                                "message_id": message_id,
-                                "content": new_content,
-                                "edited_at": updated["edited_at"],
-                                "user_id": user_id,
-                            },
-                        )
 
-            elif msg_type == "delete_message":
-                message_id = data.get("message_id", "")
-                if message_id:
-                    deleted = await delete_message(channel_id, message_id)
-                    if deleted:
-                        await manager.send_to_channel(
-                            channel_id,
-                            {
-                                "type": "message_deleted",
-                                "message_id": message_id,
-                                "user_id": user_id,
-                            },
-                        )
+async def _handle_signaling(ctx: _ChannelContext, data: dict) -> None:
+    target_user = data.get("target_user_id")
+    ws = manager.active_connections.get(ctx.channel_id, {}).get(target_user)
+    if ws:
+        manager.queue_text(
+            ws, _signaling_frame(ctx.raw, data, ctx.user_id, ctx.user.display_name)
+        )
 
-            elif msg_type == "read":
-                await manager.send_to_channel(
-                    channel_id,
-                    {"type": "read", "user_id": user_id},
-                    exclude_user=user_id,
-                )
 
-            elif msg_type == "status_change":
-                new_status = data.get("status", "online")
-                await manager.set_user_status(user_id, new_status)
-                # Persist to DB
-                async with async_session() as db:
-                    result = await db.execute(
-                        select(User).where(User.id == user.id)
-                    )
-                    db_user = result.scalar_one_or_none()
-                    if db_user:
-                        db_user.status = new_status
-                        await db.commit()
+async def _handle_video_call_start(ctx: _ChannelContext, data: dict) -> None:
+    await manager.set_user_status(ctx.user_id, "busy")
+    is_first = manager.join_call(ctx.channel_id, ctx.user_id)
+    await manager.send_to_channel(
+        ctx.channel_id,
+        {
+            "type": "video_call_start",
+            "user_id": ctx.user_id,
+            "display_name": ctx.user.display_name,
+        },
+        exclude_user=ctx.user_id,
+    )
+    # Create a system chat message and feed event when a call starts
+    if is_first:
+        audio_only = data.get("audio_only", False)
+        call_label = "Audioanruf" if audio_only else "Videoanruf"
+        sys_msg = await add_message(
+            ctx.channel_id,
+            ctx.user_id,
+            f"{ctx.user.display_name} hat einen {call_label} gestartet",
+            "system",
+        )
+        sys_msg["sender_name"] = ctx.user.display_name
+        await manager.send_to_channel(
+            ctx.channel_id,
+            {"type": "new_message", "message": sys_msg},
+        )
 
-            # WebRTC signaling
-            elif msg_type in ("offer", "answer", "ice-candidate"):
-                target_user = data.get("target_user_id")
-                if target_user and target_user in manager.active_connections.get(channel_id, {}):
-                    ws = manager.active_connections[channel_id][target_user]
-                    try:
-                        await ws.send_json({
-                            "type": msg_type,
-                            "from_user_id": user_id,
-                            "display_name": user.display_name,
-                            **{k: v for k, v in data.items() if k not in ("type", "target_user_id")},
-                        })
-                    except Exception:
-                        pass
-
-            elif msg_type == "video_call_start":
-                await manager.set_user_status(user_id, "busy")
-                is_first = manager.join_call(channel_id, user_id)
-                await manager.send_to_channel(
-                    channel_id,
-                    {
-                        "type": "video_call_start",
-                        "user_id": user_id,
-                        "display_name": user.display_name,
-                    },
-                    exclude_user=user_id,
-                )
-                # Create a system chat message and feed event when a call starts
-                if is_first:
-                    audio_only = data.get("audio_only", False)
-                    call_label = "Audioanruf" if audio_only else "Videoanruf"
-                    sys_msg = await add_message(
-                        channel_id,
-                        user_id,
-                        f"{user.display_name} hat einen {call_label} gestartet",
-                        "system",
-                    )
-                    sys_msg["sender_name"] = user.display_name
-                    await manager.send_to_channel(
-                        channel_id,
-                        {"type": "new_message", "message": sys_msg},
-                    )
+        # Create feed events for channel members
+        async with ctx.db.begin():
+            await create_feed_events(
+                ctx.db,
+                ctx.channel_uuid,
+                ctx.user.id,
+                event_type="call",
+                preview_text=f"{ctx.user.display_name} hat einen {call_label} gestartet",
+                message_id=sys_msg["id"],
+            )
 
-                    # Create feed events for channel members
-                    async with async_session() as db:
-                        await create_feed_events(
-                            db,
-                            uuid.UUID(channel_id),
-                            user.id,
-                            event_type="call",
-                            preview_text=f"{user.display_name} hat einen {call_label} gestartet",
-                            message_id=sys_msg["id"],
-                        )
-                        await db.commit()
 
-            elif msg_type == "video_call_invite":
-                target_user = data.get("target_user_id")
-                if target_user:
-                    # Send to ALL active connections of the target user
-                    # so they receive the invite regardless of which channel they are viewing
-                    await manager.send_to_user(target_user, {
-                        "type": "video_call_invite",
-                        "from_user_id": user_id,
-                        "display_name": user.display_name,
-                        "channel_id": channel_id,
-                        "audio_only": data.get("audio_only", False),
-                    })
-
-            elif msg_type == "video_call_cancel":
-                target_user = data.get("target_user_id")
-                if target_user:
-                    await manager.send_to_user(target_user, {
-                        "type": "video_call_cancel",
-                        "from_user_id": user_id,
-                    })
-
-            elif msg_type == "video_call_end":
-                await manager.set_user_status(user_id, "online")
-                duration_secs = manager.leave_call(channel_id, user_id)
-                await manager.send_to_channel(
-                    channel_id,
-                    {
-                        "type": "video_call_end",
-                        "user_id": user_id,
-                    },
-                )
-                # If the call is now empty, create a system message with duration
-                if duration_secs is not None:
-                    mins = duration_secs // 60
-                    secs = duration_secs % 60
-                    if mins > 0:
-                        duration_str = f"{mins} Min. {secs} Sek."
-                    else:
-                        duration_str = f"{secs} Sek."
-                    sys_msg = await add_message(
-                        channel_id,
-                        user_id,
-                        f"Anruf beendet – Dauer: {duration_str}",
-                        "system",
-                    )
-                    sys_msg["sender_name"] = ""
-                    await manager.send_to_channel(
-                        channel_id,
-                        {"type": "new_message", "message": sys_msg},
-                    )
+async def _handle_video_call_invite(ctx: _ChannelContext, data: dict) -> None:
+    target_user = data.get("target_user_id")
+    if target_user:
+        # Send to ALL active connections of the target user
+        # so they receive the invite regardless of which channel they are viewing
+        await manager.send_to_user(target_user, {
+            "type": "video_call_invite",
+            "from_user_id": ctx.user_id,
+            "display_name": ctx.user.display_name,
+            "channel_id": ctx.channel_id,
+            "audio_only": data.get("audio_only", False),
+        })
+
+
+async def _handle_video_call_cancel(ctx: _ChannelContext, data: dict) -> None:
+    target_user = data.get("target_user_id")
+    if target_user:
+        await manager.send_to_user(target_user, {
+            "type": "video_call_cancel",
+            "from_user_id": ctx.user_id,
+        })
+
+
+async def _handle_video_call_end(ctx: _ChannelContext, data: dict) -> None:
+    await manager.set_user_status(ctx.user_id, "online")
+    duration_secs = manager.leave_call(ctx.channel_id, ctx.user_id)
+    await manager.send_to_channel(
+        ctx.channel_id,
+        {
+            "type": "video_call_end",
+            "user_id": ctx.user_id,
+        },
+    )
+    # If the call is now empty, create a system message with duration
+    if duration_secs is not None:
+        await _post_call_ended(ctx.channel_id, ctx.user_id, duration_secs)
 
-            elif msg_type == "hand_raise":
-                await manager.send_to_channel(
-                    channel_id,
-                    {
-                        "type": "hand_raise",
-                        "user_id": user_id,
-                        "display_name": user.display_name,
-                        "raised": data.get("raised", True),
-                    },
-                )
 
-            elif msg_type == "screen_share_start":
-                await manager.send_to_channel(
-                    channel_id,
-                    {
-                        "type": "screen_share_start",
-                        "user_id": user_id,
-                        "display_name": user.display_name,
-                    },
-                )
+async def _handle_hand_raise(ctx: _ChannelContext, data: dict) -> None:
+    await manager.send_to_channel(
+        ctx.channel_id,
+        {
+            "type": "hand_raise",
+            "user_id": ctx.user_id,
+            "display_name": ctx.user.display_name,
+            "raised": data.get("raised", True),
+        },
+    )
 
-            elif msg_type == "screen_share_stop":
-                await manager.send_to_channel(
-                    channel_id,
-                    {
-                        "type": "screen_share_stop",
-                        "user_id": user_id,
-                    },
-                )
 
-            elif msg_type == "video_notes_update":
-                notes = str(data.get("notes", ""))[:10000]
-                await manager.send_to_channel(
-                    channel_id,
-                    {
-                        "type": "video_notes_update",
-                        "notes": notes,
-                        "user_id": user_id,
-                        "display_name": user.display_name,
-                    },
-                    exclude_user=user_id,
-                )
+async def _handle_screen_share_start(ctx: _ChannelContext, data: dict) -> None:
+    await manager.send_to_channel(
+        ctx.channel_id,
+        {
+            "type": "screen_share_start",
+            "user_id": ctx.user_id,
+            "display_name": ctx.user.display_name,
+        },
+    )
 
-    except WebSocketDisconnect:
-        # Clean up any active call participation
-        duration_secs = manager.leave_call(channel_id, user_id)
-        if duration_secs is not None:
-            mins = duration_secs // 60
-            secs = duration_secs % 60
-            if mins > 0:
-                duration_str = f"{mins} Min. {secs} Sek."
-            else:
-                duration_str = f"{secs} Sek."
-            sys_msg = await add_message(
-                channel_id,
-                user_id,
-                f"Anruf beendet – Dauer: {duration_str}",
-                "system",
-            )
-            sys_msg["sender_name"] = ""
-            await manager.send_to_channel(
-                channel_id,
-                {"type": "new_message", "message": sys_msg},
-            )
-        manager.disconnect(user_id, channel_id)
-        # Broadcast offline if no more connections (channel + notification)
+
+async def _handle_screen_share_stop(ctx: _ChannelContext, data: dict) -> None:
+    await manager.send_to_channel(
+        ctx.channel_id,
+        {
+            "type": "screen_share_stop",
+            "user_id": ctx.user_id,
+        },
+    )
+
+
+async def _handle_video_notes_update(ctx: _ChannelContext, data: dict) -> None:
+    notes = str(data.get("notes", ""))[:10000]
+    await manager.send_to_channel(
+        ctx.channel_id,
+        {
+            "type": "video_notes_update",
+            "notes": notes,
+            "user_id": ctx.user_id,
+            "display_name": ctx.user.display_name,
+        },
+        exclude_user=ctx.user_id,
+    )
+
+
+_CHANNEL_HANDLERS = {
+    "message": _handle_message,
+    "typing": _handle_typing,
+    "reaction": _handle_reaction,
+    "edit_message": _handle_edit_message,
+    "delete_message": _handle_delete_message,
+    "read": _handle_read,
+    "status_change": _handle_status_change,
+    "offer": _handle_signaling,
+    "answer": _handle_signaling,
+    "ice-candidate": _handle_signaling,
+    "video_call_start": _handle_video_call_start,
+    "video_call_invite": _handle_video_call_invite,
+    "video_call_cancel": _handle_video_call_cancel,
+    "video_call_end": _handle_video_call_end,
+    "hand_raise": _handle_hand_raise,
+    "screen_share_start": _handle_screen_share_start,
+    "screen_share_stop": _handle_screen_share_stop,
+    "video_notes_update": _handle_video_notes_update,
+}
+
+
+async def _finalize_disconnect(
+    channel_id: str, user_id: str, user_uuid: uuid.UUID, duration_secs: int | None
+) -> None:
+    """Status- und Anruf-Nacharbeiten einer getrennten Verbindung, im Hintergrund."""
+    try:
         if not manager.is_user_connected(user_id):
             async with async_session() as db:
-                result = await db.execute(
-                    select(User).where(User.id == user.id)
+                await db.execute(
+                    update(User).where(User.id == user_uuid).values(status="offline")
                 )
-                db_user = result.scalar_one_or_none()
-                if db_user:
-                    db_user.status = "offline"
-                    await db.commit()
-        await manager.send_to_channel(
-            channel_id,
-            {
-                "type": "user_left",
-                "user_id": user_id,
-                "status": manager.get_user_status(user_id),
-                "online_users": manager.get_online_users(channel_id),
-            },
-        )
+                await db.commit()
+        if duration_secs is not None:
+            await _post_call_ended(channel_id, user_id, duration_secs)
+    except Exception:
+        logger.exception("Disconnect cleanup failed for user=%s channel=%s", user_id, channel_id)
+
+
+async def _close_channel_connection(channel_id: str, user_id: str, user_uuid: uuid.UUID) -> None:
+    # Clean up any active call participation
+    duration_secs = manager.leave_call(channel_id, user_id)
+    manager.disconnect(user_id, channel_id)
+    # DB status and the call-ended message must not delay the goodbye
+    _spawn(_finalize_disconnect(channel_id, user_id, user_uuid, duration_secs))
+    await manager.send_to_channel(
+        channel_id,
+        {
+            "type": "user_left",
+            "user_id": user_id,
+            "status": manager.get_user_status(user_id),
+            "online_users": manager.get_online_users(channel_id),
+        },
+    )
+
+
+async def websocket_endpoint(websocket: WebSocket, channel_id: str):
+    user = await authenticate_ws(websocket)
+    if not user:
+        await websocket.close(code=4001, reason="Unauthorized")
+        return
+
+    user_id = str(user.id)
+    # Parsed once; the handlers below reuse it for every frame
+    try:
+        channel_uuid = uuid.UUID(channel_id)
+    except ValueError:
+        await websocket.close(code=4003, reason="Not a channel member")
+        return
+
+    # One session for the whole connection; every unit of work below runs
+    # in its own db.begin() block, so a pooled DB connection is only held
+    # while that block runs.
+    db = async_session()
+
+    # Check channel membership
+    async with db.begin():
+        is_member = await manager.is_member(db, channel_id, user_id)
+    if not is_member:
+        await db.close()
+        await websocket.close(code=4003, reason="Not a channel member")
+        return
+
+    await manager.connect(websocket, user_id, channel_id)
+
+    # Notify others including user statuses
+    await manager.send_to_channel(
+        channel_id,
+        {
+            "type": "user_joined",
+            "user_id": user_id,
+            "display_name": user.display_name,
+            "status": manager.get_user_status(user_id),
+            "online_users": manager.get_online_users(channel_id),
+            "user_statuses": manager.get_channel_user_statuses(channel_id),
+        },
+        exclude_user=user_id,
+    )
+
+    # Send current statuses to the joining user
+    manager.queue_text(websocket, encode_json({
+        "type": "user_statuses",
+        "user_statuses": manager.get_channel_user_statuses(channel_id),
+    }))
+
+    ctx = _ChannelContext(websocket, db, user, user_id, channel_id, channel_uuid)
+    try:
+        while True:
+            ctx.raw = await websocket.receive_text()
+            data = decode_json(ctx.raw)
+            handler = _CHANNEL_HANDLERS.get(data.get("type"))
+            if handler is not None:
+                await handler(ctx, data)
+
+    except WebSocketDisconnect:
+        await _close_channel_connection(channel_id, user_id, user.id)
     except Exception as exc:
-        import logging
-        logging.getLogger(__name__).exception("WebSocket error for user=%s channel=%s: %s", user_id, channel_id, exc)
-        duration_secs = manager.leave_call(channel_id, user_id)
-        manager.disconnect(user_id, channel_id)
-        if not manager.is_user_connected(user_id):
-            async with async_session() as db:
-                result = await db.execute(
-                    select(User).where(User.id == user.id)
-                )
-                db_user = result.scalar_one_or_none()
-                if db_user:
-                    db_user.status = "offline"
-                    await db.commit()
+        logger.exception("WebSocket error for user=%s channel=%s: %s", user_id, channel_id, exc)
         try:
-            await manager.send_to_channel(
-                channel_id,
-                {
-                    "type": "user_left",
-                    "user_id": user_id,
-                    "status": manager.get_user_status(user_id),
-                    "online_users": manager.get_online_users(channel_id),
-                },
-            )
+            await _close_channel_connection(channel_id, user_id, user.id)
         except Exception:
             pass
+    finally:
+        await db.close()
@@ -1,29 +1,213 @@
-import json
+import asyncio
+import logging
+import time
 import uuid
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from typing import Any
 
+import orjson
 from fastapi import WebSocket
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.models.channel import Channel, ChannelMember
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
 
 VALID_STATUSES = {"online", "busy", "away", "dnd", "offline"}
 
+# Upper bound for how long a cached member list is trusted even without an
+# invalidation (e.g. rows changed outside this process).
+MEMBERSHIP_TTL = 60.0
+
+
+def encode_json(message: Any) -> str:
+    """Compact JSON text for a WebSocket text frame."""
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+decode_json = orjson.loads
+
+
+# Frames queued per socket before the oldest ones are dropped
+SEND_QUEUE_SIZE = 64
+
+# Queue markers: end after the queued frames / close a client that fell behind
+_STOP = None
+_TOO_SLOW = object()
+
+
+class _Outbox:
+    """Bounded send queue for one WebSocket, drained by its own task.
+
+    A slow client only backs up its own queue.  When the queue is full the
+    oldest frame is dropped; a client that falls a whole queue behind is
+    closed (1013) so it reconnects and reloads instead of missing messages.
+    """
+
+    def __init__(self, websocket: WebSocket, on_error: Callable[[], None]):
+        self.websocket = websocket
+        self.on_error = on_error
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.dropped = 0
+        self.closing = False
+        self.task = asyncio.create_task(self._run())
+
+    def put(self, text: str) -> bool:
+        """Queue a frame.  Returns False once the client is given up on."""
+        if self.closing or self.task.done():
+            return True
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.dropped += 1
+            if self.dropped > SEND_QUEUE_SIZE:
+                self._replace_queue_with(_TOO_SLOW)
+                return False
+        self.queue.put_nowait(text)
+        return True
+
+    def close(self):
+        """Finish the frames already queued, then stop."""
+        if self.closing:
+            return
+        if self.queue.full():
+            self._replace_queue_with(_STOP)
+        else:
+            self.closing = True
+            self.queue.put_nowait(_STOP)
+
+    def _replace_queue_with(self, marker):
+        self.closing = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            self.queue.task_done()
+        self.queue.put_nowait(marker)
 
-@dataclass
+    async def _run(self):
+        try:
+            while True:
+                item = await self.queue.get()
+                try:
+                    if item is _STOP:
+                        return
+                    if item is _TOO_SLOW:
+                        await self.websocket.close(code=1013)
+                        return
+                    await self.websocket.send_text(item)
+                    self.dropped = 0
+                finally:
+                    self.queue.task_done()
+        except Exception:
+            self.on_error()
+        finally:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.queue.task_done()
+
+
+def _encode(message: dict) -> str | None:
+    """Serialize a message once for all recipients.
+
+    Returns None if the message is not JSON-serializable; such a message
+    could not be delivered to anyone.
+    """
+    try:
+        return encode_json(message)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
 class ConnectionManager:
+    # All maps are keyed by the id strings as they arrive from the URL and the
+    # JWT; str caches its hash, so no conversion to UUID/int happens here.
     active_connections: dict[str, dict[str, WebSocket]] = field(default_factory=dict)
     user_channels: dict[str, set[str]] = field(default_factory=dict)
     user_statuses: dict[str, str] = field(default_factory=dict)
-    # Track active calls per channel: channel_id -> {"start_time": datetime, "participants": set}
+    # Track active calls per channel: channel_id -> {"start_time": monotonic seconds, "participants": set}
     active_calls: dict[str, dict] = field(default_factory=dict)
     # Persistent notification connections: user_id -> WebSocket
     notification_connections: dict[str, WebSocket] = field(default_factory=dict)
+    # Member ids per channel for the handshake check: channel_id -> (ids, expiry)
+    channel_members: dict[str, tuple[frozenset[str], float]] = field(default_factory=dict)
+    # Broadcast snapshot per channel, rebuilt lazily after connect/disconnect
+    _channel_targets: dict[str, tuple[tuple[str, WebSocket], ...]] = field(default_factory=dict)
+    # Set when deliveries are fanned out to all workers (app.services.broadcast)
+    publisher: Callable[[str], Awaitable[None]] | None = None
+    # Send queue per registered socket, keyed by id() (Starlette sockets are unhashable)
+    _outboxes: dict[int, _Outbox] = field(default_factory=dict)
+
+    async def is_member(self, db: AsyncSession, channel_id: str, user_id: str) -> bool:
+        """Membership check for WebSocket handshakes, cached per channel."""
+        cached = self.channel_members.get(channel_id)
+        if cached is not None and time.monotonic() < cached[1]:
+            return user_id in cached[0]
+        result = await db.execute(
+            select(ChannelMember.user_id).where(
+                ChannelMember.channel_id == uuid.UUID(channel_id)
+            )
+        )
+        members = frozenset(str(row[0]) for row in result.all())
+        self.channel_members[channel_id] = (members, time.monotonic() + MEMBERSHIP_TTL)
+        return user_id in members
+
+    def invalidate_channel_members(self, channel_id: str | None = None):
+        """Forget cached members of one channel, or of all channels."""
+        if channel_id is None:
+            self.channel_members.clear()
+        else:
+            self.channel_members.pop(channel_id, None)
+
+    def _open_outbox(self, websocket: WebSocket, on_error: Callable[[], None]):
+        self._outboxes[id(websocket)] = _Outbox(websocket, on_error)
+
+    def _close_outbox(self, websocket: WebSocket | None):
+        if websocket is not None:
+            outbox = self._outboxes.pop(id(websocket), None)
+            if outbox is not None:
+                outbox.close()
+
+    def queue_text(self, websocket: WebSocket, text: str):
+        """Queue a text frame on a registered socket without waiting for it."""
+        outbox = self._outboxes.get(id(websocket))
+        if outbox is not None and not outbox.put(text):
+            outbox.on_error()
+
+    async def close(self):
+        """Stop every send queue (app shutdown)."""
+        outboxes = list(self._outboxes.values())
+        self._outboxes.clear()
+        for outbox in outboxes:
+            outbox.task.cancel()
+        await asyncio.gather(*(o.task for o in outboxes), return_exceptions=True)
+
+    async def drain(self):
+        """Wait until every queued frame has been handed to its socket."""
+        await asyncio.gather(*(o.queue.join() for o in list(self._outboxes.values())))
+
+    def _drop_channel_socket(self, user_id: str, channel_id: str, websocket: WebSocket):
+        # Unless the user has reconnected meanwhile
+        if self.active_connections.get(channel_id, {}).get(user_id) is websocket:
+            self.disconnect(user_id, channel_id)
+
+    def _drop_notification_socket(self, user_id: str, websocket: WebSocket):
+        if self.notification_connections.get(user_id) is websocket:
+            self.disconnect_notification(user_id)
 
     async def connect(self, websocket: WebSocket, user_id: str, channel_id: str):
         await websocket.accept()
         if channel_id not in self.active_connections:
             self.active_connections[channel_id] = {}
+        self._close_outbox(self.active_connections[channel_id].get(user_id))
         self.active_connections[channel_id][user_id] = websocket
+        self._open_outbox(
+            websocket, lambda: self._drop_channel_socket(user_id, channel_id, websocket)
+        )
+        self._channel_targets.pop(channel_id, None)
 
         if user_id not in self.user_channels:
             self.user_channels[user_id] = set()
@@ -34,19 +218,24 @@ class ConnectionManager:
 
     async def connect_notification(self, websocket: WebSocket, user_id: str):
         await websocket.accept()
+        self._close_outbox(self.notification_connections.get(user_id))
         self.notification_connections[user_id] = websocket
+        self._open_outbox(
+            websocket, lambda: self._drop_notification_socket(user_id, websocket)
+        )
         if user_id not in self.user_statuses:
             self.user_statuses[user_id] = "online"
 
     def disconnect_notification(self, user_id: str):
-        self.notification_connections.pop(user_id, None)
+        self._close_outbox(self.notification_connections.pop(user_id, None))
         # If user has no channel connections either, they are truly offline
         if user_id not in self.user_channels:
             self.user_statuses.pop(user_id, None)
 
     def disconnect(self, user_id: str, channel_id: str):
+        self._channel_targets.pop(channel_id, None)
         if channel_id in self.active_connections:
-            self.active_connections[channel_id].pop(user_id, None)
+            self._close_outbox(self.active_connections[channel_id].pop(user_id, None))
             if not self.active_connections[channel_id]:
                 del self.active_connections[channel_id]
         if user_id in self.user_channels:
@@ -74,15 +263,51 @@ class ConnectionManager:
     def get_user_status(self, user_id: str) -> str:
         return self.user_statuses.get(user_id, "offline")
 
+    async def _publish(self, envelope: dict) -> bool:
+        """Hand a delivery to the publisher; False means deliver locally."""
+        if self.publisher is None:
+            return False
+        try:
+            await self.publisher(encode_json(envelope))
+        except Exception:
+            logger.exception("Publishing WebSocket message failed, delivering locally")
+            return False
+        return True
+
+    async def dispatch(self, data: str | bytes):
+        """Deliver a published envelope to this process's connections."""
+        envelope = decode_json(data)
+        op, text = envelope["op"], envelope["text"]
+        if op == "channel":
+            await self._send_text_to_channel(envelope["channel_id"], text, envelope["exclude_user"])
+        elif op == "notify":
+            await self._notify_text(
+                envelope["channel_id"], envelope["member_ids"], text, envelope["exclude_user"]
+            )
+        elif op == "user":
+            await self._send_text_to_user(envelope["user_id"], text)
+
     async def send_to_channel(self, channel_id: str, message: dict, exclude_user: str | None = None):
-        if channel_id not in self.active_connections:
+        if self.publisher is None and channel_id not in self.active_connections:
+            return
+        text = _encode(message)
+        if text is None:
             return
-        for uid, ws in self.active_connections[channel_id].items():
+        envelope = {"op": "channel", "channel_id": channel_id, "exclude_user": exclude_user, "text": text}
+        if not await self._publish(envelope):
+            await self._send_text_to_channel(channel_id, text, exclude_user)
+
+    async def _send_text_to_channel(self, channel_id: str, text: str, exclude_user: str | None = None):
+        targets = self._channel_targets.get(channel_id)
+        if targets is None:
+            conns = self.active_connections.get(channel_id)
+            if not conns:
+                return
+            targets = self._channel_targets[channel_id] = tuple(conns.items())
+        # Queue per socket so one slow client does not hold up the others
+        for uid, ws in targets:
             if uid != exclude_user:
-                try:
-                    await ws.send_json(message)
-                except Exception:
-                    pass
+                self.queue_text(ws, text)
 
     async def notify_channel_members(
         self,
@@ -93,9 +318,29 @@ class ConnectionManager:
     ):
         """Send a message to channel members who are NOT connected to the
         channel WebSocket but DO have a notification WebSocket open."""
-        connected_to_channel = set(
-            self.active_connections.get(channel_id, {}).keys()
-        )
+        if self.publisher is None and not self.notification_connections:
+            return
+        text = _encode(message)
+        if text is None:
+            return
+        envelope = {
+            "op": "notify",
+            "channel_id": channel_id,
+            "member_ids": member_ids,
+            "exclude_user": exclude_user,
+            "text": text,
+        }
+        if not await self._publish(envelope):
+            await self._notify_text(channel_id, member_ids, text, exclude_user)
+
+    async def _notify_text(
+        self,
+        channel_id: str,
+        member_ids: list[str],
+        text: str,
+        exclude_user: str | None = None,
+    ):
+        connected_to_channel = self.active_connections.get(channel_id, {})
         for uid in member_ids:
             if uid == exclude_user:
                 continue
@@ -104,33 +349,38 @@ class ConnectionManager:
                 continue
             nws = self.notification_connections.get(uid)
             if nws:
-                try:
-                    await nws.send_json(message)
-                except Exception:
-                    pass
+                self.queue_text(nws, text)
 
     async def send_to_user(self, user_id: str, message: dict):
+        text = _encode(message)
+        if text is None:
+            return
+        if not await self._publish({"op": "user", "user_id": user_id, "text": text}):
+            await self._send_text_to_user(user_id, text)
+
+    async def _send_text_to_user(self, user_id: str, text: str):
         # Prefer notification connection to avoid duplicate delivery
         nws = self.notification_connections.get(user_id)
         if nws:
-            try:
-                await nws.send_json(message)
-                return  # Delivered via notification – skip channel connections
-            except Exception:
-                pass
+            self.queue_text(nws, text)
+            return  # Delivered via notification – skip channel connections
         # Fallback: send via channel connections if no notification connection
-        for channel_id in self.user_channels.get(user_id, set()):
-            if channel_id in self.active_connections:
-                ws = self.active_connections[channel_id].get(user_id)
-                if ws:
-                    try:
-                        await ws.send_json(message)
-                    except Exception:
-                        pass
+        for channel_id in self.user_channels.get(user_id, ()):
+            ws = self.active_connections.get(channel_id, {}).get(user_id)
+            if ws:
+                self.queue_text(ws, text)
 
     async def broadcast_to_user_channels(self, user_id: str, message: dict):
-        for channel_id in self.user_channels.get(user_id, set()):
-            await self.send_to_channel(channel_id, message)
+        channel_ids = self.user_channels.get(user_id)
+        if not channel_ids:
+            return
+        text = _encode(message)
+        if text is None:
+            return
+        for channel_id in list(channel_ids):
+            envelope = {"op": "channel", "channel_id": channel_id, "exclude_user": None, "text": text}
+            if not await self._publish(envelope):
+                await self._send_text_to_channel(channel_id, text)
 
     def get_online_users(self, channel_id: str) -> list[str]:
         if channel_id not in self.active_connections:
@@ -149,7 +399,7 @@ class ConnectionManager:
         """Add a user to an active call. Returns True if this is the first participant (call started)."""
         if channel_id not in self.active_calls:
             self.active_calls[channel_id] = {
-                "start_time": datetime.now(timezone.utc),
+                "start_time": time.monotonic(),
                 "participants": set(),
             }
         is_first = len(self.active_calls[channel_id]["participants"]) == 0
@@ -163,10 +413,42 @@ class ConnectionManager:
         call = self.active_calls[channel_id]
         call["participants"].discard(user_id)
         if len(call["participants"]) == 0:
-            duration = int((datetime.now(timezone.utc) - call["start_time"]).total_seconds())
+            duration = int(time.monotonic() - call["start_time"])
             del self.active_calls[channel_id]
             return duration
         return None
 
 
 manager = ConnectionManager()
+
+
+# Membership changes go through the ORM (db.add / db.delete, including the
+# Channel.members cascade).  Collect the affected channels per flush and drop
+# their cached member lists once the transaction has committed.
+@event.listens_for(Session, "after_flush")
+def _collect_membership_changes(session, flush_context):
+    changed = session.info.setdefault("changed_channel_members", set())
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, ChannelMember):
+            changed.add(str(obj.channel_id))
+        elif isinstance(obj, Channel) and obj in session.deleted:
+            changed.add(str(obj.id))
+        elif isinstance(obj, User) and obj in session.deleted:
+            changed.add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_membership_changes(session):
+    changed = session.info.pop("changed_channel_members", None)
+    if not changed:
+        return
+    if None in changed:
+        manager.invalidate_channel_members()
+    else:
+        for channel_id in changed:
+            manager.invalidate_channel_members(channel_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_membership_changes(session):
+    session.info.pop("changed_channel_members", None)
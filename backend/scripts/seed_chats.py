@@ -8,14 +8,24 @@ Verwendung:
     python seed_chats.py --chats 5 --messages 20
     python seed_chats.py --chats 10 --messages 50 --user-file user.txt
     python seed_chats.py --chats 3 --messages 100 --base-url http://localhost:8000
+    python seed_chats.py --chats 20 --messages 500 --concurrency 32
+    python seed_chats.py --chats 20 --messages 500 --ramp-up-seconds 5
 """
 import argparse
+import asyncio
 import os
 import random
 import sys
+import time
 
 import httpx
 
+try:
+    import uvloop
+except ImportError:  # Windows: uvicorn[standard] bringt dort kein uvloop mit
+    uvloop = None
+import orjson
+
 SAMPLE_MESSAGES = [
     "Hallo zusammen! Wie geht es euch?",
     "Hat jemand die Praesentation fuer morgen fertig?",
@@ -44,6 +54,11 @@ SAMPLE_MESSAGES = [
     "Die Unit-Tests laufen alle gruen durch.",
 ]
 
+# Request-Bodies einmal vorab serialisieren statt pro Nachricht
+MESSAGE_BODIES = [
+    orjson.dumps({"content": m, "message_type": "text"}) for m in SAMPLE_MESSAGES
+]
+
 CHAT_NAMES = [
     "Projekt Alpha", "Backend-Team", "Frontend-Crew",
     "DevOps", "Design-Review", "Sprint Planning",
@@ -83,8 +98,8 @@ def read_user_file(filepath: str) -> list[dict]:
     return users
 
 
-def login_user(client: httpx.Client, username: str, password: str) -> dict | None:
-    resp = client.post(
+async def login_user(client: httpx.AsyncClient, username: str, password: str) -> dict | None:
+    resp = await client.post(
         "/api/auth/login",
         json={"username": username, "password": password},
     )
@@ -93,15 +108,22 @@ def login_user(client: httpx.Client, username: str, password: str) -> dict | Non
     return None
 
 
+async def warm_up(client: httpx.AsyncClient) -> None:
+    """Baut die erste Verbindung vorab auf, damit sie nicht in Phase 1 zaehlt."""
+    await client.get("/api/health")
+
+
 def get_auth_headers(token: str) -> dict:
-    return {"Authorization": f"Bearer {token}"}
+    return {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
 
 
-def seed_chats_and_messages(
+async def seed_chats_and_messages(
     base_url: str,
     num_chats: int,
     num_messages_per_chat: int,
     user_file: str,
+    concurrency: int = 16,
+    ramp_up: float = 0.0,
 ) -> None:
     # 1. Benutzer aus user.txt lesen
     file_users = read_user_file(user_file)
@@ -111,25 +133,44 @@ def seed_chats_and_messages(
         print("FEHLER: Mindestens 2 Benutzer in user.txt erforderlich.")
         sys.exit(1)
 
-    with httpx.Client(base_url=base_url, timeout=30.0) as client:
-        # 2. Alle Benutzer einloggen
+    # Pro gleichzeitiger Anfrage eine warm gehaltene Keep-Alive-Verbindung
+    limits = httpx.Limits(
+        max_connections=concurrency,
+        max_keepalive_connections=concurrency,
+        keepalive_expiry=30.0,
+    )
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0, limits=limits) as client:
+        # Hoechstens `concurrency` Anfragen zugleich (Logins kosten serverseitig bcrypt)
+        sem = asyncio.Semaphore(concurrency)
+        await warm_up(client)
+
+        # 2. Alle Benutzer parallel einloggen
         print("\nMelde Benutzer an ...")
-        users = []
-        for fu in file_users:
-            auth = login_user(client, fu["username"], fu["password"])
-            if auth:
-                users.append({
-                    "id": auth["user"]["id"],
-                    "username": auth["user"]["username"],
-                    "display_name": auth["user"].get("display_name", fu["display_name"]),
-                    "token": auth["access_token"],
-                    "role": fu.get("role", "user"),
-                })
-                print(f"    Angemeldet: {fu['username']} ({fu.get('role', 'user')})")
-            else:
+        t0 = time.perf_counter()
+
+        async def login(i: int, fu: dict) -> dict | None:
+            # Logins ueber ramp_up Sekunden verteilen statt alle auf einmal
+            if ramp_up > 0:
+                await asyncio.sleep(ramp_up * i / len(file_users))
+            async with sem:
+                auth = await login_user(client, fu["username"], fu["password"])
+            if not auth:
                 print(f"    FEHLER: Login fehlgeschlagen fuer {fu['username']}")
-
-        print(f"  {len(users)} Benutzer angemeldet.")
+                return None
+            print(f"    Angemeldet: {fu['username']} ({fu.get('role', 'user')})")
+            return {
+                "id": auth["user"]["id"],
+                "username": auth["user"]["username"],
+                "display_name": auth["user"].get("display_name", fu["display_name"]),
+                # Header einmal pro Benutzer bauen und fuer alle Anfragen wiederverwenden
+                "headers": get_auth_headers(auth["access_token"]),
+                "role": fu.get("role", "user"),
+            }
+
+        logged_in = await asyncio.gather(*(login(i, fu) for i, fu in enumerate(file_users)))
+        users = [u for u in logged_in if u is not None]
+
+        print(f"  {len(users)} Benutzer angemeldet ({time.perf_counter() - t0:.2f}s).")
 
         if len(users) < 2:
             print("FEHLER: Mindestens 2 Benutzer muessen eingeloggt sein.")
@@ -141,75 +182,96 @@ def seed_chats_and_messages(
             normal_users = users  # Fallback: alle Benutzer verwenden
 
         print(f"\nErstelle {num_chats} Chats ...")
+        t0 = time.perf_counter()
         channels = []
         for i in range(num_chats):
-            creator = random.choice(normal_users)
-            # 2-6 zufaellige Teilnehmer (ohne Creator)
-            other_users = [u for u in normal_users if u["id"] != creator["id"]]
-            members = random.sample(
-                other_users,
-                min(random.randint(2, 6), len(other_users)),
+            creator_idx = random.randrange(len(normal_users))
+            creator = normal_users[creator_idx]
+            # 2-6 zufaellige Teilnehmer (ohne Creator): aus den uebrigen
+            # Indizes ziehen, statt die Benutzerliste pro Chat zu filtern
+            picks = random.sample(
+                range(len(normal_users) - 1),
+                min(random.randint(2, 6), len(normal_users) - 1),
             )
+            members = [normal_users[j + (j >= creator_idx)] for j in picks]
             member_ids = [m["id"] for m in members]
 
             chat_name = CHAT_NAMES[i % len(CHAT_NAMES)]
             if i >= len(CHAT_NAMES):
                 chat_name = f"{chat_name} {i // len(CHAT_NAMES) + 1}"
 
-            resp = client.post(
+            resp = await client.post(
                 "/api/channels/",
                 json={
                     "name": chat_name,
                     "channel_type": "group",
                     "member_ids": member_ids,
                 },
-                headers=get_auth_headers(creator["token"]),
+                headers=creator["headers"],
             )
 
             if resp.status_code == 201:
                 channel = resp.json()
                 # Merken welche User Zugriff haben
-                participant_tokens = [creator["token"]] + [
-                    u["token"] for u in members
+                participant_headers = [creator["headers"]] + [
+                    u["headers"] for u in members
                 ]
                 channels.append({
                     "id": channel["id"],
                     "name": channel["name"],
-                    "tokens": participant_tokens,
+                    "headers": participant_headers,
                 })
                 print(f"  [{i + 1}/{num_chats}] Chat erstellt: {chat_name} "
                       f"({len(member_ids) + 1} Mitglieder)")
             else:
                 print(f"  [{i + 1}/{num_chats}] FEHLER: {resp.status_code} - {resp.text}")
 
+        print(f"  {len(channels)} Chats erstellt ({time.perf_counter() - t0:.2f}s).")
+
         # 4. Nachrichten erstellen
         total = num_chats * num_messages_per_chat
         print(f"\nErstelle {num_messages_per_chat} Nachrichten pro Chat "
               f"({total} gesamt) ...")
 
-        msg_count = 0
-        for ch in channels:
-            for j in range(num_messages_per_chat):
-                token = random.choice(ch["tokens"])
-                content = random.choice(SAMPLE_MESSAGES)
+        # Alle Nachrichten aller Chats parallel; Zeitstempel vergibt der
+        # Server, die Reihenfolge ist beliebig
 
-                resp = client.post(
+        async def post_message(ch: dict, headers: dict, body: bytes) -> bool:
+            async with sem:
+                resp = await client.post(
                     f"/api/channels/{ch['id']}/messages/",
-                    json={"content": content, "message_type": "text"},
-                    headers=get_auth_headers(token),
+                    content=body,
+                    headers=headers,
                 )
-                if resp.status_code == 201:
-                    msg_count += 1
-                else:
-                    print(f"  FEHLER Nachricht in {ch['name']}: "
-                          f"{resp.status_code} - {resp.text}")
+            if resp.status_code == 201:
+                return True
+            print(f"  FEHLER Nachricht in {ch['name']}: "
+                  f"{resp.status_code} - {resp.text}")
+            return False
+
+        async def post_chat_messages(ch: dict) -> int:
+            # Absender und Texte eines Chats mit je einem Aufruf ziehen
+            senders = random.choices(ch["headers"], k=num_messages_per_chat)
+            bodies = random.choices(MESSAGE_BODIES, k=num_messages_per_chat)
+            sent = await asyncio.gather(
+                *(post_message(ch, h, b) for h, b in zip(senders, bodies))
+            )
+            print(f"  Chat '{ch['name']}': {sum(sent)} Nachrichten erstellt")
+            return sum(sent)
+
+        t0 = time.perf_counter()
+        msg_count = sum(await asyncio.gather(*(post_chat_messages(ch) for ch in channels)))
 
-            print(f"  Chat '{ch['name']}': "
-                  f"{num_messages_per_chat} Nachrichten erstellt")
+        print(f"  {msg_count} Nachrichten erstellt ({time.perf_counter() - t0:.2f}s).")
 
         print(f"\nFertig: {len(channels)} Chats, {msg_count} Nachrichten erstellt.")
 
 
+def _run(coro):
+    """Fuehrt das Skript auf uvloop aus, sofern installiert."""
+    return uvloop.run(coro) if uvloop else asyncio.run(coro)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Erstellt Testchats und Nachrichten in Agora (liest Benutzer aus user.txt)"
@@ -232,6 +294,18 @@ def main():
         default="http://localhost:8000",
         help="Backend-URL (Standard: http://localhost:8000)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Gleichzeitige Anfragen (Standard: 16)",
+    )
+    parser.add_argument(
+        "--ramp-up-seconds",
+        type=float,
+        default=0.0,
+        help="Logins ueber so viele Sekunden verteilt starten (Standard: 0)",
+    )
     parser.add_argument(
         "--user-file", "-f",
         type=str,
@@ -245,12 +319,14 @@ def main():
     print(f"  Benutzerdatei: {args.user_file}")
     print()
 
-    seed_chats_and_messages(
+    _run(seed_chats_and_messages(
         base_url=args.base_url,
         num_chats=args.chats,
         num_messages_per_chat=args.messages,
         user_file=args.user_file,
-    )
+        concurrency=args.concurrency,
+        ramp_up=args.ramp_up_seconds,
+    ))
 
 
 if __name__ == "__main__":
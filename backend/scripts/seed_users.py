@@ -7,27 +7,43 @@ Verwendung:
     python seed_users.py --count 20
     python seed_users.py --count 50 --base-url http://localhost:8000
     python seed_users.py --count 10 --prefix testuser --password geheim123
+    python seed_users.py --count 500 --concurrency 32
+    python seed_users.py --count 500 --ramp-up-seconds 10
 
 Die erzeugte user.txt wird von seed_chats.py eingelesen.
 """
 import argparse
+import asyncio
 import sys
+import time
 
 import httpx
 
+try:
+    import uvloop
+except ImportError:  # Windows: uvicorn[standard] bringt dort kein uvloop mit
+    uvloop = None
 
-def create_users(
-    client: httpx.Client,
+
+async def create_users(
+    client: httpx.AsyncClient,
     admin_token: str,
     count: int,
     prefix: str,
     password: str,
+    concurrency: int = 16,
+    ramp_up: float = 0.0,
 ) -> list[dict]:
-    """Erstellt Benutzer ueber die Admin-API (funktioniert auch bei deaktivierter Registrierung)."""
-    created = []
+    """Erstellt Benutzer ueber die Admin-API (funktioniert auch bei deaktivierter Registrierung).
+
+    Bis zu ``concurrency`` Anfragen laufen gleichzeitig; die Reihenfolge der
+    Rueckgabe entspricht der Nummerierung. Mit ``ramp_up`` (Sekunden) starten
+    die Anfragen gleichmaessig verteilt statt alle auf einmal.
+    """
     headers = {"Authorization": f"Bearer {admin_token}"}
+    sem = asyncio.Semaphore(concurrency)
 
-    for i in range(1, count + 1):
+    async def _one(i: int) -> dict | None:
         username = f"{prefix}{i:04d}"
         payload = {
             "username": username,
@@ -36,29 +52,42 @@ def create_users(
             "display_name": f"{prefix.title()} {i}",
         }
 
-        resp = client.post("/api/admin/users", json=payload, headers=headers)
-        if resp.status_code == 201:
-            user = resp.json()
-            user["password"] = password
-            created.append(user)
-            print(f"  [{i}/{count}] Benutzer erstellt: {username}")
-        elif resp.status_code == 409:
-            # User exists - try to login to get the ID
-            login_resp = client.post(
-                "/api/auth/login",
-                json={"username": username, "password": password},
-            )
-            if login_resp.status_code == 200:
-                user = login_resp.json()["user"]
+        if ramp_up > 0:
+            await asyncio.sleep(ramp_up * (i - 1) / count)
+        async with sem:
+            resp = await client.post("/api/admin/users", json=payload, headers=headers)
+            if resp.status_code == 201:
+                user = resp.json()
                 user["password"] = password
-                created.append(user)
-            print(f"  [{i}/{count}] Bereits vorhanden: {username} (uebersprungen)")
-        else:
+                print(f"  [{i}/{count}] Benutzer erstellt: {username}")
+                return user
+            if resp.status_code == 409:
+                # User exists - try to login to get the ID
+                login_resp = await client.post(
+                    "/api/auth/login",
+                    json={"username": username, "password": password},
+                )
+                print(f"  [{i}/{count}] Bereits vorhanden: {username} (uebersprungen)")
+                if login_resp.status_code == 200:
+                    user = login_resp.json()["user"]
+                    user["password"] = password
+                    return user
+                return None
             print(
                 f"  [{i}/{count}] FEHLER bei {username}: "
                 f"{resp.status_code} - {resp.text}"
             )
+            return None
 
+    results = await asyncio.gather(
+        *(_one(i) for i in range(1, count + 1)), return_exceptions=True
+    )
+    created = []
+    for i, result in enumerate(results, start=1):
+        if isinstance(result, Exception):
+            print(f"  [{i}/{count}] FEHLER: {result!r}")
+        elif result is not None:
+            created.append(result)
     return created
 
 
@@ -88,9 +117,9 @@ def write_user_file(users: list[dict], admin_user: dict | None, filepath: str) -
     print(f"Benutzerliste geschrieben: {filepath}")
 
 
-def login_admin(client: httpx.Client, admin_password: str) -> tuple[dict | None, str | None]:
+async def login_admin(client: httpx.AsyncClient, admin_password: str) -> tuple[dict | None, str | None]:
     """Meldet den Admin-Benutzer an und gibt (user_dict, token) zurueck."""
-    login_resp = client.post(
+    login_resp = await client.post(
         "/api/auth/login",
         json={"username": "admin", "password": admin_password},
     )
@@ -107,6 +136,45 @@ def login_admin(client: httpx.Client, admin_password: str) -> tuple[dict | None,
     return None, None
 
 
+async def warm_up(client: httpx.AsyncClient) -> None:
+    """Baut die erste Verbindung vorab auf, damit sie nicht in Phase 1 zaehlt."""
+    await client.get("/api/health")
+
+
+async def _seed(args: argparse.Namespace) -> tuple[dict | None, list[dict]]:
+    # Pro gleichzeitiger Anfrage eine warm gehaltene Keep-Alive-Verbindung
+    limits = httpx.Limits(
+        max_connections=args.concurrency,
+        max_keepalive_connections=args.concurrency,
+        keepalive_expiry=30.0,
+    )
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30.0, limits=limits) as client:
+        await warm_up(client)
+
+        # 1. Admin anmelden
+        print("Admin-Benutzer ...")
+        t0 = time.perf_counter()
+        admin_user, admin_token = await login_admin(client, args.admin_password)
+        if not admin_token:
+            sys.exit(1)
+        print(f"  Dauer: {time.perf_counter() - t0:.2f}s")
+
+        # 2. Testbenutzer ueber Admin-API erstellen
+        print()
+        t0 = time.perf_counter()
+        users = await create_users(
+            client, admin_token, args.count, args.prefix, args.password,
+            args.concurrency, args.ramp_up_seconds,
+        )
+        print(f"  {len(users)} Benutzer in {time.perf_counter() - t0:.2f}s")
+    return admin_user, users
+
+
+def _run(coro):
+    """Fuehrt das Skript auf uvloop aus, sofern installiert."""
+    return uvloop.run(coro) if uvloop else asyncio.run(coro)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Erstellt Testbenutzer in der Agora-Datenbank und schreibt user.txt"
@@ -141,6 +209,18 @@ def main():
         default="Admin1234!",
         help="Passwort fuer den Admin-Benutzer (Standard: Admin1234!)",
     )
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=16,
+        help="Gleichzeitige Anfragen (Standard: 16)",
+    )
+    parser.add_argument(
+        "--ramp-up-seconds",
+        type=float,
+        default=0.0,
+        help="Anfragen ueber so viele Sekunden verteilt starten (Standard: 0)",
+    )
     parser.add_argument(
         "--output", "-o",
         type=str,
@@ -153,16 +233,7 @@ def main():
     print(f"  Praefix: {args.prefix}, Passwort: {args.password}")
     print()
 
-    with httpx.Client(base_url=args.base_url, timeout=30.0) as client:
-        # 1. Admin anmelden
-        print("Admin-Benutzer ...")
-        admin_user, admin_token = login_admin(client, args.admin_password)
-        if not admin_token:
-            sys.exit(1)
-
-        # 2. Testbenutzer ueber Admin-API erstellen
-        print()
-        users = create_users(client, admin_token, args.count, args.prefix, args.password)
+    admin_user, users = _run(_seed(args))
 
     # 3. user.txt schreiben
     print()
@@ -2,36 +2,73 @@
 Pytest-Konfiguration mit In-Memory SQLite fuer PostgreSQL-Models
 und temporaerem Verzeichnis fuer Chat-SQLite-Dateien.
 """
+import asyncio
+import functools
 import os
 import tempfile
 import uuid
 
+# bcrypt mit minimalen Runden: Registrierung/Login kosten sonst ~100 ms pro
+# Hash. Muss vor dem Import der App gesetzt sein (pwd_context wird dort gebaut).
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+try:
+    import uvloop
+except ImportError:  # Windows: uvicorn[standard] bringt dort kein uvloop mit
+    uvloop = None
 
 from app.models.base import Base
 from app.database import get_db
+from app.models.user import User
+from app.schemas.user import UserOut
+from app.services.auth import create_access_token, hash_password
+from app.services.chat_db import close_all
 from app.config import settings
 from app.main import app
 
 # Enable registration for tests
 settings.allow_registration = True
 
-# In-memory SQLite fuer PostgreSQL-Ersatz im Test
+# In-memory SQLite fuer PostgreSQL-Ersatz im Test. Jeder pytest-xdist-Worker
+# (``pytest -n auto``) ist ein eigener Prozess und damit eine eigene Datenbank.
 TEST_DB_URL = "sqlite+aiosqlite:///:memory:"
 
 
-@pytest_asyncio.fixture
-async def db_engine():
-    engine = create_async_engine(TEST_DB_URL, echo=False)
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Tests laufen auf uvloop wie der Server (siehe Dockerfile), falls installiert."""
+    if uvloop is None:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
+async def _create_schema(engine):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture(scope="session")
+def _shared_engine():
+    """Eine In-Memory-Datenbank fuer die ganze Test-Session (Schema einmal anlegen)."""
+    engine = create_async_engine(TEST_DB_URL, echo=False, poolclass=StaticPool)
+    asyncio.run(_create_schema(engine))
     yield engine
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-    await engine.dispose()
+    asyncio.run(engine.dispose())
+
+
+@pytest_asyncio.fixture
+async def db_engine(_shared_engine):
+    yield _shared_engine
+    # Tabellen leeren statt DROP/CREATE pro Test
+    async with _shared_engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            await conn.execute(table.delete())
 
 
 @pytest_asyncio.fixture
@@ -43,6 +80,13 @@ async def db_session(db_engine):
         yield session
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def _close_chat_dbs():
+    """Close the pooled chat DB connections opened by each test."""
+    yield
+    await close_all()
+
+
 @pytest.fixture
 def tmp_chat_dir(tmp_path, monkeypatch):
     chat_dir = str(tmp_path / "chats")
@@ -59,8 +103,16 @@ def tmp_upload_dir(tmp_path, monkeypatch):
     return upload_dir
 
 
+@pytest.fixture(scope="session")
+def _asgi_client():
+    """Ein AsyncClient auf die FastAPI-App fuer die ganze Test-Session."""
+    ac = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    yield ac
+    asyncio.run(ac.aclose())
+
+
 @pytest_asyncio.fixture
-async def client(db_engine):
+async def client(db_engine, _asgi_client):
     """AsyncClient der FastAPI-App mit ueberschriebener DB-Dependency."""
     session_maker = async_sessionmaker(
         db_engine, class_=AsyncSession, expire_on_commit=False
@@ -76,9 +128,8 @@ async def client(db_engine):
                 raise
 
     app.dependency_overrides[get_db] = override_get_db
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
-        yield ac
+    _asgi_client.cookies.clear()
+    yield _asgi_client
     app.dependency_overrides.clear()
 
 
@@ -103,5 +154,38 @@ async def register_user(
     return resp.json()
 
 
+@functools.lru_cache(maxsize=None)
+def _password_hash(password: str) -> str:
+    """Ein bcrypt-Hash pro Passwort und Test-Session (das Salz ist hier egal)."""
+    return hash_password(password)
+
+
+async def create_user(
+    db_session: AsyncSession,
+    username: str = "testuser",
+    email: str = "test@agora.local",
+    password: str = "Test1234!",
+    display_name: str = "Test User",
+) -> dict:
+    """Hilfsfunktion: Legt einen Benutzer direkt in der DB an (ohne HTTP).
+
+    Liefert dasselbe Auth-Dict wie ``register_user``; fuer Tests, die nur
+    einen angemeldeten Benutzer brauchen und nicht die Registrierung pruefen.
+    """
+    user = User(
+        username=username,
+        email=email,
+        password_hash=_password_hash(password),
+        display_name=display_name,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    return {
+        "access_token": create_access_token(user.id),
+        "token_type": "bearer",
+        "user": UserOut.model_validate(user).model_dump(mode="json"),
+    }
+
+
 def auth_headers(token: str) -> dict:
     return {"Authorization": f"Bearer {token}"}
@@ -1,9 +1,11 @@
 """Tests fuer Authentifizierung (Register, Login, JWT)."""
+import threading
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
 
-from tests.conftest import auth_headers, register_user
+from tests.conftest import auth_headers, create_user, register_user
 
 
 @pytest.mark.asyncio
@@ -58,8 +60,8 @@ async def test_register_duplicate_email(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_login_success(client: AsyncClient):
-    await register_user(client, username="dave", email="dave@agora.local")
+async def test_login_success(client: AsyncClient, db_session):
+    await create_user(db_session, username="dave", email="dave@agora.local")
     resp = await client.post(
         "/api/auth/login",
         json={"username": "dave", "password": "Test1234!"},
@@ -72,8 +74,8 @@ async def test_login_success(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_login_wrong_password(client: AsyncClient):
-    await register_user(client, username="eve", email="eve@agora.local")
+async def test_login_wrong_password(client: AsyncClient, db_session):
+    await create_user(db_session, username="eve", email="eve@agora.local")
     resp = await client.post(
         "/api/auth/login",
         json={"username": "eve", "password": "falsch"},
@@ -92,8 +94,8 @@ async def test_login_nonexistent_user(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_get_me_authenticated(client: AsyncClient):
-    auth = await register_user(client, username="frank", email="frank@agora.local")
+async def test_get_me_authenticated(client: AsyncClient, db_session):
+    auth = await create_user(db_session, username="frank", email="frank@agora.local")
     resp = await client.get("/api/auth/me", headers=auth_headers(auth["access_token"]))
     assert resp.status_code == 200
     assert resp.json()["username"] == "frank"
@@ -115,8 +117,8 @@ async def test_get_me_invalid_token(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_update_me(client: AsyncClient):
-    auth = await register_user(client, username="grace", email="grace@agora.local")
+async def test_update_me(client: AsyncClient, db_session):
+    auth = await create_user(db_session, username="grace", email="grace@agora.local")
     headers = auth_headers(auth["access_token"])
 
     resp = await client.patch(
@@ -128,3 +130,29 @@ async def test_update_me(client: AsyncClient):
     data = resp.json()
     assert data["display_name"] == "Grace Updated"
     assert data["status"] == "away"
+
+
+@pytest.mark.asyncio
+async def test_ldap_login_runs_off_event_loop(client: AsyncClient, monkeypatch):
+    monkeypatch.setattr("app.config.settings.ldap_enabled", True)
+    monkeypatch.setattr("app.config.settings.ldap_server", "ldap.example.com")
+    threads = []
+
+    def fake_ldap(username, password):
+        threads.append(threading.current_thread())
+        return {
+            "username": username,
+            "email": "ldapuser@example.com",
+            "display_name": "LDAP User",
+            "is_admin": False,
+        }
+
+    monkeypatch.setattr("app.services.ldap_auth._ldap_authenticate_sync", fake_ldap)
+
+    resp = await client.post(
+        "/api/auth/login",
+        json={"username": "ldapuser", "password": "geheim"},
+    )
+    assert resp.status_code == 200
+    assert resp.json()["user"]["display_name"] == "LDAP User"
+    assert threads and threads[0] is not threading.main_thread()
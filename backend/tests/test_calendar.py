@@ -1,14 +1,21 @@
 """Tests fuer die Calendar-API (Events + Integration + Video-Call)."""
 
+import asyncio
+import uuid
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
+import pytest_asyncio
 from httpx import AsyncClient
+from icalendar import Calendar
 
+from app.models.calendar import CalendarEvent
 from app.services import calendar_sync
 from app.api.calendar import _parse_dt
-from tests.conftest import auth_headers, register_user
+from tests.conftest import auth_headers, create_user, register_user
 
 
 @pytest.fixture
@@ -17,6 +24,28 @@ def _dirs(tmp_chat_dir, tmp_upload_dir):
     pass
 
 
+def _mock_provider_http(monkeypatch, handler):
+    """Route calendar_sync's provider requests to *handler* instead of the network."""
+    monkeypatch.setattr(
+        calendar_sync,
+        "_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+@pytest_asyncio.fixture
+async def auth(db_session):
+    """Default test user, inserted directly instead of via /api/auth/register."""
+    return await create_user(db_session)
+
+
+async def _seed_events(db_session, auth: dict, specs: list[dict]) -> None:
+    """Insert events for the auth user directly, for tests of the read endpoints."""
+    user_id = uuid.UUID(auth["user"]["id"])
+    db_session.add_all([CalendarEvent(user_id=user_id, **spec) for spec in specs])
+    await db_session.commit()
+
+
 # ---------------------------------------------------------------------------
 # Calendar Events CRUD
 # ---------------------------------------------------------------------------
@@ -26,8 +55,7 @@ class TestCalendarEvents:
     """CRUD operations on /api/calendar/events."""
 
     @pytest.mark.asyncio
-    async def test_create_event(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_create_event(self, client: AsyncClient, _dirs, auth):
         token = auth["access_token"]
 
         now = datetime.now(timezone.utc)
@@ -51,8 +79,7 @@ class TestCalendarEvents:
         assert data["id"]
 
     @pytest.mark.asyncio
-    async def test_create_event_invalid_time(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_create_event_invalid_time(self, client: AsyncClient, _dirs, auth):
         token = auth["access_token"]
 
         now = datetime.now(timezone.utc)
@@ -68,22 +95,15 @@ class TestCalendarEvents:
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_list_events(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_list_events(self, client: AsyncClient, _dirs, auth, db_session):
         token = auth["access_token"]
         headers = auth_headers(token)
 
         now = datetime.now(timezone.utc)
-        for title in ("Event A", "Event B"):
-            await client.post(
-                "/api/calendar/events",
-                json={
-                    "title": title,
-                    "start_time": now.isoformat(),
-                    "end_time": (now + timedelta(hours=1)).isoformat(),
-                },
-                headers=headers,
-            )
+        await _seed_events(db_session, auth, [
+            {"title": title, "start_time": now, "end_time": now + timedelta(hours=1)}
+            for title in ("Event A", "Event B")
+        ])
 
         resp = await client.get(
             "/api/calendar/events",
@@ -100,30 +120,25 @@ class TestCalendarEvents:
         assert titles == {"Event A", "Event B"}
 
     @pytest.mark.asyncio
-    async def test_list_events_filters_by_date_range(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_list_events_filters_by_date_range(
+        self, client: AsyncClient, _dirs, auth, db_session
+    ):
         token = auth["access_token"]
         headers = auth_headers(token)
 
         base = datetime(2026, 6, 15, 10, 0, tzinfo=timezone.utc)
-        await client.post(
-            "/api/calendar/events",
-            json={
+        await _seed_events(db_session, auth, [
+            {
                 "title": "In range",
-                "start_time": base.isoformat(),
-                "end_time": (base + timedelta(hours=1)).isoformat(),
+                "start_time": base,
+                "end_time": base + timedelta(hours=1),
             },
-            headers=headers,
-        )
-        await client.post(
-            "/api/calendar/events",
-            json={
+            {
                 "title": "Out of range",
-                "start_time": (base + timedelta(days=60)).isoformat(),
-                "end_time": (base + timedelta(days=60, hours=1)).isoformat(),
+                "start_time": base + timedelta(days=60),
+                "end_time": base + timedelta(days=60, hours=1),
             },
-            headers=headers,
-        )
+        ])
 
         resp = await client.get(
             "/api/calendar/events",
@@ -139,8 +154,7 @@ class TestCalendarEvents:
         assert events[0]["title"] == "In range"
 
     @pytest.mark.asyncio
-    async def test_get_event(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_get_event(self, client: AsyncClient, _dirs, auth):
         token = auth["access_token"]
         headers = auth_headers(token)
 
@@ -161,8 +175,7 @@ class TestCalendarEvents:
         assert resp.json()["title"] == "Meeting"
 
     @pytest.mark.asyncio
-    async def test_get_event_not_found(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_get_event_not_found(self, client: AsyncClient, _dirs, auth):
         token = auth["access_token"]
 
         resp = await client.get(
@@ -172,8 +185,7 @@ class TestCalendarEvents:
         assert resp.status_code == 404
 
     @pytest.mark.asyncio
-    async def test_update_event(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_update_event(self, client: AsyncClient, _dirs, auth):
         token = auth["access_token"]
         headers = auth_headers(token)
 
@@ -199,8 +211,7 @@ class TestCalendarEvents:
         assert resp.json()["location"] == "Berlin"
 
     @pytest.mark.asyncio
-    async def test_delete_event(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_delete_event(self, client: AsyncClient, _dirs, auth):
         token = auth["access_token"]
         headers = auth_headers(token)
 
@@ -251,8 +262,7 @@ class TestCalendarEvents:
         assert len(resp.json()) == 0
 
     @pytest.mark.asyncio
-    async def test_create_all_day_event(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_create_all_day_event(self, client: AsyncClient, _dirs, auth):
         token = auth["access_token"]
 
         day = datetime(2026, 7, 1, 0, 0, tzinfo=timezone.utc)
@@ -270,10 +280,9 @@ class TestCalendarEvents:
         assert resp.json()["all_day"] is True
 
     @pytest.mark.asyncio
-    async def test_create_event_with_video_call(self, client: AsyncClient, _dirs):
+    async def test_create_event_with_video_call(self, client: AsyncClient, _dirs, auth):
         """create_video_call=True should create a meeting channel and put a
         /video/<uuid> link in the location field."""
-        auth = await register_user(client)
         token = auth["access_token"]
 
         now = datetime.now(timezone.utc)
@@ -294,9 +303,8 @@ class TestCalendarEvents:
 
     @pytest.mark.asyncio
     async def test_create_event_with_video_call_preserves_existing_location(
-        self, client: AsyncClient, _dirs
+        self, client: AsyncClient, _dirs, auth
     ):
-        auth = await register_user(client)
         token = auth["access_token"]
 
         now = datetime.now(timezone.utc)
@@ -326,8 +334,7 @@ class TestCalendarIntegration:
     """CRUD operations on /api/calendar/integration."""
 
     @pytest.mark.asyncio
-    async def test_no_integration_by_default(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_no_integration_by_default(self, client: AsyncClient, _dirs, auth):
         resp = await client.get(
             "/api/calendar/integration",
             headers=auth_headers(auth["access_token"]),
@@ -336,8 +343,7 @@ class TestCalendarIntegration:
         assert resp.json() is None
 
     @pytest.mark.asyncio
-    async def test_create_internal_integration(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_create_internal_integration(self, client: AsyncClient, _dirs, auth):
         headers = auth_headers(auth["access_token"])
 
         resp = await client.put(
@@ -349,8 +355,7 @@ class TestCalendarIntegration:
         assert resp.json()["provider"] == "internal"
 
     @pytest.mark.asyncio
-    async def test_create_webdav_integration(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_create_webdav_integration(self, client: AsyncClient, _dirs, auth):
         headers = auth_headers(auth["access_token"])
 
         resp = await client.put(
@@ -371,8 +376,7 @@ class TestCalendarIntegration:
         assert "webdav_password" not in data
 
     @pytest.mark.asyncio
-    async def test_create_google_integration(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_create_google_integration(self, client: AsyncClient, _dirs, auth):
         headers = auth_headers(auth["access_token"])
 
         resp = await client.put(
@@ -392,8 +396,7 @@ class TestCalendarIntegration:
         assert "google_app_password" not in data
 
     @pytest.mark.asyncio
-    async def test_create_outlook_exchange_integration(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_create_outlook_exchange_integration(self, client: AsyncClient, _dirs, auth):
         headers = auth_headers(auth["access_token"])
 
         resp = await client.put(
@@ -415,8 +418,7 @@ class TestCalendarIntegration:
         assert "outlook_password" not in data
 
     @pytest.mark.asyncio
-    async def test_update_integration(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_update_integration(self, client: AsyncClient, _dirs, auth):
         headers = auth_headers(auth["access_token"])
 
         await client.put(
@@ -437,8 +439,7 @@ class TestCalendarIntegration:
         assert resp.json()["google_email"] == "user@gmail.com"
 
     @pytest.mark.asyncio
-    async def test_delete_integration(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_delete_integration(self, client: AsyncClient, _dirs, auth):
         headers = auth_headers(auth["access_token"])
 
         await client.put(
@@ -454,8 +455,7 @@ class TestCalendarIntegration:
         assert resp2.json() is None
 
     @pytest.mark.asyncio
-    async def test_invalid_provider(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_invalid_provider(self, client: AsyncClient, _dirs, auth):
         resp = await client.put(
             "/api/calendar/integration",
             json={"provider": "invalid_provider"},
@@ -464,8 +464,7 @@ class TestCalendarIntegration:
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_sync_without_integration_fails(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_sync_without_integration_fails(self, client: AsyncClient, _dirs, auth):
         resp = await client.post(
             "/api/calendar/sync",
             headers=auth_headers(auth["access_token"]),
@@ -473,8 +472,7 @@ class TestCalendarIntegration:
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_sync_internal_provider_fails(self, client: AsyncClient, _dirs):
-        auth = await register_user(client)
+    async def test_sync_internal_provider_fails(self, client: AsyncClient, _dirs, auth):
         headers = auth_headers(auth["access_token"])
 
         await client.put(
@@ -486,9 +484,8 @@ class TestCalendarIntegration:
         assert resp.status_code == 400
 
     @pytest.mark.asyncio
-    async def test_sync_google_no_token_returns_502(self, client: AsyncClient, _dirs):
+    async def test_sync_google_no_token_returns_502(self, client: AsyncClient, _dirs, auth):
         """When Google has no refresh token, sync returns 502."""
-        auth = await register_user(client)
         headers = auth_headers(auth["access_token"])
 
         # Set provider to google but without OAuth tokens
@@ -505,9 +502,8 @@ class TestCalendarIntegration:
         assert "reconnect" in resp.json()["detail"].lower()
 
     @pytest.mark.asyncio
-    async def test_sync_google_auth_failure_returns_502(self, client: AsyncClient, _dirs):
+    async def test_sync_google_auth_failure_returns_502(self, client: AsyncClient, _dirs, auth):
         """When Google token refresh fails, sync returns 502."""
-        auth = await register_user(client)
         headers = auth_headers(auth["access_token"])
 
         await client.put(
@@ -516,34 +512,22 @@ class TestCalendarIntegration:
             headers=headers,
         )
 
-        # Directly set refresh token in the DB via another request
-        # Use mock to simulate refresh failure
-        mock_token_resp = AsyncMock()
-        mock_token_resp.status_code = 401
-        mock_token_resp.text = '{"error": "invalid_grant"}'
-
-        with patch("app.services.calendar_sync.httpx.AsyncClient") as mock_client_cls:
-            mock_client = AsyncMock()
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_client.post = AsyncMock(return_value=mock_token_resp)
-            mock_client_cls.return_value = mock_client
-
-            # We need to set the refresh_token directly
-            with patch(
-                "app.services.calendar_sync._google_ensure_token",
-                side_effect=calendar_sync.ProviderError("google", 401, "Google token refresh failed – please reconnect your account"),
-            ):
-                resp = await client.post("/api/calendar/sync", headers=headers)
+        # Simulate the token refresh failing
+        with patch(
+            "app.services.calendar_sync._google_ensure_token",
+            side_effect=calendar_sync.ProviderError("google", 401, "Google token refresh failed – please reconnect your account"),
+        ):
+            resp = await client.post("/api/calendar/sync", headers=headers)
 
         assert resp.status_code == 502
         assert "google" in resp.json()["detail"].lower()
         assert "401" in resp.json()["detail"]
 
     @pytest.mark.asyncio
-    async def test_sync_google_success_imports_events(self, client: AsyncClient, _dirs):
+    async def test_sync_google_success_imports_events(
+        self, client: AsyncClient, _dirs, auth, monkeypatch
+    ):
         """When Google Calendar API returns events, they are imported."""
-        auth = await register_user(client)
         headers = auth_headers(auth["access_token"])
 
         await client.put(
@@ -565,29 +549,20 @@ class TestCalendarIntegration:
             ],
         }
 
-        mock_list_resp = AsyncMock()
-        mock_list_resp.status_code = 200
-        mock_list_resp.json = lambda: google_api_response
+        _mock_provider_http(monkeypatch, lambda request: httpx.Response(200, json=google_api_response))
 
         with patch(
             "app.services.calendar_sync._google_ensure_token",
             return_value="fake-access-token",
         ):
-            with patch("app.services.calendar_sync.httpx.AsyncClient") as mock_client_cls:
-                mock_client = AsyncMock()
-                mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-                mock_client.__aexit__ = AsyncMock(return_value=False)
-                mock_client.get = AsyncMock(return_value=mock_list_resp)
-                mock_client_cls.return_value = mock_client
-
-                resp = await client.post(
-                    "/api/calendar/sync",
-                    params={
-                        "start": "2026-02-01T00:00:00Z",
-                        "end": "2026-03-01T00:00:00Z",
-                    },
-                    headers=headers,
-                )
+            resp = await client.post(
+                "/api/calendar/sync",
+                params={
+                    "start": "2026-02-01T00:00:00Z",
+                    "end": "2026-03-01T00:00:00Z",
+                },
+                headers=headers,
+            )
 
         assert resp.status_code == 200
         events = resp.json()
@@ -601,3 +576,263 @@ def test_parse_dt_accepts_z_suffix():
     assert dt is not None
     assert dt.tzinfo is not None
     assert dt.utcoffset() == timedelta(0)
+
+
+def test_parse_caldav_response_extracts_vevents():
+    xml = (
+        b'<?xml version="1.0" encoding="utf-8"?>'
+        b'<D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">'
+        b"<D:response><D:propstat><D:prop>"
+        b"<C:calendar-data>BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VEVENT\r\n"
+        b"UID:ev-1\r\nSUMMARY:Standup &amp; Sync\r\n"
+        b"DTSTART:20260214T100000Z\r\nDTEND:20260214T110000Z\r\n"
+        b"LOCATION:Room A\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n</C:calendar-data>"
+        b"</D:prop></D:propstat></D:response>"
+        b"</D:multistatus>"
+    )
+    events = calendar_sync._parse_caldav_response(xml)
+    assert len(events) == 1
+    assert events[0]["external_id"] == "ev-1"
+    assert events[0]["title"] == "Standup & Sync"
+    assert events[0]["location"] == "Room A"
+    assert events[0]["start_time"] == datetime(2026, 2, 14, 10, tzinfo=timezone.utc)
+
+
+def test_parse_ews_find_response_extracts_calendar_items():
+    xml = (
+        b'<?xml version="1.0" encoding="utf-8"?>'
+        b'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+        b'<m:FindItemResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages"'
+        b' xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">'
+        b"<m:RootFolder><t:Items>"
+        b'<t:CalendarItem><t:ItemId ChangeKey="ck" Id="AAA="/>'
+        b"<t:Subject>Review</t:Subject>"
+        b"<t:Start>2026-02-14T10:00:00Z</t:Start><t:End>2026-02-14T11:00:00Z</t:End>"
+        b"</t:CalendarItem>"
+        b"</t:Items></m:RootFolder></m:FindItemResponse>"
+        b"</s:Body></s:Envelope>"
+    )
+    events = calendar_sync._parse_ews_find_response(xml)
+    assert events == [
+        {
+            "external_id": "AAA=",
+            "title": "Review",
+            "description": None,
+            "start_time": "2026-02-14T10:00:00Z",
+            "end_time": "2026-02-14T11:00:00Z",
+            "location": None,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_outlook_create_event_escapes_user_fields():
+    sent: list[bytes] = []
+
+    async def fake_request(integration, soap_body):
+        sent.append(calendar_sync._ews_soap(soap_body))
+        return None
+
+    start = datetime(2026, 2, 14, 10, tzinfo=timezone.utc)
+    with patch("app.services.calendar_sync._ews_request", side_effect=fake_request):
+        await calendar_sync.outlook_create_event(
+            None, "R&D <sync>", start, start + timedelta(hours=1), "a & b", "Room <1>",
+        )
+
+    envelope = sent[0]
+    assert envelope.startswith(calendar_sync._SOAP_PREFIX)
+    assert envelope.endswith(calendar_sync._SOAP_SUFFIX)
+    assert b"<t:Subject>R&amp;D &lt;sync&gt;</t:Subject>" in envelope
+    assert b"a &amp; b" in envelope
+    assert b"<t:Location>Room &lt;1&gt;</t:Location>" in envelope
+
+
+def test_utc_formatters_match_strftime():
+    dt = datetime(2026, 2, 4, 7, 5, 9, 123456, tzinfo=timezone.utc)
+    assert calendar_sync._ical_utc(dt) == dt.strftime("%Y%m%dT%H%M%SZ")
+    assert calendar_sync._iso_utc(dt) == dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@pytest.mark.asyncio
+async def test_webdav_put_events_bounds_concurrency():
+    in_flight = 0
+    peak = 0
+
+    async def fake_put(integration, uid, *args, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return uid != "bad"
+
+    start = datetime(2026, 2, 14, 10, tzinfo=timezone.utc)
+    items = [(uid, "t", start, start, None, None) for uid in ("a", "bad", "c", "d", "e")]
+    with patch("app.services.calendar_sync.webdav_put_event", side_effect=fake_put):
+        results = await calendar_sync.webdav_put_events(None, items, concurrency=2)
+
+    assert results == [True, False, True, True, True]
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_google_list_events_follows_next_page_token(monkeypatch):
+    pages = [
+        {"items": [{"id": "a", "summary": "A", "start": {"date": "2026-02-14"}, "end": {"date": "2026-02-15"}}],
+         "nextPageToken": "p2"},
+        {"items": [{"id": "b", "summary": "B", "start": {"date": "2026-02-16"}, "end": {"date": "2026-02-17"}}]},
+    ]
+    seen_params: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_params.append(dict(request.url.params))
+        return httpx.Response(200, json=pages[len(seen_params) - 1])
+
+    _mock_provider_http(monkeypatch, handler)
+    with patch("app.services.calendar_sync._google_ensure_token", return_value="tok"):
+        start = datetime(2026, 2, 1, tzinfo=timezone.utc)
+        events = await calendar_sync.google_list_events(None, start, start + timedelta(days=28))
+
+    assert [e["external_id"] for e in events] == ["a", "b"]
+    assert seen_params[0]["fields"] == calendar_sync.GOOGLE_EVENT_FIELDS
+    assert "pageToken" not in seen_params[0]
+    assert seen_params[1]["pageToken"] == "p2"
+
+
+@pytest.mark.asyncio
+async def test_outlook_create_event_returns_created_item_id():
+    resp = httpx.Response(
+        200,
+        content=(
+            b'<?xml version="1.0" encoding="utf-8"?>'
+            b'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"><s:Body>'
+            b'<m:CreateItemResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages"'
+            b' xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">'
+            b"<m:ResponseMessages><m:CreateItemResponseMessage ResponseClass=\"Success\">"
+            b'<t:ParentFolderId Id="FOLDER"/>'
+            b'<m:Items><t:CalendarItem><t:ItemId Id="CREATED" ChangeKey="ck"/></t:CalendarItem></m:Items>'
+            b"</m:CreateItemResponseMessage></m:ResponseMessages>"
+            b"</m:CreateItemResponse></s:Body></s:Envelope>"
+        ),
+    )
+    start = datetime(2026, 2, 14, 10, tzinfo=timezone.utc)
+    with patch("app.services.calendar_sync._ews_request", return_value=resp):
+        item_id = await calendar_sync.outlook_create_event(None, "t", start, start)
+    assert item_id == "CREATED"
+
+
+@pytest.mark.asyncio
+async def test_webdav_list_events_sends_bytes_report_body():
+    integration = SimpleNamespace(webdav_url="https://dav.example/cal/", webdav_username=None)
+    report_resp = httpx.Response(207, content=b'<D:multistatus xmlns:D="DAV:"/>')
+
+    with patch("app.services.calendar_sync._http_client") as mock_client_cls:
+        mock_client = AsyncMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+        mock_client.request = AsyncMock(return_value=report_resp)
+        mock_client_cls.return_value = mock_client
+
+        start = datetime(2026, 2, 1, tzinfo=timezone.utc)
+        events = await calendar_sync.webdav_list_events(integration, start, start + timedelta(days=1))
+
+    assert events == []
+    body = mock_client.request.call_args.kwargs["content"]
+    assert isinstance(body, bytes)
+    assert b'<C:time-range start="20260201T000000Z" end="20260202T000000Z"/>' in body
+
+
+def test_ical_event_wraps_vevent_in_static_calendar_frame():
+    start = datetime(2026, 2, 14, 10, tzinfo=timezone.utc)
+    ical = calendar_sync._ical_event("uid-1", "Standup", start, start + timedelta(hours=1), location="Room A")
+    assert ical.startswith(calendar_sync._ICAL_PROLOGUE + b"BEGIN:VEVENT\r\n")
+    assert ical.endswith(b"END:VEVENT\r\n" + calendar_sync._ICAL_EPILOGUE)
+
+    (event,) = Calendar.from_ical(ical).walk("VEVENT")
+    assert str(event["uid"]) == "uid-1"
+    assert str(event["location"]) == "Room A"
+    assert event["dtstart"].dt == start
+
+
+def test_basic_header_matches_httpx_basic_auth():
+    request = httpx.Request("GET", "https://dav.example/")
+    expected = next(httpx.BasicAuth("user", "p&ss:word").auth_flow(request)).headers["Authorization"]
+    assert calendar_sync._basic_header("user", "p&ss:word") == expected
+
+
+def test_as_utc_and_norm_range():
+    cet = timezone(timedelta(hours=1))
+    start = calendar_sync._as_utc(datetime(2026, 2, 1, 0, 30, tzinfo=cet))
+    end = calendar_sync._as_utc(datetime(2026, 3, 1, 12, 0))  # naive values are treated as UTC
+    assert calendar_sync._norm_range(start, end) == ("2026-01-31T23:30:00Z", "2026-03-01T12:00:00Z")
+
+
+def test_parse_caldav_response_skips_malformed_blocks():
+    def response(ical: bytes) -> bytes:
+        return b"<D:response><D:propstat><D:prop><C:calendar-data>" + ical + b"</C:calendar-data></D:prop></D:propstat></D:response>"
+
+    good = b"BEGIN:VCALENDAR\r\nBEGIN:VEVENT\r\nUID:ok\r\nSUMMARY:Fine\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n"
+    xml = (
+        b'<D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">'
+        + response(b"garbage")
+        + response(good)
+        + b"<D:response><D:unclosed>"
+    )
+    events = calendar_sync._parse_caldav_response(xml)
+    assert [e["external_id"] for e in events] == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_list_events_short_circuits_empty_range():
+    integration = SimpleNamespace(webdav_url="https://dav.example/cal/", webdav_username=None)
+    start = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    with patch("app.services.calendar_sync._http_client") as mock_client_cls:
+        with patch("app.services.calendar_sync._google_ensure_token") as mock_token:
+            assert await calendar_sync.webdav_list_events(integration, start, start) == []
+            assert await calendar_sync.google_list_events(integration, start, start - timedelta(days=1)) == []
+            assert await calendar_sync.outlook_list_events(integration, start, start) == []
+    mock_client_cls.assert_not_called()
+    mock_token.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_batch_helpers_map_per_item_errors_to_failure():
+    async def flaky_put(integration, uid, *args, **kwargs):
+        if uid == "boom":
+            raise httpx.ConnectError("connection refused")
+        return True
+
+    async def flaky_create(integration, title, *args):
+        if title == "boom":
+            raise httpx.ReadTimeout("timed out")
+        return f"id-{title}"
+
+    start = datetime(2026, 2, 14, 10, tzinfo=timezone.utc)
+    with patch("app.services.calendar_sync.webdav_put_event", side_effect=flaky_put):
+        put_results = await calendar_sync.webdav_put_events(
+            None, [(uid, "t", start, start, None, None) for uid in ("a", "boom", "c")]
+        )
+    with patch("app.services.calendar_sync._google_ensure_token", return_value="tok"):
+        with patch("app.services.calendar_sync.google_create_event", side_effect=flaky_create):
+            create_results = await calendar_sync.google_create_events(
+                None, [(title, start, start, None, None) for title in ("a", "boom")]
+            )
+
+    assert put_results == [True, False, True]
+    assert create_results == ["id-a", None]
+
+
+def test_parse_caldav_response_skips_malformed_vevent():
+    ical = (
+        b"BEGIN:VCALENDAR\r\n"
+        b"BEGIN:VEVENT\r\nUID:dup\r\nDTSTART:20260214T100000Z\r\nDTSTART:20260214T110000Z\r\nEND:VEVENT\r\n"
+        b"BEGIN:VEVENT\r\nUID:ok\r\nDTSTART:20260214T100000Z\r\nEND:VEVENT\r\n"
+        b"END:VCALENDAR\r\n"
+    )
+    xml = (
+        b'<D:multistatus xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">'
+        b"<D:response><D:propstat><D:prop><C:calendar-data>" + ical
+        + b"</C:calendar-data></D:prop></D:propstat></D:response></D:multistatus>"
+    )
+    events = calendar_sync._parse_caldav_response(xml)
+    assert [e["external_id"] for e in events] == ["ok"]
@@ -1,12 +1,18 @@
 """Unit-Tests fuer den chat_db Service (SQLite-Operationen)."""
+import asyncio
+import os
+import sqlite3
+
 import pytest
 
+from app.services import chat_db
 from app.services.chat_db import (
     add_message,
     add_reaction,
     delete_message,
     get_messages,
     get_reactions,
+    get_reactions_for_messages,
     init_chat_db,
     remove_reaction,
     update_message,
@@ -214,3 +220,178 @@ async def test_message_with_file_reference(tmp_chat_dir):
 
     messages = await get_messages(channel_id)
     assert messages[0]["file_reference_id"] == "ref-123"
+
+
+@pytest.mark.asyncio
+async def test_init_chat_db_enables_wal(tmp_chat_dir):
+    await init_chat_db("ch-wal")
+    conn = sqlite3.connect(os.path.join(tmp_chat_dir, "ch-wal.db"))
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_open_rolls_back_on_cancellation(tmp_chat_dir):
+    channel_id = "ch-rollback"
+    await init_chat_db(channel_id)
+    path = chat_db._db_path(channel_id)
+
+    with pytest.raises(asyncio.CancelledError):
+        async with chat_db._open(path) as db:
+            await db.execute(
+                "INSERT INTO messages (id, sender_id, content, created_at) VALUES ('leak', 'u', 'x', 'now')"
+            )
+            raise asyncio.CancelledError
+
+    await add_message(channel_id, "user-1", "Echt")
+    messages = await get_messages(channel_id)
+    assert [m["content"] for m in messages] == ["Echt"]
+
+
+@pytest.mark.asyncio
+async def test_connection_pool_evicts_least_recently_used(tmp_chat_dir, monkeypatch):
+    monkeypatch.setattr("app.config.settings.chat_db_max_connections", 2)
+    for channel_id in ("ch-lru-1", "ch-lru-2", "ch-lru-3"):
+        await init_chat_db(channel_id)
+
+    assert list(chat_db._conns) == [chat_db._db_path("ch-lru-2"), chat_db._db_path("ch-lru-3")]
+    # An evicted channel transparently reconnects.
+    await add_message("ch-lru-1", "user-1", "Wieder da")
+    assert len(await get_messages("ch-lru-1")) == 1
+    assert len(chat_db._conns) == 2
+
+
+@pytest.mark.asyncio
+async def test_connection_pool_keeps_new_connection_when_others_are_busy(tmp_chat_dir, monkeypatch):
+    monkeypatch.setattr("app.config.settings.chat_db_max_connections", 1)
+    await init_chat_db("ch-busy-1")
+    await init_chat_db("ch-busy-2")
+    connects = 0
+    real_connect = chat_db.aiosqlite.connect
+
+    def counting_connect(*args, **kwargs):
+        nonlocal connects
+        connects += 1
+        if connects > 3:
+            raise RuntimeError("reconnect loop")
+        return real_connect(*args, **kwargs)
+
+    async with chat_db._open(chat_db._db_path("ch-busy-1")):
+        # The only other connection is held: the new one must not be evicted
+        # again right after opening (that would reconnect in a loop)
+        monkeypatch.setattr(chat_db.aiosqlite, "connect", counting_connect)
+        msg = await add_message("ch-busy-2", "user-1", "Trotzdem")
+
+    assert msg["content"] == "Trotzdem"
+    assert connects == 1
+
+
+@pytest.mark.asyncio
+async def test_get_reactions_for_messages_groups_by_message(tmp_chat_dir):
+    channel_id = "ch-react-batch"
+    await init_chat_db(channel_id)
+    m1 = await add_message(channel_id, "user-1", "Eins")
+    m2 = await add_message(channel_id, "user-1", "Zwei")
+    m3 = await add_message(channel_id, "user-1", "Drei")
+    await add_reaction(channel_id, m1["id"], "user-2", "thumbsup")
+    await add_reaction(channel_id, m1["id"], "user-3", "heart")
+    await add_reaction(channel_id, m3["id"], "user-2", "smile")
+
+    result = await get_reactions_for_messages(channel_id, [m1["id"], m2["id"]])
+    assert set(result) == {m1["id"]}
+    assert sorted(r["emoji"] for r in result[m1["id"]]) == ["heart", "thumbsup"]
+
+
+@pytest.mark.asyncio
+async def test_init_chat_db_migrates_old_reactions_table(tmp_chat_dir):
+    path = os.path.join(tmp_chat_dir, "ch-old-react.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE messages (id TEXT PRIMARY KEY, sender_id TEXT NOT NULL,
+            content TEXT NOT NULL, message_type TEXT NOT NULL DEFAULT 'text',
+            file_reference_id TEXT, created_at TEXT NOT NULL, edited_at TEXT);
+        CREATE TABLE reactions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            message_id TEXT NOT NULL, user_id TEXT NOT NULL, emoji TEXT NOT NULL,
+            UNIQUE(message_id, user_id, emoji),
+            FOREIGN KEY (message_id) REFERENCES messages(id) ON DELETE CASCADE);
+        CREATE INDEX idx_reactions_message ON reactions(message_id);
+        INSERT INTO messages (id, sender_id, content, created_at) VALUES ('m1', 'u1', 'Hi', 'now');
+        INSERT INTO reactions (message_id, user_id, emoji) VALUES ('m1', 'u2', 'heart');
+        """
+    )
+    conn.close()
+
+    await init_chat_db("ch-old-react")
+    await init_chat_db("ch-old-react")
+
+    assert await get_reactions("ch-old-react", "m1") == [
+        {"message_id": "m1", "user_id": "u2", "emoji": "heart"}
+    ]
+    assert await add_reaction("ch-old-react", "m1", "u2", "heart") is False
+
+    conn = sqlite3.connect(path)
+    try:
+        cols = [row[1] for row in conn.execute("PRAGMA table_info(reactions)")]
+        indexes = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'reactions'"
+        )]
+    finally:
+        conn.close()
+    assert cols == ["message_id", "user_id", "emoji"]
+    assert "idx_reactions_message" not in indexes
+
+
+@pytest.mark.asyncio
+async def test_concurrent_messages_share_commits(tmp_chat_dir, monkeypatch):
+    channel_id = "ch-group-commit"
+    await init_chat_db(channel_id)
+    db = await chat_db._get_conn(chat_db._db_path(channel_id))
+    commits = 0
+    real_commit = db.commit
+
+    async def counting_commit():
+        nonlocal commits
+        commits += 1
+        await real_commit()
+
+    monkeypatch.setattr(db, "commit", counting_commit)
+
+    sent = await asyncio.gather(
+        *(add_message(channel_id, "user-1", f"Nachricht {i}") for i in range(20))
+    )
+
+    stored = await get_messages(channel_id, limit=50)
+    assert {m["id"] for m in stored} == {m["id"] for m in sent}
+    assert commits < 20
+
+
+@pytest.mark.asyncio
+async def test_cancelled_first_sender_does_not_abort_batch(tmp_chat_dir):
+    channel_id = "ch-group-cancel"
+    await init_chat_db(channel_id)
+    path = chat_db._db_path(channel_id)
+
+    async with chat_db._open(path):
+        # Connection busy: the first sender starts the batch, the others join it
+        first = asyncio.create_task(add_message(channel_id, "user-1", "Erster"))
+        await asyncio.sleep(0)
+        others = [
+            asyncio.create_task(add_message(channel_id, "user-2", f"Weitere {i}"))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+
+    sent = await asyncio.gather(*others)
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    stored = {m["content"] for m in await get_messages(channel_id)}
+    assert {m["content"] for m in sent} <= stored
+    # The cancelled sender's row was already queued and is stored as well
+    assert "Erster" in stored
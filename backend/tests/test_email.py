@@ -0,0 +1,60 @@
+"""Tests fuer den SMTP-Versand von Einladungen."""
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosmtplib
+import pytest
+
+from app.services import email as email_service
+
+
+def _fake_smtp():
+    smtp = MagicMock()
+    smtp.is_connected = False
+
+    async def connect():
+        smtp.is_connected = True
+
+    def close():
+        smtp.is_connected = False
+
+    smtp.connect = AsyncMock(side_effect=connect)
+    smtp.close = MagicMock(side_effect=close)
+    smtp.send_message = AsyncMock()
+    smtp.quit = AsyncMock()
+    return smtp
+
+
+async def _invite(to_email: str) -> bool:
+    return await email_service.send_invitation_email(
+        to_email=to_email,
+        channel_name="Planung",
+        inviter_name="Alice",
+        invite_link="http://agora.local/invite/x",
+        ics_content=b"BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n",
+    )
+
+
+@pytest.mark.asyncio
+async def test_invitations_reuse_one_connection():
+    smtp = _fake_smtp()
+    with patch.object(email_service.aiosmtplib, "SMTP", return_value=smtp) as smtp_cls:
+        assert await _invite("a@example.com")
+        assert await _invite("b@example.com")
+        await email_service.close_smtp()
+
+    smtp_cls.assert_called_once()
+    smtp.connect.assert_awaited_once()
+    assert smtp.send_message.await_count == 2
+    smtp.quit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_reconnects_once_after_disconnect():
+    smtp = _fake_smtp()
+    smtp.send_message.side_effect = [aiosmtplib.SMTPServerDisconnected("idle"), None]
+    with patch.object(email_service.aiosmtplib, "SMTP", return_value=smtp):
+        assert await _invite("c@example.com")
+        await email_service.close_smtp()
+
+    assert smtp.connect.await_count == 2
+    assert smtp.send_message.await_count == 2
@@ -271,3 +271,143 @@ async def test_reaction_feed_only_for_message_owner(client: AsyncClient):
     assert any(e["event_type"] == "reaction" and e["message_id"] == msg_id for e in owner_events)
     assert all(e["event_type"] != "reaction" for e in reactor_feed.json()["events"])
     assert all(e["event_type"] != "reaction" for e in other_feed.json()["events"])
+
+
+@pytest.mark.asyncio
+async def test_feed_event_created_for_every_member(client: AsyncClient):
+    sender = await register_user(client, username="fm1", email="fm1@agora.local")
+    others = [
+        await register_user(client, username=f"fm{i}", email=f"fm{i}@agora.local")
+        for i in (2, 3, 4)
+    ]
+
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={
+            "name": "Multi Feed",
+            "channel_type": "group",
+            "member_ids": [o["user"]["id"] for o in others],
+        },
+        headers=auth_headers(sender["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+
+    await client.post(
+        f"/api/channels/{channel_id}/messages/",
+        json={"content": "An alle"},
+        headers=auth_headers(sender["access_token"]),
+    )
+
+    for other in others:
+        resp = await client.get(
+            "/api/feed/",
+            headers=auth_headers(other["access_token"]),
+        )
+        events = resp.json()["events"]
+        assert len(events) == 1
+        assert events[0]["preview_text"] == "An alle"
+        assert events[0]["id"]
+
+
+@pytest.mark.asyncio
+async def test_feed_names_follow_renames(client: AsyncClient):
+    auth1 = await register_user(client, username="rn1", email="rn1@agora.local")
+    auth2 = await register_user(client, username="rn2", email="rn2@agora.local")
+
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={
+            "name": "Alter Name",
+            "channel_type": "group",
+            "member_ids": [auth2["user"]["id"]],
+        },
+        headers=auth_headers(auth1["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+
+    await client.post(
+        f"/api/channels/{channel_id}/messages/",
+        json={"content": "Vor der Umbenennung"},
+        headers=auth_headers(auth1["access_token"]),
+    )
+
+    await client.patch(
+        f"/api/channels/{channel_id}",
+        json={"name": "Neuer Name"},
+        headers=auth_headers(auth1["access_token"]),
+    )
+    await client.patch(
+        "/api/auth/me",
+        json={"display_name": "Neuer Absender"},
+        headers=auth_headers(auth1["access_token"]),
+    )
+
+    resp = await client.get(
+        "/api/feed/",
+        headers=auth_headers(auth2["access_token"]),
+    )
+    event = resp.json()["events"][0]
+    assert event["channel_name"] == "Neuer Name"
+    assert event["sender_name"] == "Neuer Absender"
+
+
+@pytest.mark.asyncio
+async def test_feed_cursor_pagination(client: AsyncClient):
+    auth1 = await register_user(client, username="kp1", email="kp1@agora.local")
+    auth2 = await register_user(client, username="kp2", email="kp2@agora.local")
+
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={
+            "name": "Keyset",
+            "channel_type": "group",
+            "member_ids": [auth2["user"]["id"]],
+        },
+        headers=auth_headers(auth1["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+
+    for i in range(5):
+        await client.post(
+            f"/api/channels/{channel_id}/messages/",
+            json={"content": f"Seite {i}"},
+            headers=auth_headers(auth1["access_token"]),
+        )
+
+    seen = []
+    cursor = None
+    for _ in range(3):
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get(
+            "/api/feed/",
+            params=params,
+            headers=auth_headers(auth2["access_token"]),
+        )
+        data = resp.json()
+        seen.extend(e["id"] for e in data["events"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+    bad = await client.get(
+        "/api/feed/?cursor=kaputt",
+        headers=auth_headers(auth2["access_token"]),
+    )
+    assert bad.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_feed_limit_zero_returns_empty_page(client: AsyncClient):
+    auth = await register_user(client)
+    resp = await client.get(
+        "/api/feed/?limit=0",
+        headers=auth_headers(auth["access_token"]),
+    )
+    assert resp.status_code == 200
+    assert resp.json()["events"] == []
+    assert resp.json()["next_cursor"] is None
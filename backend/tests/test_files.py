@@ -1,7 +1,10 @@
 import io
+import os
 
 import pytest
 
+from app.services.file_store import CHUNK_SIZE
+
 from .conftest import auth_headers, register_user
 
 
@@ -22,3 +25,41 @@ async def test_download_file_accepts_token_query(client, tmp_upload_dir):
     assert download_response.status_code == 200
     assert download_response.content == b"hello world"
     assert "bericht.txt" in download_response.headers.get("content-disposition", "")
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_stored_once(client, tmp_upload_dir):
+    auth = await register_user(client)
+    for name in ("a.txt", "b.txt"):
+        resp = await client.post(
+            "/api/files/upload",
+            headers=auth_headers(auth["access_token"]),
+            files={"file": (name, io.BytesIO(b"gleicher inhalt"), "text/plain")},
+        )
+        assert resp.status_code == 201
+
+    stored = [
+        os.path.join(root, f)
+        for root, _dirs, files in os.walk(tmp_upload_dir)
+        for f in files
+    ]
+    assert len(stored) == 1
+    assert not os.path.basename(stored[0]).startswith(".tmp.")
+
+
+@pytest.mark.asyncio
+async def test_download_large_file_intact(client, tmp_upload_dir):
+    auth = await register_user(client)
+    token = auth["access_token"]
+    payload = os.urandom(CHUNK_SIZE + 12345)
+
+    upload = await client.post(
+        "/api/files/upload",
+        headers=auth_headers(token),
+        files={"file": ("gross.bin", io.BytesIO(payload), "application/octet-stream")},
+    )
+    ref_id = upload.json()["id"]
+
+    download = await client.get(f"/api/files/download/{ref_id}?token={token}")
+    assert download.status_code == 200
+    assert download.content == payload
@@ -334,3 +334,28 @@ def test_ics_with_custom_start_time():
 
     ics_text = ics_bytes.decode("utf-8")
     assert "20260315T140000Z" in ics_text
+
+
+def test_ics_escapes_and_folds_text():
+    """Sonderzeichen werden maskiert, lange Zeilen gefaltet; icalendar liest das Ergebnis."""
+    from icalendar import Calendar
+
+    from app.services.ics import generate_invitation_ics
+
+    name = "Planung; Q3, Köln \\ Düsseldorf"
+    message = "Erste Zeile\nZweite Zeile mit Ümläüten " + "ä" * 80
+    ics_bytes = generate_invitation_ics(
+        channel_name=name,
+        inviter_name="Anna",
+        inviter_email="anna@agora.local",
+        invited_email="bob@example.com",
+        invite_link="http://localhost:4200/invite/fold",
+        start_time=datetime(2026, 3, 15, 15, 0, tzinfo=timezone(timedelta(hours=1))),
+        message=message,
+    )
+
+    assert all(len(line) <= 75 for line in ics_bytes.split(b"\r\n"))
+    event = Calendar.from_ical(ics_bytes).walk("VEVENT")[0]
+    assert str(event["summary"]) == name
+    assert message in str(event["description"])
+    assert event.decoded("dtstart") == datetime(2026, 3, 15, 14, 0, tzinfo=timezone.utc)
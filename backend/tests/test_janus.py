@@ -0,0 +1,28 @@
+"""Tests fuer den Janus-HTTP-Client."""
+import httpx
+import pytest
+
+from app.services.janus import JanusClient
+
+
+@pytest.mark.asyncio
+async def test_requests_share_one_client():
+    seen_urls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_urls.append(str(request.url))
+        return httpx.Response(200, json={"janus": "success", "data": {"id": 42}})
+
+    janus = JanusClient()
+    janus.base_url = "http://janus.test/janus"
+    janus._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = janus._get_client()
+
+    assert await janus.create_session() == 42
+    assert await janus.attach_plugin() == 42
+    assert janus._get_client() is client
+    assert seen_urls == ["http://janus.test/janus", "http://janus.test/janus/42"]
+
+    await janus.close()
+    assert client.is_closed
+    assert janus._client is None
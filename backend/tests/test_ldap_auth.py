@@ -0,0 +1,64 @@
+"""Tests fuer die LDAP-Anmeldung (ohne echten Verzeichnisserver)."""
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services import ldap_auth
+
+
+@pytest.fixture
+def ldap_settings(monkeypatch):
+    monkeypatch.setattr("app.config.settings.ldap_enabled", True)
+    monkeypatch.setattr("app.config.settings.ldap_server", "ldap.example.com")
+    monkeypatch.setattr("app.config.settings.ldap_base_dn", "dc=example,dc=com")
+    monkeypatch.setattr("app.config.settings.ldap_admin_group_dn", "cn=admins,dc=example,dc=com")
+    ldap_auth._ldap_server.cache_clear()
+    ldap_auth._service_connection.cache_clear()
+    yield
+    ldap_auth._ldap_server.cache_clear()
+    ldap_auth._service_connection.cache_clear()
+
+
+def test_service_connection_reused_across_logins(ldap_settings, monkeypatch):
+    service_conn = MagicMock()
+    service_conn.search.return_value = (
+        True,
+        {},
+        [
+            {
+                "type": "searchResEntry",
+                "dn": "cn=anna,dc=example,dc=com",
+                "attributes": {
+                    "mail": ["anna@example.com"],
+                    "displayName": ["Anna Admin"],
+                    "memberOf": ["cn=admins,dc=example,dc=com"],
+                },
+            },
+            {"type": "searchResRef", "uri": ["ldap://other/"]},
+        ],
+        None,
+    )
+    connection_cls = MagicMock(return_value=service_conn)
+    monkeypatch.setattr("ldap3.Connection", connection_cls)
+
+    first = ldap_auth._ldap_authenticate_sync("anna", "geheim")
+    second = ldap_auth._ldap_authenticate_sync("anna", "geheim")
+
+    assert first == second == {
+        "username": "anna",
+        "email": "anna@example.com",
+        "display_name": "Anna Admin",
+        "is_admin": True,
+    }
+    # One service connection plus one password bind per login
+    assert connection_cls.call_count == 3
+    user_binds = [c for c in connection_cls.call_args_list if c.kwargs.get("user") == "cn=anna,dc=example,dc=com"]
+    assert len(user_binds) == 2
+
+
+def test_unknown_user_returns_none(ldap_settings, monkeypatch):
+    service_conn = MagicMock()
+    service_conn.search.return_value = (False, {}, [], None)
+    monkeypatch.setattr("ldap3.Connection", MagicMock(return_value=service_conn))
+
+    assert ldap_auth._ldap_authenticate_sync("niemand", "x") is None
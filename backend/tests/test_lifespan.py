@@ -72,6 +72,21 @@ def _get_column_names(connection, table):
     return {c["name"] for c in inspector.get_columns(table)}
 
 
+_OLD_FEED_EVENTS_DDL = """\
+CREATE TABLE feed_events (
+    id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    channel_id TEXT NOT NULL,
+    sender_id TEXT NOT NULL,
+    event_type TEXT NOT NULL DEFAULT 'message',
+    preview_text TEXT,
+    message_id TEXT,
+    is_read BOOLEAN NOT NULL DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"""
+
+
 # ---------------------------------------------------------------------------
 # Tests
 # ---------------------------------------------------------------------------
@@ -246,3 +261,52 @@ async def test_missing_optional_tables_do_not_raise(engine):
 
         assert "is_hidden" in channel_cols
         assert "notification_sound_path" in user_cols
+
+
+@pytest.mark.asyncio
+async def test_adds_feed_event_indexes(engine):
+    """Existing feed_events tables get the indexes used by the feed queries."""
+    async with engine.begin() as conn:
+        await conn.execute(text(_OLD_FEED_EVENTS_DDL))
+
+        await conn.run_sync(_add_missing_columns)
+        await conn.run_sync(_add_missing_columns)
+
+        indexes = await conn.run_sync(
+            lambda c: {ix["name"] for ix in sa_inspect(c).get_indexes("feed_events")}
+        )
+        assert "ix_feed_events_user_id_is_read" in indexes
+
+
+@pytest.mark.asyncio
+async def test_backfills_denormalized_feed_names(engine):
+    """Existing feed events get sender and channel names copied in."""
+    async with engine.begin() as conn:
+        await conn.execute(text(_OLD_CHANNELS_DDL))
+        await conn.execute(text(_OLD_USERS_DDL))
+        await conn.execute(text(_OLD_FEED_EVENTS_DDL))
+        await conn.execute(text(
+            "INSERT INTO channels (id, name, sqlite_db_path, invite_token)"
+            " VALUES ('c1', 'general', '/tmp/c1.db', 'tok1')"
+        ))
+        await conn.execute(text(
+            "INSERT INTO users (id, username, email, password_hash, display_name)"
+            " VALUES ('u1', 'alice', 'a@b.c', 'hash', 'Alice')"
+        ))
+        await conn.execute(text(
+            "INSERT INTO feed_events (id, user_id, channel_id, sender_id)"
+            " VALUES ('f1', 'u2', 'c1', 'u1')"
+        ))
+
+        await conn.run_sync(_add_missing_columns)
+
+        row = (await conn.execute(text(
+            "SELECT sender_display_name, channel_name FROM feed_events WHERE id = 'f1'"
+        ))).fetchone()
+        assert row == ("Alice", "general")
+
+        indexes = await conn.run_sync(
+            lambda c: {ix["name"] for ix in sa_inspect(c).get_indexes("feed_events")}
+        )
+        assert "ix_feed_events_user_id_created_at" in indexes
+        assert "ix_feed_events_user_id_created_at_unread" in indexes
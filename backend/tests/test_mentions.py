@@ -145,3 +145,59 @@ async def test_self_mention_no_event(client, tmp_chat_dir):
     )
     events = feed_resp.json()["events"]
     assert len(events) == 0
+
+
+@pytest.mark.asyncio
+async def test_resolve_mentions_only_channel_members(client, db_engine, tmp_chat_dir):
+    """resolve_mentions matcht case-insensitiv und nur Channel-Mitglieder."""
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from app.services.mentions import resolve_mentions
+
+    owner = await register_user(client, username="rmowner", email="rmowner@agora.local", display_name="Owner")
+    member = await register_user(client, username="rmmember", email="rmmember@agora.local", display_name="Carla Member")
+    await register_user(client, username="outsider", email="outsider@agora.local", display_name="Out Sider")
+
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={"name": "Resolve", "channel_type": "group", "member_ids": [str(member["user"]["id"])]},
+        headers=auth_headers(owner["access_token"]),
+    )
+    channel_id = uuid.UUID(ch_resp.json()["id"])
+
+    session_maker = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_maker() as session:
+        resolved = await resolve_mentions(
+            session, ["RMMEMBER", "carla member", "outsider", "nobody"], channel_id
+        )
+
+    assert resolved == [uuid.UUID(member["user"]["id"])]
+
+
+@pytest.mark.asyncio
+async def test_multiple_mentions_create_one_event_each(client, tmp_chat_dir):
+    """Mehrere @Mentions in einer Nachricht: je ein Mention-Event pro User."""
+    sender = await register_user(client, username="multisender", email="multisender@agora.local")
+    anna = await register_user(client, username="anna", email="anna@agora.local")
+    bert = await register_user(client, username="bert", email="bert@agora.local")
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={
+            "name": "Multi-Mention",
+            "channel_type": "group",
+            "member_ids": [anna["user"]["id"], bert["user"]["id"]],
+        },
+        headers=auth_headers(sender["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+
+    msg_resp = await client.post(
+        f"/api/channels/{channel_id}/messages/",
+        json={"content": "@anna @bert @multisender Treffen um 10"},
+        headers=auth_headers(sender["access_token"]),
+    )
+    assert msg_resp.status_code == 201
+
+    for user, expected in ((anna, 1), (bert, 1), (sender, 0)):
+        feed = (await client.get("/api/feed/", headers=auth_headers(user["access_token"]))).json()
+        assert [e["event_type"] for e in feed["events"]].count("mention") == expected
@@ -0,0 +1,282 @@
+"""Tests fuer die WebSocket-Handler."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from fastapi import WebSocketDisconnect
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.feed import FeedEvent
+from app.models.user import User
+from app.services.auth import create_access_token, hash_password
+from app.services.chat_db import get_messages
+from app.websocket import handlers
+from app.websocket.manager import manager
+from tests.conftest import auth_headers, register_user
+
+
+@pytest.fixture
+def ws_sessions(db_engine, monkeypatch):
+    """Route the handlers' own sessions to the test engine and count them."""
+    maker = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    opened = []
+
+    def session_factory():
+        opened.append(1)
+        return maker()
+
+    monkeypatch.setattr(handlers, "async_session", session_factory)
+    handlers._ws_auth_cache.clear()
+    yield maker, opened
+    handlers._ws_auth_cache.clear()
+
+
+@pytest_asyncio.fixture
+async def spawned(monkeypatch):
+    """Hold back the handlers' background work until the test runs it.
+
+    All test sessions share one connection; a side-effect task still running
+    when the endpoint's session is returned would lose its open transaction
+    to the pool's reset. Returns a coroutine that runs the queued work in order.
+    """
+    queued = []
+    monkeypatch.setattr(handlers, "_spawn", queued.append)
+
+    async def run():
+        while queued:
+            await queued.pop(0)
+
+    yield run
+    await run()
+
+
+@pytest.mark.asyncio
+async def test_authenticate_ws_caches_verified_token(ws_sessions):
+    maker, opened = ws_sessions
+    async with maker() as db:
+        user = User(
+            username="wsuser",
+            email="wsuser@agora.local",
+            password_hash=hash_password("pw"),
+            display_name="WS User",
+        )
+        db.add(user)
+        await db.commit()
+        user_id = user.id
+
+    websocket = SimpleNamespace(query_params={"token": create_access_token(user_id)})
+
+    first = await handlers.authenticate_ws(websocket)
+    second = await handlers.authenticate_ws(websocket)
+
+    assert first is not None and first.id == user_id
+    assert second is first
+    assert len(opened) == 1
+
+
+@pytest.mark.asyncio
+async def test_authenticate_ws_rejects_invalid_token(ws_sessions):
+    websocket = SimpleNamespace(query_params={"token": "kein-jwt"})
+    assert await handlers.authenticate_ws(websocket) is None
+    assert not handlers._ws_auth_cache
+
+
+class ScriptedWebSocket:
+    """Feeds a fixed list of frames to a handler, then disconnects."""
+
+    def __init__(self, token: str, frames: list[dict]):
+        self.query_params = {"token": token}
+        self._frames = list(frames)
+        self.sent: list = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        self.closed_with = code
+
+    async def receive_text(self):
+        if not self._frames:
+            raise WebSocketDisconnect()
+        return json.dumps(self._frames.pop(0))
+
+    async def send_text(self, text: str):
+        self.sent.append(json.loads(text))
+
+
+@pytest.mark.asyncio
+async def test_websocket_endpoint_persists_through_one_session(client, tmp_chat_dir, ws_sessions, spawned):
+    maker, opened = ws_sessions
+    owner = await register_user(client, username="wsowner", email="wsowner@agora.local")
+    member = await register_user(client, username="wsmember", email="wsmember@agora.local")
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={"name": "WS", "channel_type": "group", "member_ids": [member["user"]["id"]]},
+        headers=auth_headers(owner["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+
+    ws = ScriptedWebSocket(
+        owner["access_token"],
+        [
+            {"type": "message", "content": "Hallo @wsmember"},
+            {"type": "status_change", "status": "busy"},
+        ],
+    )
+    await handlers.websocket_endpoint(ws, channel_id)
+    await spawned()
+
+    assert ws.closed_with is None
+    assert any(m.get("type") == "new_message" for m in ws.sent)
+    # authenticate_ws, the endpoint, the deferred feed/mention task and the
+    # deferred disconnect cleanup
+    assert len(opened) == 4
+
+    async with maker() as db:
+        events = (await db.scalars(select(FeedEvent))).all()
+        status = await db.scalar(select(User.status).where(User.username == "wsowner"))
+    assert sorted(e.event_type for e in events) == ["mention", "message"]
+    assert status == "offline"
+
+
+@pytest.mark.asyncio
+async def test_pong_and_initial_statuses_are_sent_by_the_outbox(client, tmp_chat_dir, ws_sessions, spawned):
+    owner = await register_user(client, username="wspong", email="wspong@agora.local")
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={"name": "Pong", "channel_type": "group", "member_ids": []},
+        headers=auth_headers(owner["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+    senders = []
+
+    class RecordingWebSocket(ScriptedWebSocket):
+        async def send_text(self, text: str):
+            senders.append(asyncio.current_task())
+            await super().send_text(text)
+
+    notification_ws = RecordingWebSocket(owner["access_token"], [{"type": "ping"}])
+    channel_ws = RecordingWebSocket(owner["access_token"], [])
+    await handlers.notification_ws_endpoint(notification_ws)
+    await handlers.websocket_endpoint(channel_ws, channel_id)
+    await spawned()
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+    assert notification_ws.sent == [{"type": "pong"}]
+    assert channel_ws.sent[0]["type"] == "user_statuses"
+    # Only the outbox drain tasks write to the sockets, never the handler
+    assert senders and asyncio.current_task() not in senders
+
+
+@pytest.mark.asyncio
+async def test_channel_membership_cache_follows_leave(client, tmp_chat_dir, ws_sessions):
+    maker, _ = ws_sessions
+    owner = await register_user(client, username="cacheowner", email="cacheowner@agora.local")
+    member = await register_user(client, username="cachemember", email="cachemember@agora.local")
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={"name": "Cache", "channel_type": "group", "member_ids": [member["user"]["id"]]},
+        headers=auth_headers(owner["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+    member_id = member["user"]["id"]
+
+    async with maker() as db:
+        assert await manager.is_member(db, channel_id, member_id)
+    assert channel_id in manager.channel_members
+
+    resp = await client.delete(
+        f"/api/channels/{channel_id}/members/me",
+        headers=auth_headers(member["access_token"]),
+    )
+    assert resp.status_code == 200
+    assert channel_id not in manager.channel_members
+
+    async with maker() as db:
+        assert not await manager.is_member(db, channel_id, member_id)
+        assert await manager.is_member(db, channel_id, owner["user"]["id"])
+
+
+def test_signaling_frame_prepends_sender_to_raw_frame():
+    raw = '{"type":"offer","target_user_id":"u2","sdp":{"type":"offer","sdp":"v=0\\r\\n"}}'
+    frame = handlers._signaling_frame(raw, json.loads(raw), "u1", 'Ann "A"')
+
+    assert frame.endswith(raw[1:])
+    assert json.loads(frame) == {
+        "from_user_id": "u1",
+        "display_name": 'Ann "A"',
+        "type": "offer",
+        "target_user_id": "u2",
+        "sdp": {"type": "offer", "sdp": "v=0\r\n"},
+    }
+
+
+def test_signaling_frame_does_not_let_client_spoof_sender():
+    raw = '{"type":"answer","target_user_id":"u2","from_user_id":"u9"}'
+    frame = json.loads(handlers._signaling_frame(raw, json.loads(raw), "u1", "Ann"))
+
+    assert frame == {"type": "answer", "from_user_id": "u1", "display_name": "Ann"}
+
+
+@pytest.mark.asyncio
+async def test_websocket_endpoint_ignores_unknown_frame_types(
+    client, tmp_chat_dir, ws_sessions, spawned, monkeypatch
+):
+    owner = await register_user(client, username="wsunknown", email="wsunknown@agora.local")
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={"name": "Unbekannt", "channel_type": "group", "member_ids": []},
+        headers=auth_headers(owner["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+    handled = []
+
+    async def fake_typing(ctx, data):
+        handled.append((ctx.channel_id, data["type"]))
+
+    monkeypatch.setitem(handlers._CHANNEL_HANDLERS, "typing", fake_typing)
+    ws = ScriptedWebSocket(owner["access_token"], [{"type": "gibt-es-nicht"}, {"type": "typing"}])
+
+    await handlers.websocket_endpoint(ws, channel_id)
+
+    assert handled == [(channel_id, "typing")]
+    assert ws.closed_with is None
+
+
+@pytest.mark.asyncio
+async def test_disconnect_during_call_posts_call_end_in_background(client, tmp_chat_dir, ws_sessions, spawned):
+    maker, _ = ws_sessions
+    owner = await register_user(client, username="wscaller", email="wscaller@agora.local")
+    ch_resp = await client.post(
+        "/api/channels/",
+        json={"name": "Anruf", "channel_type": "group", "member_ids": []},
+        headers=auth_headers(owner["access_token"]),
+    )
+    channel_id = ch_resp.json()["id"]
+
+    ws = ScriptedWebSocket(owner["access_token"], [{"type": "video_call_start"}])
+    await handlers.websocket_endpoint(ws, channel_id)
+    await spawned()
+
+    contents = [m["content"] for m in await get_messages(channel_id)]
+    assert contents[0].endswith("hat einen Videoanruf gestartet")
+    assert contents[-1].startswith("Anruf beendet")
+    assert channel_id not in manager.active_calls
+    async with maker() as db:
+        status = await db.scalar(select(User.status).where(User.username == "wscaller"))
+    assert status == "offline"
+
+
+@pytest.mark.asyncio
+async def test_websocket_endpoint_rejects_malformed_channel_id(client, ws_sessions):
+    owner = await register_user(client, username="wsbadid", email="wsbadid@agora.local")
+    ws = ScriptedWebSocket(owner["access_token"], [])
+
+    await handlers.websocket_endpoint(ws, "kein-uuid")
+
+    assert ws.closed_with == 4003
@@ -0,0 +1,216 @@
+"""Tests fuer den WebSocket-ConnectionManager (ohne echte Sockets)."""
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+
+from app.websocket.manager import ConnectionManager, decode_json, encode_json
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.sent.append(text)
+
+    async def send_json(self, data):
+        raise AssertionError("payload should be serialized once by the manager")
+
+
+@pytest_asyncio.fixture
+async def new_manager():
+    """ConnectionManager factory; stops the managers' send queues afterwards."""
+    created = []
+
+    def factory():
+        created.append(ConnectionManager())
+        return created[-1]
+
+    yield factory
+    for mgr in created:
+        await mgr.close()
+
+
+@pytest.mark.asyncio
+async def test_send_to_channel_serializes_once_for_all_members(new_manager):
+    mgr = new_manager()
+    sockets = {uid: FakeWebSocket() for uid in ("u1", "u2", "u3")}
+    for uid, ws in sockets.items():
+        await mgr.connect(ws, uid, "ch1")
+
+    await mgr.send_to_channel("ch1", {"type": "new_message", "content": "Grüße"}, exclude_user="u1")
+    await mgr.drain()
+
+    assert sockets["u1"].sent == []
+    assert sockets["u2"].sent == sockets["u3"].sent == ['{"type":"new_message","content":"Grüße"}']
+
+
+@pytest.mark.asyncio
+async def test_broadcast_to_user_channels_reaches_every_channel(new_manager):
+    mgr = new_manager()
+    a, b, c = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await mgr.connect(a, "u1", "ch1")
+    await mgr.connect(b, "u1", "ch2")
+    await mgr.connect(c, "u2", "ch2")
+
+    await mgr.set_user_status("u1", "busy")
+    await mgr.drain()
+
+    expected = {"type": "status_change", "user_id": "u1", "status": "busy"}
+    assert [json.loads(t) for t in a.sent] == [expected]
+    assert [json.loads(t) for t in b.sent] == [expected]
+    assert [json.loads(t) for t in c.sent] == [expected]
+
+
+class BrokenWebSocket(FakeWebSocket):
+    async def send_text(self, text: str):
+        raise RuntimeError("socket closed")
+
+
+@pytest.mark.asyncio
+async def test_failed_socket_is_dropped_and_others_still_receive(new_manager):
+    mgr = new_manager()
+    good, broken = FakeWebSocket(), BrokenWebSocket()
+    await mgr.connect(good, "u1", "ch1")
+    await mgr.connect(broken, "u2", "ch1")
+
+    await mgr.send_to_channel("ch1", {"type": "ping"})
+    await mgr.drain()
+
+    assert good.sent == ['{"type":"ping"}']
+    assert mgr.get_online_users("ch1") == ["u1"]
+    assert not mgr.is_user_connected("u2")
+
+
+def test_encode_json_matches_compact_stdlib_output():
+    message = {"type": "new_message", "message": {"content": "Grüße 👋", "id": 1}, "ok": True}
+    assert encode_json(message) == json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+    assert decode_json(encode_json(message)) == message
+
+
+@pytest.mark.asyncio
+async def test_channel_targets_follow_connect_and_disconnect(new_manager):
+    mgr = new_manager()
+    a, b, c = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await mgr.connect(a, "u1", "ch1")
+    await mgr.connect(b, "u2", "ch1")
+
+    await mgr.send_to_channel("ch1", {"n": 1})
+    await mgr.connect(c, "u3", "ch1")
+    await mgr.send_to_channel("ch1", {"n": 2})
+    await mgr.drain()
+    mgr.disconnect("u1", "ch1")
+    await mgr.send_to_channel("ch1", {"n": 3}, exclude_user="u2")
+    await mgr.drain()
+
+    assert a.sent == ['{"n":1}', '{"n":2}']
+    assert b.sent == ['{"n":1}', '{"n":2}']
+    assert c.sent == ['{"n":2}', '{"n":3}']
+
+
+@pytest.mark.asyncio
+async def test_published_messages_reach_every_worker(new_manager):
+    workers = [new_manager(), new_manager()]
+
+    async def publish(data: str):
+        for mgr in workers:
+            await mgr.dispatch(data)
+
+    for mgr in workers:
+        mgr.publisher = publish
+    a, b, n = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    await workers[0].connect(a, "u1", "ch1")
+    await workers[1].connect(b, "u2", "ch1")
+    await workers[1].connect_notification(n, "u3")
+
+    await workers[0].send_to_channel("ch1", {"n": 1}, exclude_user="u1")
+    await workers[0].notify_channel_members("ch1", ["u1", "u2", "u3"], {"n": 2})
+    await workers[0].send_to_user("u2", {"n": 3})
+    await asyncio.gather(*(mgr.drain() for mgr in workers))
+
+    assert a.sent == []
+    assert b.sent == ['{"n":1}', '{"n":3}']
+    assert n.sent == ['{"n":2}']
+
+
+@pytest.mark.asyncio
+async def test_failed_publish_falls_back_to_local_delivery(new_manager):
+    mgr = new_manager()
+
+    async def publish(data: str):
+        raise ConnectionError("redis down")
+
+    mgr.publisher = publish
+    ws = FakeWebSocket()
+    await mgr.connect(ws, "u1", "ch1")
+
+    await mgr.send_to_channel("ch1", {"n": 1})
+    await mgr.drain()
+
+    assert ws.sent == ['{"n":1}']
+
+
+class StalledWebSocket(FakeWebSocket):
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+        self.closed_with = None
+
+    async def send_text(self, text: str):
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_block_others_and_is_dropped(new_manager, monkeypatch):
+    monkeypatch.setattr("app.websocket.manager.SEND_QUEUE_SIZE", 4)
+    mgr = new_manager()
+    fast, slow = FakeWebSocket(), StalledWebSocket()
+    await mgr.connect(fast, "u1", "ch1")
+    await mgr.connect(slow, "u2", "ch1")
+
+    for i in range(6):
+        await mgr.send_to_channel("ch1", {"n": i})
+        await asyncio.sleep(0)
+    assert len(fast.sent) == 6
+    assert mgr.get_online_users("ch1") == ["u1", "u2"]
+
+    # Queue full plus more than a whole queue of dropped frames: give up
+    for i in range(6, 12):
+        await mgr.send_to_channel("ch1", {"n": i})
+        await asyncio.sleep(0)
+    assert len(fast.sent) == 12
+    assert mgr.get_online_users("ch1") == ["u1"]
+
+    slow.release.set()
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert slow.closed_with == 1013
+    assert slow.sent == ['{"n":0}']
+
+
+def test_call_duration_uses_monotonic_clock(monkeypatch):
+    mgr = ConnectionManager()
+    clock = iter([1000.0, 1075.9])
+    monkeypatch.setattr("app.websocket.manager.time.monotonic", lambda: next(clock))
+
+    assert mgr.join_call("ch1", "u1") is True
+    assert mgr.join_call("ch1", "u2") is False
+    assert mgr.leave_call("ch1", "u1") is None
+    assert mgr.leave_call("ch1", "u2") == 75
+    assert "ch1" not in mgr.active_calls
+
+
+def test_connection_manager_has_no_instance_dict():
+    mgr = ConnectionManager()
+    assert not hasattr(mgr, "__dict__")
+    with pytest.raises(AttributeError):
+        mgr.typo_connections = {}
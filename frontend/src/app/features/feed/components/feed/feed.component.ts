@@ -73,7 +73,7 @@ import { ApiService } from '@services/api.service';
           </mat-list-item>
         </mat-list>
 
-        <div *ngIf="!loading && events.length > 0" class="load-more">
+        <div *ngIf="!loading && nextCursor" class="load-more">
           <button mat-button (click)="loadMore()">Mehr laden</button>
         </div>
       </ng-template>
@@ -199,7 +199,7 @@ export class FeedComponent implements OnInit {
   unreadCount = 0;
   loading = false;
   showUnreadOnly = true;
-  offset = 0;
+  nextCursor: string | null = null;
 
   constructor(private apiService: ApiService, private router: Router) {}
 
@@ -209,10 +209,11 @@ export class FeedComponent implements OnInit {
 
   loadFeed(): void {
     this.loading = true;
-    this.offset = 0;
-    this.apiService.getFeed(50, 0, this.showUnreadOnly).subscribe({
+    this.nextCursor = null;
+    this.apiService.getFeed(50, null, this.showUnreadOnly).subscribe({
       next: (res) => {
         this.events = res.events;
+        this.nextCursor = res.next_cursor;
         this.unreadCount = res.unread_count;
         this.loading = false;
       },
@@ -223,9 +224,12 @@ export class FeedComponent implements OnInit {
   }
 
   loadMore(): void {
-    this.offset += 50;
-    this.apiService.getFeed(50, this.offset, this.showUnreadOnly).subscribe((res) => {
+    if (!this.nextCursor) {
+      return;
+    }
+    this.apiService.getFeed(50, this.nextCursor, this.showUnreadOnly).subscribe((res) => {
       this.events = [...this.events, ...res.events];
+      this.nextCursor = res.next_cursor;
     });
   }
 
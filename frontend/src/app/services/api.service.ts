@@ -150,11 +150,13 @@ export class ApiService {
   }
 
   // Feed
-  getFeed(limit: number = 50, offset: number = 0, unreadOnly: boolean = false): Observable<any> {
-    const params = new HttpParams()
+  getFeed(limit: number = 50, cursor: string | null = null, unreadOnly: boolean = false): Observable<any> {
+    let params = new HttpParams()
       .set('limit', limit.toString())
-      .set('offset', offset.toString())
       .set('unread_only', unreadOnly.toString());
+    if (cursor) {
+      params = params.set('cursor', cursor);
+    }
     return this.http.get(`${this.baseUrl}/feed/`, { params });
   }
 